@@ -0,0 +1,77 @@
+import io
+import sys
+import time
+
+from interpreter.source.source import Source
+from interpreter.lexer.fast_lexer import FastLexer
+from interpreter.parser.pratt_parser import PrattParser
+from interpreter.interpreter.engines import ENGINES, create_visitor
+from interpreter.interpreter.interpreter import Interpreter
+
+# porownanie funkcji agregujacych z petlami BN liczacymi to samo
+# uruchomienie: python -m benchmarks.aggregates [dlugosc_listy] [silnik]
+
+# lista jest literalem, wiec czas jej budowy w obu wariantach jest pomijalny
+PROGRAM = """
+def main() {
+    lst = [%s];
+    %s
+}
+"""
+
+CASES = {
+    'sum': ("""total = 0; i = 0; n = lst.count();
+    while (i < n) { total = total + get(lst, i); i = i + 1; }
+    return total;""",
+            "return sum(lst);"),
+    'max': ("""result = get(lst, 0); i = 1; n = lst.count();
+    while (i < n) { v = get(lst, i); if (v > result) { result = v; } i = i + 1; }
+    return result;""",
+            "return max(lst);"),
+    'average': ("""total = 0; i = 0; n = lst.count();
+    while (i < n) { total = total + get(lst, i); i = i + 1; }
+    return total / n;""",
+                "return average(lst);"),
+    'count': ("""result = 0; i = 0; n = lst.count();
+    while (i < n) { if (get(lst, i) > 100) { result = result + 1; } i = i + 1; }
+    return result;""",
+              "return lst.count($v => { v = v > 100; });"),
+    'all': ("""i = 0; n = lst.count();
+    while (i < n) { if (get(lst, i) < -1000000) { return false; } i = i + 1; }
+    return true;""",
+            "return lst.all($v => { v = v > -1000000; });"),
+    'aggregate': ("""result = get(lst, 0); i = 1; n = lst.count();
+    while (i < n) { result = result + get(lst, i) * 2; i = i + 1; }
+    return result;""",
+                  "return lst.aggregate($p => { p = get(p, 0) + get(p, 1) * 2; });"),
+}
+
+
+def measure(engine, text, repeats=3):
+    best = None
+    for _ in range(repeats):
+        program = PrattParser(FastLexer(Source(io.StringIO(text)))).parse_program()
+        start = time.perf_counter()
+        result = Interpreter(program).execute(create_visitor(engine))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    length = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    engine = sys.argv[2] if len(sys.argv) > 2 else 'tree'
+    if engine not in ENGINES:
+        raise SystemExit(f"Unknown engine: {engine}")
+    items = ', '.join(str(index * 7 % 1000 - 300) for index in range(length))
+    print(f"{engine}: {length} elements")
+    for name, (loop, builtin) in CASES.items():
+        loop_result, loop_elapsed = measure(engine, PROGRAM % (items, loop))
+        builtin_result, builtin_elapsed = measure(engine, PROGRAM % (items, builtin))
+        assert loop_result == builtin_result, (name, loop_result, builtin_result)
+        print(f"{name:>10} loop {loop_elapsed:.3f} s, builtin {builtin_elapsed:.4f} s, "
+              f"speedup {loop_elapsed / builtin_elapsed:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import io
+import sys
+import time
+
+from interpreter.source.source import Source
+from interpreter.lexer.fast_lexer import FastLexer
+from interpreter.parser.pratt_parser import PrattParser
+from interpreter.interpreter.engines import ENGINES, create_visitor
+from interpreter.interpreter.interpreter import Interpreter
+
+# porownanie silnikow wykonania na programie z petlami i rekurencja
+# uruchomienie: python -m benchmarks.engines [liczba_obrotow_petli]
+
+PROGRAM = """
+def fib(n) {
+    if (n < 2) {
+        return n;
+    }
+    return fib(n - 1) + fib(n - 2);
+}
+
+def main() {
+    i = 0;
+    total = 0;
+    while (i < %d) {
+        total = total + i * 2 - i / 4;
+        if (total > 1000000) {
+            total = total - 1000000;
+        }
+        i = i + 1;
+    }
+    return total + fib(16);
+}
+"""
+
+
+def measure(engine, text, repeats=3):
+    best = None
+    for _ in range(repeats):
+        program = PrattParser(FastLexer(Source(io.StringIO(text)))).parse_program()
+        start = time.perf_counter()
+        # bez pamieci wynikow, fib liczony jest za kazdym razem przez silnik
+        result = Interpreter(program).execute(create_visitor(engine, memo_size=0))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    text = PROGRAM % iterations
+    results = {}
+    for engine in ENGINES:
+        result, elapsed = measure(engine, text)
+        results[engine] = elapsed
+        print(f"{engine:>10} {elapsed:.3f} s (result {result})")
+    for engine in ENGINES:
+        print(f"{engine:>10} speedup: {results['tree'] / results[engine]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
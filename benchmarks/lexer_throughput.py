@@ -0,0 +1,39 @@
+import io
+import sys
+import time
+
+from interpreter.source.source import Source, BufferedSource
+from interpreter.lexer.lexer import Lexer, tokens_generator
+from interpreter.lexer.fast_lexer import FastLexer
+from benchmarks.programs import generate_program
+
+# porownanie przepustowosci Lexera i FastLexera
+# uruchomienie: python -m benchmarks.lexer_throughput [liczba_funkcji]
+
+def measure(lexer_class, source_class, text, repeats=3):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        tokens = sum(1 for _ in tokens_generator(lexer_class(source_class(io.StringIO(text)))))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return tokens, best
+
+
+def main():
+    functions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    text = generate_program(functions)
+    print(f"Program: {len(text)} characters, {functions} functions")
+    results = {}
+    for lexer_class in (Lexer, FastLexer):
+        for source_class in (Source, BufferedSource):
+            tokens, elapsed = measure(lexer_class, source_class, text)
+            results[lexer_class, source_class] = elapsed
+            print(f"{lexer_class.__name__:>10} + {source_class.__name__:<15} "
+                  f"{tokens} tokens in {elapsed:.3f} s ({len(text) / elapsed / 1e6:.2f} MB/s)")
+    speedup = results[Lexer, Source] / results[FastLexer, BufferedSource]
+    print(f"FastLexer + BufferedSource speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import gc
+import sys
+import time
+import tracemalloc
+
+from interpreter.interpreter import builtins, storage
+from interpreter.interpreter.interpreter import Array
+
+# pamiec i czas operacji na listach BN w tablicach typowanych i w listach pythona
+# uruchomienie: python -m benchmarks.list_storage [dlugosc_listy ...]
+
+VALUES = {
+    'int': lambda index: index * 7919 % 1000003,
+    'float': lambda index: index * 0.5 - 1000.25,
+    'bool': lambda index: index % 3 == 0,
+}
+
+
+def build(length, make):
+    lst = Array([], owned=True)
+    for index in range(length):
+        builtins.append(lst, make(index))
+    return lst
+
+
+# pamiec listy mierzona w osobnym przebiegu, tracemalloc spowalnia tworzenie obiektow
+def measure(length, make):
+    gc.collect()
+    tracemalloc.start()
+    lst = build(length, make)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del lst
+    gc.collect()
+    start = time.perf_counter()
+    lst = build(length, make)
+    times = {'append': time.perf_counter() - start}
+    start = time.perf_counter()
+    for index in range(0, length, 10):
+        builtins.get(lst, index)
+    times['get'] = time.perf_counter() - start
+    start = time.perf_counter()
+    total = builtins.sum_items(lst)
+    times['sum'] = time.perf_counter() - start
+    start = time.perf_counter()
+    builtins.sort(lst)
+    times['sort'] = time.perf_counter() - start
+    return memory, times, (total, lst.to_list()[:3])
+
+
+# listy pythona: bez typow, dla ktorych sa tablice typowane
+def measure_generic(length, make):
+    typecodes = dict(storage.TYPECODES)
+    storage.TYPECODES.clear()
+    try:
+        return measure(length, make)
+    finally:
+        storage.TYPECODES.update(typecodes)
+
+
+def main():
+    lengths = [int(arg) for arg in sys.argv[1:]] or [1000000, 10000000]
+    for length in lengths:
+        for name, make in VALUES.items():
+            generic_memory, generic_times, generic_result = measure_generic(length, make)
+            typed_memory, typed_times, typed_result = measure(length, make)
+            assert generic_result == typed_result, name
+            print(f"{length:>9} {name:>5}: memory {generic_memory / 1e6:.1f} MB -> {typed_memory / 1e6:.1f} MB")
+            for operation in generic_times:
+                print(f"{'':>16}{operation:>7} {generic_times[operation]:.3f} s -> {typed_times[operation]:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
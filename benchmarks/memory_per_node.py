@@ -0,0 +1,96 @@
+import gc
+import io
+import sys
+import tracemalloc
+
+from interpreter.source.source import Source
+from interpreter.lexer.fast_lexer import FastLexer
+from interpreter.lexer.lexer import tokens_generator
+from interpreter.parser.parser import Parser
+from interpreter.parser.syntax_tree import Node
+from interpreter.tokens.token import Token
+from benchmarks.programs import generate_program
+
+# pamiec zajmowana przez drzewo skladniowe i strumien tokenow w przeliczeniu na wezel/token
+# uruchomienie: python -m benchmarks.memory_per_node [--dicts] [liczba_funkcji ...]
+# --dicts kopiuje wezly i tokeny do obiektow bez __slots__ (z __dict__, jak przed ich dodaniem),
+# zeby porownanie przed/po dalo sie powtorzyc; wartosci i pozycje sa wspoldzielone z oryginalem
+
+def _fields(node):
+    names = []
+    for base in reversed(type(node).__mro__):
+        slots = base.__dict__.get('__slots__', ())
+        names.extend([slots] if isinstance(slots, str) else slots)
+    names.extend(getattr(node, '__dict__', ()))
+    return [name for name in names if name != 'position' and hasattr(node, name)]
+
+
+def count_nodes(node) -> int:
+    if isinstance(node, Node):
+        return 1 + sum(count_nodes(getattr(node, name)) for name in _fields(node))
+    if isinstance(node, dict):
+        return sum(count_nodes(value) for value in node.values())
+    if isinstance(node, (list, tuple)):
+        return sum(count_nodes(item) for item in node)
+    return 0
+
+
+_dict_classes = {}
+
+
+# klasa o tej samej nazwie, ale z atrybutami w __dict__
+def _dict_class(cls):
+    if cls not in _dict_classes:
+        _dict_classes[cls] = type(cls.__name__, (), {})
+    return _dict_classes[cls]
+
+
+def _copy_fields(obj, names):
+    copy = object.__new__(_dict_class(type(obj)))
+    for name in names:
+        setattr(copy, name, to_dicts(getattr(obj, name)))
+    return copy
+
+
+def to_dicts(node):
+    if isinstance(node, Node):
+        return _copy_fields(node, ['position'] + _fields(node))
+    if isinstance(node, Token):
+        return _copy_fields(node, Token.__slots__)
+    if isinstance(node, dict):
+        return {key: to_dicts(value) for key, value in node.items()}
+    if isinstance(node, list):
+        return [to_dicts(item) for item in node]
+    if isinstance(node, tuple):
+        return tuple(to_dicts(item) for item in node)
+    return node
+
+
+# oryginaly sa zwalniane po skopiowaniu, wiec mierzona jest tylko pamiec kopii
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, allocated
+
+
+def main():
+    args = sys.argv[1:]
+    convert = to_dicts if '--dicts' in args else (lambda result: result)
+    sizes = [int(arg) for arg in args if arg != '--dicts'] or [100, 1000, 5000]
+    for functions in sizes:
+        text = generate_program(functions)
+        buffer = FastLexer(Source(io.StringIO(text))).tokenize_all()
+        program, tree_bytes = measure(lambda: convert(Parser(buffer.cursor()).parse_program()))
+        nodes = count_nodes(Parser(buffer.cursor()).parse_program())
+        tokens, token_bytes = measure(lambda: convert(list(tokens_generator(FastLexer(Source(io.StringIO(text)))))))
+        print(f"{functions:>6} functions: {nodes:>8} nodes, {tree_bytes / nodes:7.1f} bytes/node, "
+              f"{len(tokens):>8} tokens, {token_bytes / len(tokens):7.1f} bytes/token")
+        del program, tokens
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import io
+import sys
+import time
+
+from interpreter.source.source import Source
+from interpreter.lexer.fast_lexer import FastLexer
+from interpreter.parser.parser import Parser
+from interpreter.parser.pratt_parser import PrattParser
+from benchmarks.programs import generate_program
+
+# porownanie Parsera i PrattParsera, tokeny sa wczesniej zapisane w TokenBuffer, wiec mierzony jest sam parser
+# uruchomienie: python -m benchmarks.parser_throughput [liczba_funkcji]
+
+def measure(parser_class, tokens, repeats=5):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        parser_class(tokens.cursor()).parse_program()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    functions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    text = generate_program(functions)
+    tokens = FastLexer(Source(io.StringIO(text)), skip_comments=True).tokenize_all()
+    print(f"Program: {len(text)} characters, {functions} functions")
+    results = {}
+    for parser_class in (Parser, PrattParser):
+        results[parser_class] = elapsed = measure(parser_class, tokens)
+        print(f"{parser_class.__name__:>12} {elapsed:.3f} s")
+    print(f"PrattParser speedup: {results[Parser] / results[PrattParser]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
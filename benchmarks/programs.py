@@ -0,0 +1,29 @@
+# generator programow BN uzywany przez benchmarki
+
+FUNCTION_TEMPLATE = """# funkcja pomocnicza {index}
+def helper{index}(a, b) {{
+    x = a * {index} + b - 3.25;
+    name = "helper {index}";
+    if (x >= {index} and b != 0) {{
+        return x / 2;
+    }} else {{
+        values = [1, 2, 3, {index}];
+        values.append(x);
+    }}
+    while (x < 10) {{
+        x = x + 1;
+    }}
+    return helper{previous}(x, b);
+}}
+"""
+
+MAIN = """def main() {
+    return 0;
+}
+"""
+
+
+def generate_program(functions: int) -> str:
+    parts = [FUNCTION_TEMPLATE.format(index=index, previous=max(index - 1, 0)) for index in range(functions)]
+    parts.append(MAIN)
+    return ''.join(parts)
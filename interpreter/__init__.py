@@ -0,0 +1,2 @@
+# wersja interpretera, zmiana uniewaznia zapisane w __bncache__ drzewa skladniowe
+__version__ = '0.4.0'
@@ -1,5 +1,12 @@
 import numpy as np
 
+from .sequence import FOREACH, TAKE, WHERE, Sequence, get_items, get_values, is_deferrable
+from .parallel import run_parallel
+from .vectorize import get_kernel, vector_mask
+
+# wynik min/max dla pustej listy
+EMPTY = object()
+
 class BuiltInFunction:
     def __init__(self, function):
         self.function = function
@@ -36,30 +43,31 @@ def to_float(x):
         return x.astype(float)
     return float(x)
 
+# lista to Array (interpreter.Array) albo Sequence, tablica typowana Array nie jest zamieniana na liste
 def append(lst, value):
-    lst.value.append(value)
+    lst.append(value)
 
 def remove(lst, index):
-    if 0 <= index < len(lst.value):
-        lst.value.pop(index)
+    if 0 <= index < lst.length():
+        lst.pop(index)
     else:
         raise IndexError("Index out of range")
 
 def sort(lst):
-    if all(isinstance(i, (int, float)) for i in lst.value):
-        lst.value.sort()
-    else:
-        raise ValueError("List contains non-numeric elements")
+    lst.sort()
 
 def get(lst, index):
-    if 0 <= index < len(lst.value):
-        return lst.value[index]
+    if 0 <= index < lst.length():
+        return lst.get(index)
     else:
         raise IndexError("Index out of range")
 
+# lambda bez efektow ubocznych daje leniwa sekwencje, pozostale sa wykonywane od razu dla calej listy
 def where(visitor, lst, name, statements):
+    if is_deferrable(visitor, statements):
+        return Sequence.extend(visitor, lst, (WHERE, name, statements))
     result = []
-    for item in lst.value:
+    for item in get_values(lst):
         visitor.context.add_variable(name, item)
         statements.accept(visitor)
         if visitor.last_result:
@@ -67,13 +75,137 @@ def where(visitor, lst, name, statements):
     return result
 
 def foreach(visitor, lst, name, statements):
+    if is_deferrable(visitor, statements):
+        return Sequence.extend(visitor, lst, (FOREACH, name, statements))
     items = []
-    for item in lst.value:
+    for item in get_values(lst):
         visitor.context.add_variable(name, item)
         statements.accept(visitor)
         items.append(visitor.context.variables.get(name))
     return items
 
+# parallelWhere/parallelForeach: where/foreach na czesciach listy w osobnych procesach (parallel.run_parallel)
+# (nazwy BN bez podkreslenia, ktorego lekser nie przyjmuje w identyfikatorach); lambdy z efektami ubocznymi
+# i lambdy liczone przez NumPy wykonywane sa jak w where/foreach
+def parallel_where(visitor, lst, name, statements):
+    return run_parallel_stage(visitor, lst, (WHERE, name, statements), where)
+
+def parallel_foreach(visitor, lst, name, statements):
+    return run_parallel_stage(visitor, lst, (FOREACH, name, statements), foreach)
+
+def run_parallel_stage(visitor, lst, stage, function):
+    _, name, statements = stage
+    if is_deferrable(visitor, statements) and get_kernel(visitor, name, statements) is None:
+        if (result := run_parallel(visitor, get_values(lst), stage)) is not None:
+            return result
+    return function(visitor, lst, name, statements)
+
+def take(lst, count):
+    if type(count) is not int or count < 0:
+        raise ValueError(f"Expected non-negative integer count, got {count}")
+    return Sequence.extend(None, lst, (TAKE, count))
+
+# pierwszy element; z sekwencji liczony jest tylko on
+def first(lst):
+    for item in get_items(lst):
+        return item
+    raise IndexError("Index out of range")
+
+# czy lambda jest prawdziwa dla ktoregos elementu, konczy przejscie (rowniez sekwencji) na pierwszym takim
+# dlugie listy liczb z prosta lambda sprawdzane sa na tablicy NumPy
+def any_item(visitor, lst, name, statements):
+    items = get_items(lst)
+    if (mask := vector_mask(visitor, items, name, statements)) is not None:
+        return bool(mask.any())
+    for item in items:
+        visitor.context.add_variable(name, item)
+        statements.accept(visitor)
+        if visitor.last_result:
+            return True
+    return False
+
+def all_items(visitor, lst, name, statements):
+    items = get_items(lst)
+    if (mask := vector_mask(visitor, items, name, statements)) is not None:
+        return bool(mask.all())
+    for item in items:
+        visitor.context.add_variable(name, item)
+        statements.accept(visitor)
+        if not visitor.last_result:
+            return False
+    return True
+
+# liczba elementow, z lambda: liczba elementow, dla ktorych jest prawdziwa
+def count(visitor, lst, name=None, statements=None):
+    if statements is None:
+        return len(get_values(lst))
+    items = get_items(lst)
+    if (mask := vector_mask(visitor, items, name, statements)) is not None:
+        return int(np.count_nonzero(mask))
+    result = 0
+    for item in items:
+        visitor.context.add_variable(name, item)
+        statements.accept(visitor)
+        if visitor.last_result:
+            result += 1
+    return result
+
+# lambda ma jedna zmienna, wiec dostaje pare [dotychczasowy wynik, element] i przypisuje do niej nowy wynik;
+# wynikiem poczatkowym jest pierwszy element
+def aggregate(visitor, lst, name, statements):
+    items = iter(get_items(lst))
+    for result in items:
+        break
+    else:
+        raise ValueError("Expected non-empty list")
+    variables = visitor.context.variables
+    for item in items:
+        # para jako nowa tablica, a nie set_value na tablicy z poprzedniego obrotu
+        variables.pop(name, None)
+        visitor.context.add_variable(name, [result, item])
+        statements.accept(visitor)
+        result = variables.get(name)
+    return result
+
+# sum/min/max/average przez funkcje pythona, ktore licza tak jak petla BN; tablice NumPy (np. z importu)
+# przez redukcje NumPy
+def sum_items(lst):
+    items = get_items(lst)
+    if isinstance(items, np.ndarray):
+        return items.sum().item()
+    try:
+        return sum(items)
+    except TypeError:
+        raise ValueError("List contains non-numeric elements") from None
+
+def min_item(lst):
+    return reduce_items(lst, min, np.min)
+
+def max_item(lst):
+    return reduce_items(lst, max, np.max)
+
+# min/max pustej listy sa bledem, tak jak w pythonie
+def reduce_items(lst, function, reduction):
+    items = get_items(lst)
+    if isinstance(items, np.ndarray):
+        result = reduction(items).item() if items.size else EMPTY
+    else:
+        try:
+            result = function(items, default=EMPTY)
+        except TypeError:
+            raise ValueError("List contains elements that cannot be compared") from None
+    if result is EMPTY:
+        raise ValueError("Expected non-empty list")
+    return result
+
+def average(lst):
+    values = get_values(lst)
+    if not len(values):
+        raise ValueError("Expected non-empty list")
+    if isinstance(values, np.ndarray):
+        return values.mean().item()
+    return sum_items(values) / len(values)
+
 def scan(prompt):
     print(prompt)
     val = input()
@@ -90,6 +222,18 @@ built_in_functions = {
     'remove': BuiltInFunction(remove),
     'sort': BuiltInFunction(sort),
     'get': BuiltInFunction(get),
+    'take': BuiltInFunction(take),
+    'first': BuiltInFunction(first),
     'where': LambdaFunction(where),
-    'foreach': LambdaFunction(foreach)
+    'foreach': LambdaFunction(foreach),
+    'parallelWhere': LambdaFunction(parallel_where),
+    'parallelForeach': LambdaFunction(parallel_foreach),
+    'any': LambdaFunction(any_item),
+    'all': LambdaFunction(all_items),
+    'count': LambdaFunction(count),
+    'aggregate': LambdaFunction(aggregate),
+    'sum': BuiltInFunction(sum_items),
+    'min': BuiltInFunction(min_item),
+    'max': BuiltInFunction(max_item),
+    'average': BuiltInFunction(average)
 }
@@ -0,0 +1,326 @@
+import operator
+from array import array
+
+from interpreter.parser.syntax_tree import *
+from . import operations
+from .transpiler import divide
+from ..parser.resolver import SlotResolver
+
+# instrukcja to para (kod operacji, argument) zapisana w array('i'), argumentem jest indeks w puli stalych,
+# indeks zmiennej w ramce albo adres skoku (indeks w tablicy instrukcji)
+LOAD_CONST = 0
+LOAD_FAST = 1           # zmienna lokalna, ktora na pewno ma juz wartosc
+LOAD_LOCAL = 2          # zmienna lokalna ze sprawdzeniem, czy zostala przypisana
+LOAD_NAME = 3           # zmienna lambdy ze slownika kontekstu
+LOAD_ATTR = 4
+ASSIGN_LOCAL = 5        # przypisania ustawiaja tez wynik (last_result)
+ASSIGN_NAME = 6
+ASSIGN_ATTR = 7
+CLEAR_LOCAL = 8         # zmienna lambdy dostaje None, jak w visit_lambda_expression
+CLEAR_NAME = 9
+MAKE_LAMBDA = 10
+SET_RESULT = 11
+# operacje dwuargumentowe, w puli stalych krotka (operacja, pozycja), a gdy prawy argument jest literalem
+# (operacja, wartosc, pozycja); wersja FAST bierze lewy argument prosto ze zmiennej lokalnej:
+# (indeks zmiennej, operacja, wartosc, pozycja); porownania nie maja pozycji
+BINARY = 12
+BINARY_CONST = 13
+BINARY_FAST_CONST = 14
+COMPARE = 15
+COMPARE_CONST = 16
+COMPARE_FAST_CONST = 17
+NOT = 18
+NEGATIVE = 19
+BUILD_LIST = 20
+JUMP = 21
+JUMP_IF_RESULT_FALSE = 22
+SET_RESULT_JUMP_IF_FALSE = 23
+JUMP_IF_TRUE_OR_KEEP = 24
+JUMP_IF_FALSE_OR_KEEP = 25
+OR_DECIDED = 26
+OR_VALUES = 27
+AND_DECIDED = 28
+AND_VALUES = 29
+ENTER_CALL = 30         # argument 1: wywolanie bez rodzica, na stos trafia None
+CALL = 31
+TAIL_CALL = 32          # "return f(...);" w ciele funkcji: funkcja BN zastepuje ramke wywolujacego
+RETURN = 33             # argument 1: return w ciele lambdy ustawia return_flag, 2: koniec ciala lambdy
+CHECK_RETURN_FLAG = 34
+RAISE_BREAK = 35
+FALLBACK = 36           # wezel wykonywany przez ExecuteVisitor
+ASSIGN_LOCAL_LITERAL = 37   # przypisanie literalu listy, ktory moze dostac tablice typowana (Array owned)
+ASSIGN_NAME_LITERAL = 38
+
+OPCODE_NAMES = {value: name for name, value in list(globals().items()) if name.isupper() and isinstance(value, int)}
+
+COMPARISONS = {
+    EqualOperation: operator.eq,
+    NotEqualOperation: operator.ne,
+    GreaterOperation: operator.gt,
+    GreaterEqualOperation: operator.ge,
+    LessOperation: operator.lt,
+    LessEqualOperation: operator.le,
+}
+
+ARTH_OPERATIONS = {
+    SumExpression: operations.sum_values,
+    SubExpression: operations.sub_values,
+    MulExpression: operations.multiply_values,
+    DivExpression: divide,
+}
+
+_LITERALS = (LiteralBool, LiteralInt, LiteralFloat, LiteralString)
+
+# obszary instrukcji, w ktorych wyjatek jest zamieniany tak jak w ExecuteVisitor
+ASSIGNMENT_REGION = 0
+NEGATION_REGION = 1
+
+
+class CodeObject:
+    __slots__ = ('name', 'instructions', 'constants', 'regions', 'parameters', 'frame_size', 'local_names', 'position')
+
+    def __init__(self, name, position):
+        self.name = name
+        self.position = position
+        self.instructions = array('i')
+        self.constants = []
+        # (poczatek, koniec, rodzaj, pozycja), koniec nie nalezy do obszaru
+        self.regions = []
+        self.parameters = 0
+        self.frame_size = 0
+        self.local_names = []
+
+
+def disassemble(code: CodeObject) -> list:
+    instructions = code.instructions
+    return [(OPCODE_NAMES[instructions[pc]], instructions[pc + 1]) for pc in range(0, len(instructions), 2)]
+
+
+# kompiluje funkcje albo cialo lambdy do liniowego kodu dla maszyny stosowej (VMExecutor)
+# semantyka jak w ClosureExecutor: wynik instrukcji trafia do rejestru wyniku, return_flag ustawiony
+# przez return w lambdzie sprawdzany jest po kazdej instrukcji, gdy check_return_flag jest wlaczony
+class BytecodeCompiler:
+    def __init__(self, check_return_flag=True):
+        self.check_return_flag = check_return_flag
+        # ciala lambd napotkane podczas kompilacji, kompilowane osobno
+        self.lambdas = []
+        self.lambda_returns = False
+
+    def compile_function(self, element: FunctionDefintion) -> CodeObject:
+        resolver = SlotResolver()
+        resolver.resolve(element)
+        code = self.start(element.name, element.position, in_lambda=False)
+        code.parameters = len(element.parameters)
+        code.frame_size = element.frame_size
+        code.local_names = list(resolver.slots)
+        self.defined = set(element.parameters)
+        self.compile_statements(element.statements)
+        self.emit(RETURN, 0)
+        return code
+
+    # cialo bez nawiasow ($x => x > 1) jest jednym wyrazeniem: wyrazenie, SET_RESULT i RETURN
+    def compile_lambda_body(self, element) -> CodeObject:
+        code = self.start('<lambda>', element.position, in_lambda=True)
+        self.defined = set()
+        self.compile_statement(element)
+        self.emit(RETURN, 2)
+        return code
+
+    def start(self, name, position, in_lambda) -> CodeObject:
+        self.code = CodeObject(name, position)
+        self.in_lambda = in_lambda
+        self.loop_exits = []
+        self.constant_indexes = {}
+        return self.code
+
+    def emit(self, opcode, argument=0) -> int:
+        self.code.instructions.extend((opcode, argument))
+        return len(self.code.instructions) - 2
+
+    def label(self) -> int:
+        return len(self.code.instructions)
+
+    def patch(self, instruction, target):
+        self.code.instructions[instruction + 1] = target
+
+    def constant(self, value) -> int:
+        # 0.0 i -0.0 sa rowne, wiec literaly rozroznia repr
+        key = (type(value), repr(value)) if isinstance(value, (bool, int, float, str)) else id(value)
+        if (index := self.constant_indexes.get(key)) is None:
+            index = self.constant_indexes[key] = len(self.code.constants)
+            self.code.constants.append(value)
+        return index
+
+    def region(self, start, kind, position):
+        self.code.regions.append((start, self.label(), kind, position))
+
+    # instrukcje
+
+    def compile_statements(self, element: Statements):
+        defined = set(self.defined)
+        for statement in element.statements if element is not None else []:
+            self.compile_statement(statement)
+            if isinstance(statement, (ReturnStatement, BreakStatement)):
+                continue
+            if self.in_lambda or self.check_return_flag:
+                self.emit(CHECK_RETURN_FLAG, int(self.in_lambda))
+        self.defined = defined
+
+    def compile_statement(self, element):
+        if isinstance(element, Statements):
+            self.compile_statements(element)
+        elif isinstance(element, ReturnStatement):
+            if isinstance(element.statement, FunctionCall) and not self.in_lambda:
+                # gdy cel nie jest funkcja BN, TAIL_CALL dziala jak CALL i dalej jest zwykly powrot
+                self.compile_function_call(element.statement, TAIL_CALL)
+                self.emit(SET_RESULT)
+            elif element.statement is not None:
+                self.compile_expression(element.statement)
+                self.emit(SET_RESULT)
+            if self.in_lambda:
+                self.lambda_returns = True
+            self.emit(RETURN, int(self.in_lambda))
+        elif isinstance(element, IfStatement):
+            self.compile_if(element)
+        elif isinstance(element, WhileStatement):
+            self.compile_while(element)
+        elif isinstance(element, BreakStatement):
+            if self.loop_exits:
+                self.loop_exits[-1].append(self.emit(JUMP))
+            else:
+                self.emit(RAISE_BREAK, self.constant(element.position))
+        elif isinstance(element, Assignment):
+            self.compile_assignment(element)
+        else:
+            self.compile_expression(element)
+            self.emit(SET_RESULT)
+
+    def compile_if(self, element: IfStatement):
+        self.compile_expression(element.condition)
+        jump_to_else = self.emit(SET_RESULT_JUMP_IF_FALSE)
+        self.compile_statements(element.statements)
+        if element.else_statement:
+            jump_to_end = self.emit(JUMP)
+            self.patch(jump_to_else, self.label())
+            self.compile_statements(element.else_statement)
+            self.patch(jump_to_end, self.label())
+        else:
+            self.patch(jump_to_else, self.label())
+
+    # jak w ExecuteVisitor: warunek liczony dwa razy przed pierwszym obrotem, a petla trwa, dopoki wynik
+    # ostatniej instrukcji ciala jest prawdziwy
+    def compile_while(self, element: WhileStatement):
+        self.compile_expression(element.condition)
+        self.emit(SET_RESULT)
+        start = self.label()
+        exits = [self.emit(JUMP_IF_RESULT_FALSE)]
+        self.compile_expression(element.condition)
+        exits.append(self.emit(SET_RESULT_JUMP_IF_FALSE))
+        self.loop_exits.append(exits)
+        self.compile_statements(element.statements)
+        self.loop_exits.pop()
+        self.emit(JUMP, start)
+        for instruction in exits:
+            self.patch(instruction, self.label())
+
+    def compile_assignment(self, element: Assignment):
+        start = self.label()
+        target = element.target
+        self.compile_expression(element.value)
+        if target.parent is not None:
+            self.compile_expression(target.parent)
+            self.emit(ASSIGN_ATTR, self.constant(target.name))
+        elif self.in_lambda:
+            self.emit(ASSIGN_NAME_LITERAL if isinstance(element.value, Array) else ASSIGN_NAME, self.constant(target.name))
+        else:
+            self.emit(ASSIGN_LOCAL_LITERAL if isinstance(element.value, Array) else ASSIGN_LOCAL, target.slot)
+            self.defined.add(target.name)
+        self.region(start, ASSIGNMENT_REGION, element.position)
+
+    # wyrazenia zostawiaja wartosc na stosie
+
+    def compile_expression(self, element):
+        if isinstance(element, _LITERALS):
+            self.emit(LOAD_CONST, self.constant(element.value))
+        elif isinstance(element, Identifier):
+            self.compile_identifier(element)
+        elif isinstance(element, ArthExpression):
+            self.compile_binary(element, ARTH_OPERATIONS[type(element)], element.position, BINARY)
+        elif isinstance(element, BinaryOperation):
+            self.compile_binary(element, COMPARISONS[type(element)], None, COMPARE)
+        elif isinstance(element, FunctionCall):
+            self.compile_function_call(element)
+        elif isinstance(element, OrExpression):
+            self.compile_logic_expression(element, JUMP_IF_TRUE_OR_KEEP, OR_DECIDED, OR_VALUES)
+        elif isinstance(element, AndExpression):
+            self.compile_logic_expression(element, JUMP_IF_FALSE_OR_KEEP, AND_DECIDED, AND_VALUES)
+        elif isinstance(element, Negation):
+            start = self.label()
+            self.compile_expression(element.node)
+            self.emit(NOT if element.negation_type == 'Logic' else NEGATIVE)
+            self.region(start, NEGATION_REGION, element.position)
+        elif isinstance(element, Array):
+            for item in element.items:
+                self.compile_expression(item)
+            self.emit(BUILD_LIST, len(element.items))
+        elif isinstance(element, FunctionArguments):
+            for argument in element.arguments:
+                self.compile_expression(argument)
+            self.emit(BUILD_LIST, len(element.arguments))
+        elif isinstance(element, LambdaExpression):
+            if self.in_lambda:
+                self.emit(CLEAR_NAME, self.constant(element.variable_name))
+            else:
+                self.emit(CLEAR_LOCAL, element.slot)
+                self.defined.add(element.variable_name)
+            if element.statements is not None:
+                self.lambdas.append(element.statements)
+            self.emit(MAKE_LAMBDA, self.constant((element.variable_name, element.statements)))
+        else:
+            # brakujacy wezel (np. "f(1, )") daje ten sam blad co w ExecuteVisitor
+            self.emit(FALLBACK, self.constant(element))
+
+    # BINARY/COMPARE i ich wersje CONST oraz FAST_CONST leza w tej kolejnosci
+    def compile_binary(self, element, operation, position, opcode):
+        details = (operation,) if position is None else (operation, position)
+        left, right = element.left, element.right
+        if not isinstance(right, _LITERALS):
+            self.compile_expression(left)
+            self.compile_expression(right)
+            self.emit(opcode, self.constant(details))
+        elif isinstance(left, Identifier) and left.parent is None and not self.in_lambda and left.name in self.defined:
+            self.emit(opcode + 2, self.constant((left.slot, operation, right.value) + details[1:]))
+        else:
+            self.compile_expression(left)
+            self.emit(opcode + 1, self.constant((operation, right.value) + details[1:]))
+
+    def compile_identifier(self, element: Identifier):
+        if element.parent is not None:
+            self.compile_expression(element.parent)
+            self.emit(LOAD_ATTR, self.constant(element.name))
+        elif self.in_lambda:
+            self.emit(LOAD_NAME, self.constant(element.name))
+        elif element.name in self.defined:
+            self.emit(LOAD_FAST, element.slot)
+        else:
+            self.emit(LOAD_LOCAL, element.slot)
+
+    def compile_function_call(self, element: FunctionCall, opcode=CALL):
+        if element.parent is not None:
+            self.emit(ENTER_CALL)
+            self.compile_expression(element.parent)
+        else:
+            self.emit(ENTER_CALL, 1)
+        self.compile_expression(element.arguments)
+        self.emit(opcode, self.constant(element))
+
+    # to samo co ExecuteVisitor.visit_or_expression / visit_and_expression
+    def compile_logic_expression(self, element, jump_if_done, is_decided, combine):
+        self.compile_expression(element.nodes[0])
+        jumps = [self.emit(jump_if_done)]
+        for node in element.nodes[1:]:
+            jumps.append(self.emit(is_decided))
+            self.compile_expression(node)
+            self.emit(combine)
+        for instruction in jumps:
+            self.patch(instruction, self.label())
@@ -0,0 +1,448 @@
+import operator
+
+from interpreter.parser.syntax_tree import *
+from .executeVisitor import ExecuteVisitor
+from .interpreter import UNDEFINED
+from .interpreter_error import *
+from .linker import DEFINED
+from .purity import DEFAULT_MEMO_SIZE, MISS
+from . import operations
+from ..parser.resolver import SlotResolver
+
+# instrukcja, ktora nie zmienia last_result ("return;", "break;")
+_KEEP = object()
+
+
+# wynik "return f(...);" w ciele funkcji: wywolanie funkcji BN wykonywane przez wywolujacego (call_compiled)
+# po zakonczeniu biezacej funkcji, zamiast zagniezdzania wywolan na stosie pythona
+class TailCall:
+    __slots__ = ('function', 'args', 'arguments_list')
+
+    def __init__(self, function, args, arguments_list):
+        self.function = function
+        self.args = args
+        self.arguments_list = arguments_list
+
+
+_COMPARISONS = {
+    EqualOperation: operator.eq,
+    NotEqualOperation: operator.ne,
+    GreaterOperation: operator.gt,
+    GreaterEqualOperation: operator.ge,
+    LessOperation: operator.lt,
+    LessEqualOperation: operator.le,
+}
+
+_LITERALS = (LiteralBool, LiteralInt, LiteralFloat, LiteralString)
+
+
+# silnik wykonujacy funkcje skompilowane raz do zagniezdzonych domkniec pythonowych
+# wyrazenia zwracaja wartosc bezposrednio, instrukcje zwracaja wartosc, ktora ExecuteVisitor zostawilby w
+# last_result, albo _KEEP; flagi return/break, konteksty i licznik rekurencji sa te same co w ExecuteVisitor
+class ClosureExecutor(ExecuteVisitor):
+    def __init__(self, recursion_limit=100, memo_size=DEFAULT_MEMO_SIZE, workers=None):
+        super().__init__(recursion_limit, memo_size, workers)
+        self.compiled = {}
+        # wlaczone podczas kompilacji ciala funkcji, ciala lambd wykonuja where/foreach i nie maja wywolan ogonowych
+        self.in_function_body = False
+
+    def get_compiled(self, element, compile):
+        if (compiled := self.compiled.get(element)) is None:
+            compiled = self.compiled[element] = compile(element)
+        return compiled
+
+    # wejscia z ExecuteVisitor (Interpreter.execute, funkcje wbudowane where/foreach) trafiaja do skompilowanego kodu
+    def call_function_definition(self, element, args):
+        self.last_result = self.call_compiled(element, args, self.last_result)
+
+    # wywolanie funkcji BN w nowym kontekscie przygotowanym przez wywolujacego
+    # kolejne wywolania ogonowe zastepuja ten kontekst nowym, jak przy powrocie i ponownym wywolaniu
+    def call_compiled(self, function, args, arguments_list):
+        result = self.get_compiled(function, self.compile_function)(args)
+        if result is _KEEP:
+            return arguments_list
+        if type(result) is TailCall:
+            return self.run_tail_calls(result)
+        return result
+
+    # trampolina: wywolanie ogonowe wraca jako TailCall i jest wykonywane tutaj, bez zagniezdzania
+    # ramek pythona i kontekstow
+    def run_tail_calls(self, result):
+        tail_calls = 0
+        try:
+            while type(result) is TailCall:
+                tail_calls += 1
+                result = self.call_tail(result)
+            return result
+        finally:
+            # licznik rekurencji zwiekszony w tail_call dla kazdego zastapionego wywolania
+            self.recursion_depth = max(self.recursion_depth - tail_calls, 0)
+
+    def call_tail(self, call: TailCall):
+        self.pop_context()
+        self.add_context()
+        result = self.get_compiled(call.function, self.compile_function)(call.args)
+        return call.arguments_list if result is _KEEP else result
+
+    def visit_statements(self, element: Statements):
+        result = self.get_compiled(element, self.compile_statements)()
+        if result is not _KEEP:
+            self.last_result = result
+
+    def visit_function_call(self, element: FunctionCall):
+        self.last_result = self.get_compiled(element, self.compile_expression)()
+
+    def compile_function(self, element: FunctionDefintion):
+        if element.frame_size is None:
+            SlotResolver().resolve(element)
+        in_function_body, self.in_function_body = self.in_function_body, True
+        try:
+            body = self.compile_statement(element.statements)
+        finally:
+            self.in_function_body = in_function_body
+        parameters_count = len(element.parameters)
+        frame_size = element.frame_size
+        position = element.position
+
+        def function(args):
+            if len(args) != parameters_count:
+                raise ValueError(f"Expected {parameters_count} arguments, got {len(args)} at postion: {position}")
+            context = self.context
+            context.new_frame(frame_size)
+            for slot, arg in enumerate(args):
+                context.set_slot(slot, arg)
+            result = body()
+            self.return_flag = False
+            return result
+        return function
+
+    def compile_statements(self, element: Statements):
+        statements = [self.compile_statement(statement) for statement in element.statements]
+
+        def run_statements():
+            result = _KEEP
+            for statement in statements:
+                value = statement()
+                if value is not _KEEP:
+                    result = value
+                if self.return_flag or self.break_flag:
+                    break
+            return result
+        return run_statements
+
+    def compile_statement(self, element):
+        if isinstance(element, Statements):
+            return self.compile_statements(element)
+        if isinstance(element, ReturnStatement):
+            return self.compile_return(element)
+        if isinstance(element, IfStatement):
+            return self.compile_if(element)
+        if isinstance(element, WhileStatement):
+            return self.compile_while(element)
+        if isinstance(element, BreakStatement):
+            return self.compile_break(element)
+        if isinstance(element, Assignment):
+            return self.compile_assignment(element)
+        return self.compile_expression(element)
+
+    def compile_return(self, element: ReturnStatement):
+        if element.statement is None:
+            def return_nothing():
+                self.return_flag = True
+                return _KEEP
+            return return_nothing
+        if self.in_function_body and isinstance(element.statement, FunctionCall):
+            value = self.compile_tail_call(element.statement)
+        else:
+            value = self.compile_expression(element.statement)
+
+        def return_value():
+            result = value()
+            self.return_flag = True
+            return result
+        return return_value
+
+    def compile_if(self, element: IfStatement):
+        condition = self.compile_expression(element.condition)
+        statements = self.compile_statement(element.statements)
+        else_statement = self.compile_statement(element.else_statement) if element.else_statement else None
+
+        def if_statement():
+            result = condition()
+            if result:
+                value = statements()
+            elif else_statement is not None:
+                value = else_statement()
+            else:
+                return result
+            return result if value is _KEEP else value
+        return if_statement
+
+    # jak w ExecuteVisitor: warunek liczony dwa razy przed pierwszym obrotem, a petla trwa, dopoki wynik
+    # ostatniej instrukcji ciala (last_result) jest prawdziwy
+    def compile_while(self, element: WhileStatement):
+        condition = self.compile_expression(element.condition)
+        statements = self.compile_statement(element.statements)
+
+        def while_statement():
+            context = self.context
+            context.while_flag += 1
+            result = condition()
+            while result:
+                context.reset_flags()
+                result = condition()
+                if not result or self.break_flag:
+                    break
+                value = statements()
+                if value is not _KEEP:
+                    result = value
+                if self.return_flag or self.break_flag:
+                    break
+            self.break_flag = False
+            context.while_flag -= 1
+            return result
+        return while_statement
+
+    def compile_break(self, element: BreakStatement):
+        position = element.position
+
+        def break_statement():
+            if self.context.while_flag == 0:
+                raise RuntimeError(f"Break statement used outside of while loop at position: {position}")
+            self.break_flag = True
+            return _KEEP
+        return break_statement
+
+    def compile_assignment(self, element: Assignment):
+        value = self.compile_expression(element.value)
+        target = element.target
+        position = element.position
+        name = target.name
+        slot = target.slot
+        parent = self.compile_expression(target.parent) if target.parent else None
+        owned = isinstance(element.value, Array)
+
+        def assignment():
+            try:
+                result = value()
+                if parent is not None:
+                    object = parent()
+                    setattr(object, name, result)
+                    return object
+                elif slot is not None:
+                    if isinstance(result, list):
+                        self.context.set_slot(slot, result, owned)
+                    else:
+                        self.context.frame[slot] = result
+                else:
+                    self.context.add_variable(name, result, owned)
+                return result
+            except AttributeError as e:
+                raise AttributeError(f"Attribute error: {str(e)} at position: {position}")
+            except Exception as e:
+                raise RuntimeError(f"Error during assignment: {str(e)} at position: {position}")
+        return assignment
+
+    def compile_expression(self, element):
+        if isinstance(element, _LITERALS):
+            value = element.value
+            return lambda: value
+        if isinstance(element, Identifier):
+            return self.compile_identifier(element)
+        if isinstance(element, ArthExpression):
+            return self.compile_arth_expression(element)
+        if isinstance(element, BinaryOperation):
+            return self.compile_comparison(element)
+        if isinstance(element, FunctionCall):
+            return self.compile_function_call(element)
+        if isinstance(element, OrExpression):
+            return self.compile_or_expression(element)
+        if isinstance(element, AndExpression):
+            return self.compile_and_expression(element)
+        if isinstance(element, Negation):
+            return self.compile_negation(element)
+        if isinstance(element, Array):
+            items = [self.compile_expression(item) for item in element.items]
+            return lambda: [item() for item in items]
+        if isinstance(element, FunctionArguments):
+            arguments = [self.compile_expression(argument) for argument in element.arguments]
+            return lambda: [argument() for argument in arguments]
+        if isinstance(element, LambdaExpression):
+            return self.compile_lambda_expression(element)
+        # pozostale przypadki (np. brakujacy wezel) wykonuje ExecuteVisitor, z tymi samymi bledami
+        return self.compile_fallback(element)
+
+    def compile_fallback(self, element):
+        def fallback():
+            element.accept(self)
+            return self.last_result
+        return fallback
+
+    def compile_identifier(self, element: Identifier):
+        name = element.name
+        if element.parent is not None:
+            parent = self.compile_expression(element.parent)
+            return lambda: getattr(parent(), name)
+        if element.slot is None:
+            return lambda: self.context.get_variable(name)
+        slot = element.slot
+
+        def identifier():
+            value = self.context.frame[slot]
+            if value is UNDEFINED:
+                raise KeyError(f"Variable '{name}' is not defined.")
+            return value
+        return identifier
+
+    # operandy bedace literalem albo zmienna lokalna sa czytane bez wywolywania osobnego domkniecia
+    def compile_binary(self, element, operation):
+        left, right = element.left, element.right
+        if isinstance(right, _LITERALS):
+            value = right.value
+            if isinstance(left, Identifier) and left.parent is None and left.slot is not None:
+                slot, name = left.slot, left.name
+
+                def slot_and_literal():
+                    left_value = self.context.frame[slot]
+                    if left_value is UNDEFINED:
+                        raise KeyError(f"Variable '{name}' is not defined.")
+                    return operation(left_value, value)
+                return slot_and_literal
+            left = self.compile_expression(left)
+            return lambda: operation(left(), value)
+        left = self.compile_expression(left)
+        right = self.compile_expression(right)
+        return lambda: operation(left(), right())
+
+    def compile_arth_expression(self, element: ArthExpression):
+        if (site := self.operator_sites.get(element)) is None:
+            site = self.type_feedback.add_site(element)
+        evaluate = site.evaluate
+        if isinstance(element, DivExpression):
+            def divide(left_value, right_value):
+                if right_value == 0:
+                    raise ZeroDivisionError("Division by zero is not allowed")
+                return evaluate(left_value, right_value)
+            return self.compile_binary(element, divide)
+        return self.compile_binary(element, evaluate)
+
+    def compile_comparison(self, element: BinaryOperation):
+        return self.compile_binary(element, _COMPARISONS[type(element)])
+
+    def compile_or_expression(self, element: OrExpression):
+        first = self.compile_expression(element.nodes[0])
+        nodes = [self.compile_expression(node) for node in element.nodes[1:]]
+
+        def or_expression():
+            x = first()
+            if x:
+                return x
+            for node in nodes:
+                if operations.or_is_decided(x):
+                    return True
+                x = operations.or_values(x, node())
+            return x
+        return or_expression
+
+    def compile_and_expression(self, element: AndExpression):
+        first = self.compile_expression(element.nodes[0])
+        nodes = [self.compile_expression(node) for node in element.nodes[1:]]
+
+        def and_expression():
+            x = first()
+            if not x:
+                return x
+            for node in nodes:
+                if operations.and_is_decided(x):
+                    return False
+                x = operations.and_values(x, node())
+            return x
+        return and_expression
+
+    def compile_negation(self, element: Negation):
+        node = self.compile_expression(element.node)
+        position = element.position
+        logic = element.negation_type == 'Logic'
+
+        def negation():
+            try:
+                return not node() if logic else - node()
+            except TypeError:
+                raise TypeError(f"Invalid negation at position: {position}")
+        return negation
+
+    def compile_lambda_expression(self, element: LambdaExpression):
+        name = element.variable_name
+        slot = element.slot
+        statements = element.statements
+
+        def lambda_expression():
+            if slot is not None:
+                self.context.set_slot(slot, None)
+            else:
+                self.context.add_variable(name, None)
+            return [name, statements]
+        return lambda_expression
+
+    def compile_function_call(self, element: FunctionCall):
+        parent = self.compile_expression(element.parent) if element.parent is not None else None
+        arguments = self.compile_expression(element.arguments)
+
+        def function_call():
+            try:
+                self.increment_recursion_depth()
+                parent_value = parent() if parent is not None else None
+                arguments_list = arguments()
+                args = [parent_value] + arguments_list if parent_value is not None else arguments_list
+
+                target = element.target
+                if target is None or target.epoch is not self.functions_epoch:
+                    target = self.link_call(element)
+                if target.kind != DEFINED:
+                    return self.call_native(target, args, arguments_list)
+                memo = target.memo
+                key = memo.get_key(args) if memo is not None else None
+                if key is not None and (result := memo.get(key)) is not MISS:
+                    return result
+                self.add_context()
+                result = self.call_compiled(target.function, args, arguments_list)
+                self.pop_context()
+                if key is not None:
+                    memo.put(key, result)
+                return result
+            except RecursionError:
+                # stos pythona skonczyl sie przed limitem glebokosci BN (recursion_limit)
+                raise RecursionLimitExceeded() from None
+            finally:
+                self.decrement_recursion_depth()
+        return function_call
+
+    # jak function_call, ale funkcja BN nie jest wywolywana, tylko przekazywana do call_compiled wywolujacego
+    # razem z licznikiem rekurencji zwiekszonym tak jak przy zwyklym wywolaniu
+    def compile_tail_call(self, element: FunctionCall):
+        parent = self.compile_expression(element.parent) if element.parent is not None else None
+        arguments = self.compile_expression(element.arguments)
+
+        def tail_call():
+            tail = None
+            try:
+                self.increment_recursion_depth()
+                parent_value = parent() if parent is not None else None
+                arguments_list = arguments()
+                args = [parent_value] + arguments_list if parent_value is not None else arguments_list
+
+                target = element.target
+                if target is None or target.epoch is not self.functions_epoch:
+                    target = self.link_call(element)
+                if target.kind != DEFINED:
+                    return self.call_native(target, args, arguments_list)
+                # zapamietany wynik zwraca sie od razu, wynik calego lancucha zapisuje pierwsze wywolanie
+                if (memo := target.memo) is not None and (key := memo.get_key(args)) is not None \
+                        and (result := memo.get(key)) is not MISS:
+                    return result
+                tail = TailCall(target.function, args, arguments_list)
+                return tail
+            finally:
+                if tail is None:
+                    self.decrement_recursion_depth()
+        return tail_call
@@ -0,0 +1,35 @@
+import os
+
+from .executeVisitor import ExecuteVisitor
+from .closureExecutor import ClosureExecutor
+from .pythonExecutor import PythonExecutor
+from .vmExecutor import VMExecutor
+
+# silniki wykonania: nazwa z parametru engine albo ze zmiennej srodowiskowej BN_ENGINE, bez nich tree
+# limit glebokosci wywolan z parametru recursion_limit albo ze zmiennej BN_RECURSION_LIMIT,
+# rozmiar pamieci wynikow czystych funkcji z parametru memo_size albo ze zmiennej BN_MEMO_SIZE,
+# liczba procesow parallelWhere/parallelForeach z parametru workers albo ze zmiennej BN_WORKERS
+ENGINES = {
+    'tree': ExecuteVisitor,
+    'closure': ClosureExecutor,
+    'python': PythonExecutor,
+    'vm': VMExecutor,
+}
+DEFAULT_ENGINE = 'tree'
+
+
+def get_engine_name(engine=None) -> str:
+    return engine or os.environ.get('BN_ENGINE') or DEFAULT_ENGINE
+
+
+def create_visitor(engine=None, **kwargs) -> ExecuteVisitor:
+    name = get_engine_name(engine)
+    if name not in ENGINES:
+        raise ValueError(f"Unknown engine '{name}', available engines: {', '.join(ENGINES)}")
+    if 'recursion_limit' not in kwargs and (limit := os.environ.get('BN_RECURSION_LIMIT')):
+        kwargs['recursion_limit'] = int(limit)
+    if 'memo_size' not in kwargs and (size := os.environ.get('BN_MEMO_SIZE')):
+        kwargs['memo_size'] = int(size)
+    if 'workers' not in kwargs and (workers := os.environ.get('BN_WORKERS')):
+        kwargs['workers'] = int(workers)
+    return ENGINES[name](**kwargs)
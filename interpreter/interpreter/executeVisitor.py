@@ -1,15 +1,22 @@
 from interpreter.parser.syntax_tree import *
 from .interpreter import Context
 from .interpreter_error import *
+from . import operations
 import numpy as np
 import numbers
 import sys, os
 from .builtins import ImportedObject, built_in_functions
+from .feedback import TypeFeedback
+from .linker import DEFINED, LAMBDA_NATIVE, METHOD, MISSING, NATIVE, CallSiteLinker, CallTarget
+from .purity import DEFAULT_MEMO_SIZE, MISS, MemoCache, PurityAnalyzer
+from ..parser.resolver import SlotResolver
 
 class ExecuteVisitor(Visitor):
-    def __init__(self, recursion_limit=100):
+    def __init__(self, recursion_limit=100, memo_size=DEFAULT_MEMO_SIZE, workers=None):
         super().__init__()
         self.functions = built_in_functions.copy()
+        # zmienia sie razem z tablica funkcji, uniewaznia cele wywolan zapamietane w wezlach FunctionCall
+        self.functions_epoch = object()
         self.includes = {}
         self.context_stack = [Context()]
         self.context = self.context_stack[-1] 
@@ -19,6 +26,20 @@ class ExecuteVisitor(Visitor):
         self.recursion_limit = recursion_limit
         self.return_flag = False
         self.break_flag = False
+        # typy argumentow operatorow arytmetycznych, miejsca stale w typach dostaja szybsza operacje
+        self.type_feedback = TypeFeedback()
+        self.operator_sites = self.type_feedback.sites
+        # pamiec wynikow czystych funkcji BN, memo_size 0 wylacza zapamietywanie
+        self.memo_size = memo_size
+        self.memo_caches = {}
+        # ciala lambd where/foreach zamienione na operacje NumPy (vectorize.get_kernel)
+        self.vector_kernels = {}
+        # ciala lambd, ktore sekwencje moga wykonac pozniej (sequence.is_deferrable)
+        self.deferrable_lambdas = {}
+        # procesy dla parallelWhere/parallelForeach, domyslnie po jednym na rdzen
+        self.workers = workers or os.cpu_count() or 1
+        # pula tych procesow (parallel.WorkerPool), zamykana po wykonaniu programu
+        self.worker_pool = None
     
     def increment_recursion_depth(self):
         if self.recursion_depth >= self.recursion_limit:
@@ -31,6 +52,9 @@ class ExecuteVisitor(Visitor):
     
     def add_function(self, name, fun):
         self.functions[name] = fun
+        self.functions_epoch = object()
+        # czystosc funkcji zalezy od tablicy funkcji, analize powtarza visit_program
+        self.memo_caches = {}
 
     def get_function(self, name):
         func = self.functions.get(name)
@@ -60,13 +84,28 @@ class ExecuteVisitor(Visitor):
         
         if 'main' not in self.functions:
             raise MainFunctionRequired()
+        if self.memo_size:
+            for function in PurityAnalyzer(self.functions).analyze(element):
+                self.memo_caches[function] = MemoCache(function.name, self.memo_size)
+        CallSiteLinker(self).visit_program(element)
+
+    # statystyki pamieci wynikow: nazwa funkcji -> hits, misses, evictions, size, max_size
+    def get_memo_stats(self) -> dict:
+        return {memo.name: memo.get_stats() for memo in self.memo_caches.values()}
 
     def visit_function_definition(self, element):
         args, method_name = self.additional_args
+        self.call_function_definition(element, args)
+
+    # wykonuje funkcje BN w biezacym kontekscie, wynik zostaje w last_result
+    def call_function_definition(self, element, args):
         if len(args) != len(element.parameters):
             raise ValueError(f"Expected {len(element.parameters)} arguments, got {len(args)} at postion: {element.position}")
-        for arg, param in zip(args, element.parameters):
-            self.context.add_variable(param, arg)
+        if element.frame_size is None:
+            SlotResolver().resolve(element)
+        self.context.new_frame(element.frame_size)
+        for slot, arg in enumerate(args):
+            self.context.set_slot(slot, arg)
         element.statements.accept(self)
         self.return_flag = False
 
@@ -88,7 +127,10 @@ class ExecuteVisitor(Visitor):
             raise ImportError(f"Nie można zaimportować: {str(e)}")
 
     def visit_lambda_expression(self, element: LambdaExpression):
-        self.context.add_variable(element.variable_name, None)
+        if element.slot is not None:
+            self.context.set_slot(element.slot, None)
+        else:
+            self.context.add_variable(element.variable_name, None)
         self.last_result = [element.variable_name, element.statements]
 
     def visit_function_arguments(self, element):
@@ -102,6 +144,8 @@ class ExecuteVisitor(Visitor):
         if element.parent is not None:
             element.parent.accept(self)
             self.last_result =  getattr(self.last_result, element.name)
+        elif element.slot is not None:
+            self.last_result = self.context.get_slot(element.slot, element.name)
         else:
             self.last_result = self.context.get_variable(element.name)
 
@@ -146,22 +190,11 @@ class ExecuteVisitor(Visitor):
         if x:
             return
         for node in element.nodes[1:]:
-            temp_cond = isinstance(x, np.ndarray)
-            if (temp_cond and x.dtype == bool and x.all()) or (not temp_cond and x):
+            if operations.or_is_decided(x):
                 self.last_result = True
                 return
-            
             node.accept(self)
-            term = self.last_result
-            if (temp_cond and x.dtype != bool) or \
-                isinstance(term, np.ndarray) and term.dtype != bool:
-                raise OrOperationError(x, term)
-            elif isinstance(x, np.ndarray) and isinstance(term, np.ndarray):
-                x = x | term
-            elif not isinstance(x, numbers.Number) or not isinstance(term, numbers.Number):
-                raise OrOperationError(x, term)
-            else:
-                x = bool(x) or bool(term)
+            x = operations.or_values(x, self.last_result)
         self.last_result = x
 
     def visit_and_expression(self, element: AndExpression) :
@@ -170,22 +203,11 @@ class ExecuteVisitor(Visitor):
         if not x:
             return
         for node in element.nodes[1:]:
-            temp_cond = isinstance(x, np.ndarray)
-            if (temp_cond and x.dtype == bool and not x.all()) or (not temp_cond and not x):
+            if operations.and_is_decided(x):
                 self.last_result = False
                 return
-            
             node.accept(self)
-            term = self.last_result
-            if (temp_cond and x.dtype != bool) or \
-                isinstance(term, np.ndarray) and term.dtype != bool:
-                raise AndOperationError(x, term)
-            elif isinstance(x, np.ndarray) and isinstance(term, np.ndarray):
-                x = x & term
-            elif not isinstance(x, numbers.Number) or not isinstance(term, numbers.Number):
-                raise AndOperationError(x, term)
-            else:
-                x = bool(x) and bool(term)
+            x = operations.and_values(x, self.last_result)
         self.last_result = x
     
     def visit_negation(self, element: Negation) :
@@ -207,50 +229,27 @@ class ExecuteVisitor(Visitor):
         left_value = self.last_result
         element.right.accept(self)
         right_value = self.last_result
-        self.last_result = self.try_sum(left_value, right_value, element.position)
-    
-    def try_sum(self, left_value, right_value, position):
-        if isinstance(left_value, int) and isinstance(right_value, int):
-            return left_value + right_value
-        if isinstance(left_value, (int, float)) and isinstance(right_value, (int, float)):
-            return float(left_value) + float(right_value)
-        elif isinstance(left_value, (int, float)) and isinstance(right_value, str):
-            return str(left_value) + str(right_value)
-        elif isinstance(left_value, str) and isinstance(right_value, (int, float)):
-            return left_value + str(right_value)
-        elif type(left_value) == type(right_value):
-            return left_value + right_value
-        else:
-            raise TypeError(f"Unsupported operand types for +: '{type(left_value).__name__}' and '{type(right_value).__name__}' at position: {position}")
+        if (site := self.operator_sites.get(element)) is None:
+            site = self.type_feedback.add_site(element)
+        self.last_result = site.evaluate(left_value, right_value)
 
     def visit_sub_expression(self, element: SubExpression):
         element.left.accept(self)
         left_value = self.last_result
         element.right.accept(self)
         right_value = self.last_result
-        self.last_result = self.try_sub(left_value, right_value, element.position)
-    
-    def try_sub(self, left_value, right_value, position):
-        if isinstance(left_value, (float, int)) and isinstance(right_value, (float, int))\
-            or (isinstance(left_value, bool) and isinstance(right_value, bool)):
-                return left_value - right_value
-        else:
-            raise TypeError(f"Unsupported operand types for -: '{type(left_value).__name__}' and '{type(right_value).__name__}' at position: {position}")
+        if (site := self.operator_sites.get(element)) is None:
+            site = self.type_feedback.add_site(element)
+        self.last_result = site.evaluate(left_value, right_value)
 
     def visit_mul_expression(self, element: MulExpression):
         element.left.accept(self)
         left_value = self.last_result
         element.right.accept(self)
         right_value = self.last_result
-        self.last_result = self.try_mulitply(left_value, right_value, element.position)
-    
-    def try_mulitply(self, left_value, right_value, position):
-        if isinstance(left_value, (float, int)) and isinstance(right_value, (float, int))\
-            or (isinstance(left_value, int) and isinstance(right_value, str))\
-            or (isinstance(left_value, str) and isinstance(right_value, int)):
-                return left_value * right_value
-        else:
-            raise TypeError(f"Unsupported operand types for *: '{type(left_value).__name__}' and '{type(right_value).__name__}' at position: {position}")
+        if (site := self.operator_sites.get(element)) is None:
+            site = self.type_feedback.add_site(element)
+        self.last_result = site.evaluate(left_value, right_value)
 
     def visit_div_expression(self, element: DivExpression):
         element.left.accept(self)
@@ -259,13 +258,9 @@ class ExecuteVisitor(Visitor):
         right_value = self.last_result
         if right_value == 0:
             raise ZeroDivisionError("Division by zero is not allowed")
-        self.last_result = self.try_divide(left_value, right_value, element.position)
-    
-    def try_divide(self, left_value, right_value, position):
-        if isinstance(left_value, (float, int)) and isinstance(right_value, (float, int)):
-            return left_value / right_value
-        else:
-            raise TypeError(f"Unsupported operand types for *: '{type(left_value).__name__}' and '{type(right_value).__name__}' at position: {position}")
+        if (site := self.operator_sites.get(element)) is None:
+            site = self.type_feedback.add_site(element)
+        self.last_result = site.evaluate(left_value, right_value)
 
     def visit_equal_operation(self, element: EqualOperation):
         element.left.accept(self)
@@ -336,8 +331,10 @@ class ExecuteVisitor(Visitor):
                 element.target.parent.accept(self)
                 object = self.last_result
                 setattr(object, element.target.name, value)
+            elif element.target.slot is not None:
+                self.context.set_slot(element.target.slot, value, isinstance(element.value, Array))
             else:
-                self.context.add_variable(element.target.name, value)
+                self.context.add_variable(element.target.name, value, isinstance(element.value, Array))
         except AttributeError as e:
             raise AttributeError(f"Attribute error: {str(e)} at position: {element.position}")
         except Exception as e:
@@ -351,33 +348,64 @@ class ExecuteVisitor(Visitor):
                 parent_value = self.last_result
             else:
                 parent_value = None
-            
-            args = self.get_args(element, parent_value)
-            
-            if function := self.get_function(element.function_name):
-                method_name = None 
-            elif function := self.get_class_method(element):
-                method_name = element.function_name
-            
-            if function is None:
-                raise FunctionDoesNotExist(element.function_name)
-            self.add_context()
-            self.additional_args = (args, method_name)
-            function.accept(self)
-            self.pop_context()
-        except RecursionLimitExceeded as e:
-            raise e
+            element.arguments.accept(self)
+            arguments_list = self.last_result
+            args = [parent_value] + arguments_list if parent_value is not None else arguments_list
+
+            target = element.target
+            if target is None or target.epoch is not self.functions_epoch:
+                target = self.link_call(element)
+            if target.kind == DEFINED:
+                memo = target.memo
+                key = memo.get_key(args) if memo is not None else None
+                if key is not None and (result := memo.get(key)) is not MISS:
+                    self.last_result = result
+                    return
+                self.add_context()
+                self.last_result = arguments_list
+                self.call_function_definition(target.function, args)
+                self.pop_context()
+                if key is not None:
+                    memo.put(key, self.last_result)
+            else:
+                self.last_result = self.call_native(target, args, arguments_list)
+        except RecursionError:
+            # stos pythona skonczyl sie przed limitem glebokosci BN (recursion_limit)
+            raise RecursionLimitExceeded() from None
         finally:
             self.decrement_recursion_depth()
-    
-    def get_args(self, element, parent_value):
-        args = []
-        element.arguments.accept(self)
-        args = self.last_result
-        if parent_value:
-            args = [parent_value] + args
-        return args
-    
+
+    # wyszukanie funkcji raz dla miejsca wywolania, do zmiany tablicy funkcji
+    def link_call(self, element: FunctionCall) -> CallTarget:
+        method_name = None
+        if function := self.get_function(element.function_name):
+            method_name = None
+        elif function := self.get_class_method(element):
+            method_name = element.function_name
+        target = element.target = CallTarget(self.functions_epoch, element.function_name, function, method_name)
+        if target.kind == DEFINED:
+            target.memo = self.memo_caches.get(function)
+        return target
+
+    # wywolanie celu, ktory nie jest funkcja BN; funkcje bez dostepu do wizytora nie dostaja kontekstu
+    def call_native(self, target: CallTarget, args, arguments_list):
+        kind = target.kind
+        if kind == NATIVE or kind == METHOD:
+            return target.callable(*args)
+        if kind == MISSING:
+            raise FunctionDoesNotExist(target.name)
+        self.add_context()
+        # where/foreach czytaja last_result po wykonaniu ciala lambdy
+        self.last_result = arguments_list
+        if kind == LAMBDA_NATIVE:
+            result = target.callable(self, *args)
+        else:
+            self.additional_args = (args, target.method_name)
+            target.function.accept(self)
+            result = self.last_result
+        self.pop_context()
+        return result
+
     def get_class_method(self, element):
         for obj in self.functions.values():
             if hasattr(obj, 'obj') and hasattr(obj.obj, element.function_name):
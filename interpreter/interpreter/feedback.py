@@ -0,0 +1,109 @@
+import operator
+
+from interpreter.parser.syntax_tree import *
+from . import operations
+
+# tyle obliczen z ta sama para typow, zanim miejsce dostanie wersje wyspecjalizowana
+SPECIALIZE_AFTER = 8
+
+GENERIC_OPERATIONS = {
+    SumExpression: operations.sum_values,
+    SubExpression: operations.sub_values,
+    MulExpression: operations.multiply_values,
+    DivExpression: operations.divide_values,
+}
+
+# operacje pythonowe dajace dla tych dokladnych typow ten sam wynik co operations.*
+# dzielenie przez zero sprawdza wywolujacy, przed obliczeniem
+SPECIALIZATIONS = {
+    (SumExpression, int, int): operator.add,
+    (SumExpression, float, float): operator.add,
+    (SumExpression, str, str): operator.add,
+    (SubExpression, int, int): operator.sub,
+    (SubExpression, float, float): operator.sub,
+    (MulExpression, int, int): operator.mul,
+    (MulExpression, float, float): operator.mul,
+    (DivExpression, int, int): operator.truediv,
+    (DivExpression, float, float): operator.truediv,
+}
+
+# stany miejsca
+WARMING = 0
+SPECIALIZED = 1
+GENERIC = 2
+
+
+# miejsce operatora arytmetycznego w drzewie; zapamietuje pare typow argumentow, a gdy przez
+# SPECIALIZE_AFTER obliczen jest ta sama, przechodzi na operacje wyspecjalizowana chroniona sprawdzeniem typow
+# inna para typow wraca do sciezki ogolnej na stale
+class OperatorSite:
+    __slots__ = ('feedback', 'element', 'generic', 'position', 'state', 'left_type', 'right_type', 'count', 'fast')
+
+    def __init__(self, feedback, element: ArthExpression):
+        self.feedback = feedback
+        self.element = element
+        self.generic = GENERIC_OPERATIONS[type(element)]
+        self.position = element.position
+        self.state = WARMING
+        self.left_type = None
+        self.right_type = None
+        self.count = 0
+        self.fast = None
+
+    def evaluate(self, left_value, right_value):
+        if type(left_value) is self.left_type and type(right_value) is self.right_type:
+            if (fast := self.fast) is not None:
+                return fast(left_value, right_value)
+            self.count += 1
+            if self.count >= SPECIALIZE_AFTER:
+                self.specialize()
+        elif self.state != GENERIC:
+            self.observe(type(left_value), type(right_value))
+        return self.generic(left_value, right_value, self.position)
+
+    def observe(self, left_type, right_type):
+        if self.state == WARMING and self.count == 0:
+            self.left_type = left_type
+            self.right_type = right_type
+            self.count = 1
+            return
+        if self.state == SPECIALIZED:
+            self.feedback.deoptimized += 1
+        self.make_generic()
+
+    def specialize(self):
+        fast = SPECIALIZATIONS.get((type(self.element), self.left_type, self.right_type))
+        if fast is None:
+            self.make_generic()
+            return
+        self.state = SPECIALIZED
+        self.fast = fast
+        self.feedback.specialized += 1
+
+    def make_generic(self):
+        self.state = GENERIC
+        self.left_type = None
+        self.right_type = None
+        self.fast = None
+
+
+# informacja zwrotna o typach dla wszystkich miejsc operatorow jednego wizytora
+class TypeFeedback:
+    def __init__(self):
+        self.sites = {}
+        self.specialized = 0
+        self.deoptimized = 0
+
+    def add_site(self, element: ArthExpression) -> OperatorSite:
+        site = self.sites[element] = OperatorSite(self, element)
+        return site
+
+    def get_counters(self) -> dict:
+        states = [site.state for site in self.sites.values()]
+        return {
+            'sites': len(states),
+            'specialized': self.specialized,
+            'deoptimized': self.deoptimized,
+            'active': states.count(SPECIALIZED),
+            'generic': states.count(GENERIC),
+        }
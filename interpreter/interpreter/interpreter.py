@@ -1,48 +1,171 @@
 from .builtins import built_in_functions
 from .interpreter_error import *
+from .parallel import close_pool
 from ..parser.syntax_tree import FunctionCall, FunctionArguments
+from .storage import ITEM_TYPES, MIN_TYPED_LENGTH, TYPECODES, array, sort_typed, sort_values, to_list, to_typed
     
+# wartosc listy BN w zmiennej, elementy w liscie albo w tablicy typowanej (storage.to_typed)
+# value daje zawsze liste pythona (tablice typowana zamienia na liste na stale, bo wywolujacy moze ja zmieniac),
+# a append/pop/get/length/sort/to_list/iter_items dzialaja bez tej zamiany
+# elementy wspoldzielone z leniwa sekwencja (snapshot) sa kopiowane przed pierwsza zmiana
+# tablice typowana dostaje tylko lista owned: nowy literal przypisany do zmiennej albo lista utworzona przez Array;
+# inna lista moze byc elementem innej listy, a jej zmiany musza byc widoczne we wszystkich odwolaniach
 class Array:
-    def __init__(self, value) -> None:
-        self.value = value
-    
-    def set_value(self, value):
-        self.value = value
+    def __init__(self, value, owned=False) -> None:
+        self.set_value(value, owned)
+
+    def set_value(self, value, owned=False):
+        if owned and type(value) is list and len(value) >= MIN_TYPED_LENGTH and (typed := to_typed(value)) is not None:
+            value = typed
+        self.set_storage(value, owned)
+
+    # item_type: typ elementow tablicy typowanej, None dla listy
+    def set_storage(self, storage, owned=True):
+        self.storage = storage
+        self.item_type = ITEM_TYPES[storage.typecode] if type(storage) is array else None
+        self.shared = False
+        self.owned = owned
+
+    # Array z obecnymi elementami dla sekwencji (Sequence.extend); zmiany obu tablic po tym wywolaniu
+    # nie sa widoczne w drugiej
+    def snapshot(self):
+        copy = Array.__new__(Array)
+        copy.storage = self.storage
+        copy.item_type = self.item_type
+        copy.owned = self.owned
+        copy.shared = self.shared = True
+        return copy
+
+    def copy_shared(self):
+        if self.shared:
+            self.set_storage(self.storage[:])
 
     def get_value(self):
         return self.value
-    
+
+    # zwrocona lista moze trafic w inne miejsca, wiec nie jest juz zamieniana na tablice typowana
+    @property
+    def value(self):
+        if self.item_type is not None:
+            self.set_storage(to_list(self.storage))
+        else:
+            self.copy_shared()
+        self.owned = False
+        return self.storage
+
+    @value.setter
+    def value(self, value):
+        self.set_value(value)
+
+    # elementy do odczytu: lista w tablicy albo nowa lista z tablicy typowanej
+    def to_list(self):
+        return self.storage if self.item_type is None else to_list(self.storage)
+
+    # elementy do jednego przejscia, bez kopiowania tablicy typowanej
+    def iter_items(self):
+        return map(bool, self.storage) if self.item_type is bool else self.storage
+
+    def length(self):
+        return len(self.storage)
+
+    def get(self, index):
+        value = self.storage[index]
+        return bool(value) if self.item_type is bool else value
+
+    def append(self, value):
+        self.copy_shared()
+        if type(value) is self.item_type:
+            try:
+                self.storage.append(value)
+                return
+            except OverflowError:
+                pass
+        storage = self.storage
+        if self.item_type is not None:
+            self.set_storage(to_list(storage))
+        elif not storage and self.owned and type(storage) is list and (typecode := TYPECODES.get(type(value))) is not None:
+            # pusta lista dostaje tablice typu pierwszego elementu
+            try:
+                self.set_storage(array(typecode, [value]))
+                return
+            except OverflowError:
+                pass
+        self.storage.append(value)
+
+    def pop(self, index):
+        self.copy_shared()
+        return self.storage.pop(index)
+
+    def sort(self):
+        self.copy_shared()
+        if self.item_type is not None:
+            self.set_storage(sort_typed(self.storage))
+        else:
+            sort_values(self.storage)
+
+
+# wartosc pustego miejsca w ramce, zmienna jeszcze nie zostala przypisana
+UNDEFINED = object()
+
 
 class Context:
+    __slots__ = ('variables', 'frame', 'while_flag', 'return_flag', 'break_flag')
+
     def __init__(self):
         self.variables = {}
+        # zmienne funkcji po rozwiazaniu przez SlotResolver, zmienne lambd zostaja w slowniku variables
+        self.frame = None
         self.while_flag = 0 # licznik while
+        self.return_flag = False
+        self.break_flag = False
     
     def reset_flags(self):
         self.return_flag = False
         self.break_flag = False
 
-    def add_variable(self, name, value):
+    def add_variable(self, name, value, owned=False):
         if isinstance(value, list):
             if name in self.variables:
-                self.variables[name].set_value(value)
+                self.variables[name].set_value(value, owned)
             else:
-                self.variables[name] = Array(value)
+                self.variables[name] = Array(value, owned)
         else:
             self.variables[name] = value
 
     def get_variable(self, name):
-        if name not in self.variables:
+        try:
+            return self.variables[name]
+        except KeyError:
+            raise KeyError(f"Variable '{name}' is not defined.") from None
+
+    def new_frame(self, size):
+        self.frame = [UNDEFINED] * size
+
+    # te same reguly co add_variable: lista trafia do Array, a istniejaca zmienna dostaje nowa wartosc przez set_value
+    def set_slot(self, slot, value, owned=False):
+        if isinstance(value, list):
+            if (variable := self.frame[slot]) is not UNDEFINED:
+                variable.set_value(value, owned)
+            else:
+                self.frame[slot] = Array(value, owned)
+        else:
+            self.frame[slot] = value
+
+    def get_slot(self, slot, name):
+        value = self.frame[slot]
+        if value is UNDEFINED:
             raise KeyError(f"Variable '{name}' is not defined.")
-        return self.variables.get(name)
+        return value
 
     def new_context(self):
         return Context()
 
 
 class Interpreter:
-    def __init__(self, program):
+    # engine wybiera silnik wykonania (engines.ENGINES), gdy execute nie dostanie gotowego visitora
+    def __init__(self, program, engine=None):
         self.program = program
+        self.engine = engine
     
     def get_nested_value(self, data):
         if hasattr(data, 'value'):
@@ -50,9 +173,16 @@ class Interpreter:
         else:
             return data
 
-    def execute(self, visitor):
-        self.program.accept(visitor)
-        main_call = FunctionCall(visitor.functions.get('main').position, 'main', FunctionArguments(visitor.functions.get('main').position, []))
-        main_call.accept(visitor)
+    def execute(self, visitor=None):
+        if visitor is None:
+            # import tutaj, bo silniki importuja Context z tego modulu
+            from .engines import create_visitor
+            visitor = create_visitor(self.engine)
+        try:
+            self.program.accept(visitor)
+            main_call = FunctionCall(visitor.functions.get('main').position, 'main', FunctionArguments(visitor.functions.get('main').position, []))
+            main_call.accept(visitor)
+        finally:
+            close_pool(visitor)
         ret_code = visitor.last_result if visitor.last_result is not None else 0
         return self.get_nested_value(ret_code)
@@ -0,0 +1,60 @@
+from interpreter.parser.syntax_tree import *
+from .builtins import BuiltInFunction, ImportedObject, LambdaFunction
+from ..parser.tree_walker import TreeWalker
+
+# rodzaje celow wywolania
+DEFINED = 0         # funkcja BN, sposob wykonania zalezy od silnika
+NATIVE = 1          # funkcja wbudowana, obiekt albo metoda importowana wywolywana bezposrednio
+LAMBDA_NATIVE = 2   # where/foreach, dostaja wizytora i wlasny kontekst
+ACCEPT = 3          # pozostale przez function.accept i additional_args
+MISSING = 4
+METHOD = 5          # metoda obiektu importowanego znalezionego przez get_class_method, dla kazdego typu odbiorcy ta sama
+
+
+# cel wywolania zapamietany w wezle FunctionCall; epoch to znacznik tablicy funkcji wizytora
+# (ExecuteVisitor.functions_epoch), ktory zmienia sie przy kazdym add_function
+class CallTarget:
+    __slots__ = ('epoch', 'name', 'function', 'method_name', 'kind', 'callable', 'memo')
+
+    def __init__(self, epoch, name, function, method_name) -> None:
+        self.epoch = epoch
+        self.name = name
+        self.function = function
+        self.method_name = method_name
+        self.callable = None
+        # pamiec wynikow (purity.MemoCache), gdy cel jest czysta funkcja BN
+        self.memo = None
+        if function is None:
+            self.kind = MISSING
+        elif isinstance(function, FunctionDefintion):
+            self.kind = DEFINED
+        elif isinstance(function, LambdaFunction):
+            self.kind = LAMBDA_NATIVE
+            self.callable = function.function
+        elif isinstance(function, BuiltInFunction):
+            self.kind = NATIVE
+            self.callable = function.function
+        elif isinstance(function, ImportedObject) and (imported := self.get_imported_callable(function)) is not None:
+            self.kind = METHOD if method_name else NATIVE
+            self.callable = imported
+        else:
+            self.kind = ACCEPT
+
+    # to samo co ExecuteVisitor.visit_imported_object, bledy i obiekty niewywolywalne zostaja dla accept
+    def get_imported_callable(self, function: ImportedObject):
+        if self.method_name:
+            method = getattr(function.obj, self.method_name, None)
+            return method if method and callable(method) else None
+        return function.obj if callable(function.obj) else None
+
+
+# wiaze wszystkie wywolania w przeparsowanych funkcjach programu (razem z cialami lambd) z ich celami
+# wywolania w nieprzeparsowanych funkcjach leniwych wiaze ExecuteVisitor przy pierwszym wykonaniu
+class CallSiteLinker(TreeWalker):
+    def __init__(self, visitor):
+        super().__init__()
+        self.visitor = visitor
+
+    def visit_function_call(self, element: FunctionCall):
+        super().visit_function_call(element)
+        self.visitor.link_call(element)
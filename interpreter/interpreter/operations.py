@@ -0,0 +1,103 @@
+import numbers
+import numpy as np
+
+from .interpreter_error import AndOperationError, OrOperationError
+from .sequence import Sequence
+
+# reguly koercji operatorow arytmetycznych i logicznych, wspolne dla ExecuteVisitor, ClosureExecutor i optymalizatora drzewa
+
+
+# leniwa sekwencja (where/foreach) jest w operatorach lista, tak jak wynik wykonania zachlannego
+def has_sequence(left_value, right_value) -> bool:
+    return type(left_value) is Sequence or type(right_value) is Sequence
+
+
+def as_lists(left_value, right_value):
+    return (left_value.value if type(left_value) is Sequence else left_value,
+            right_value.value if type(right_value) is Sequence else right_value)
+
+def sum_values(left_value, right_value, position):
+    if isinstance(left_value, int) and isinstance(right_value, int):
+        return left_value + right_value
+    if isinstance(left_value, (int, float)) and isinstance(right_value, (int, float)):
+        return float(left_value) + float(right_value)
+    elif isinstance(left_value, (int, float)) and isinstance(right_value, str):
+        return str(left_value) + str(right_value)
+    elif isinstance(left_value, str) and isinstance(right_value, (int, float)):
+        return left_value + str(right_value)
+    elif type(left_value) == type(right_value):
+        return left_value + right_value
+    elif has_sequence(left_value, right_value):
+        return sum_values(*as_lists(left_value, right_value), position)
+    else:
+        raise TypeError(f"Unsupported operand types for +: '{type(left_value).__name__}' and '{type(right_value).__name__}' at position: {position}")
+
+
+def sub_values(left_value, right_value, position):
+    if isinstance(left_value, (float, int)) and isinstance(right_value, (float, int))\
+        or (isinstance(left_value, bool) and isinstance(right_value, bool)):
+            return left_value - right_value
+    elif has_sequence(left_value, right_value):
+        return sub_values(*as_lists(left_value, right_value), position)
+    else:
+        raise TypeError(f"Unsupported operand types for -: '{type(left_value).__name__}' and '{type(right_value).__name__}' at position: {position}")
+
+
+def multiply_values(left_value, right_value, position):
+    if isinstance(left_value, (float, int)) and isinstance(right_value, (float, int))\
+        or (isinstance(left_value, int) and isinstance(right_value, str))\
+        or (isinstance(left_value, str) and isinstance(right_value, int)):
+            return left_value * right_value
+    elif has_sequence(left_value, right_value):
+        return multiply_values(*as_lists(left_value, right_value), position)
+    else:
+        raise TypeError(f"Unsupported operand types for *: '{type(left_value).__name__}' and '{type(right_value).__name__}' at position: {position}")
+
+
+# dzielenie przez zero jest sprawdzane wczesniej, w visit_div_expression
+def divide_values(left_value, right_value, position):
+    if isinstance(left_value, (float, int)) and isinstance(right_value, (float, int)):
+        return left_value / right_value
+    elif has_sequence(left_value, right_value):
+        return divide_values(*as_lists(left_value, right_value), position)
+    else:
+        raise TypeError(f"Unsupported operand types for *: '{type(left_value).__name__}' and '{type(right_value).__name__}' at position: {position}")
+
+
+# kolejny wyraz "or" nie jest liczony, gdy dotychczasowy wynik jest juz prawdziwy (tablica: same True)
+def or_is_decided(x) -> bool:
+    if isinstance(x, np.ndarray):
+        return x.dtype == bool and bool(x.all())
+    return bool(x)
+
+
+def or_values(x, term):
+    temp_cond = isinstance(x, np.ndarray)
+    if (temp_cond and x.dtype != bool) or \
+        isinstance(term, np.ndarray) and term.dtype != bool:
+        raise OrOperationError(x, term)
+    elif isinstance(x, np.ndarray) and isinstance(term, np.ndarray):
+        return x | term
+    elif not isinstance(x, numbers.Number) or not isinstance(term, numbers.Number):
+        raise OrOperationError(x, term)
+    else:
+        return bool(x) or bool(term)
+
+
+def and_is_decided(x) -> bool:
+    if isinstance(x, np.ndarray):
+        return x.dtype == bool and not x.all()
+    return not x
+
+
+def and_values(x, term):
+    temp_cond = isinstance(x, np.ndarray)
+    if (temp_cond and x.dtype != bool) or \
+        isinstance(term, np.ndarray) and term.dtype != bool:
+        raise AndOperationError(x, term)
+    elif isinstance(x, np.ndarray) and isinstance(term, np.ndarray):
+        return x & term
+    elif not isinstance(x, numbers.Number) or not isinstance(term, numbers.Number):
+        raise AndOperationError(x, term)
+    else:
+        return bool(x) and bool(term)
@@ -0,0 +1,101 @@
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from .sequence import is_deferrable, stream
+
+# krotsze listy sa liczone w jednym procesie, uruchomienie procesow kosztuje wiecej niz zysk
+MIN_PARALLEL_LENGTH = 10000
+
+# czesci listy na jeden proces, zeby rozne czasy wykonania czesci nie zostawialy procesow bez pracy
+CHUNKS_PER_WORKER = 4
+
+# typy elementow i wynikow przesylanych miedzy procesami
+SHARED_TYPES = frozenset((int, float, str, bool, type(None)))
+
+# wizytor i etapy dla procesow puli, fork kopiuje je razem z pamiecia procesu
+_worker = None
+
+
+def can_fork() -> bool:
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+def init_worker(visitor, stages):
+    global _worker
+    _worker = (visitor, stages)
+
+
+# pula procesow jednego wizytora, tworzona przy pierwszym parallelWhere/parallelForeach i uzywana przez kolejne
+# procesy znaja tylko etapy z chwili utworzenia puli, dla nowego etapu pula jest tworzona od nowa
+# (z wszystkimi dotychczasowymi etapami); elementy listy sa przesylane do procesow
+class WorkerPool:
+    def __init__(self, visitor, stages):
+        self.stages = stages
+        # etap (rodzaj, zmienna, cialo lambdy) jako klucz: wezly drzewa porownywane sa po tozsamosci, a pula
+        # trzyma je do zamkniecia, wiec klucz nie moze trafic na inne cialo
+        self.indexes = {stage: index for index, stage in enumerate(stages)}
+        # procesy potomne oprozniaja bufory odziedziczone po tym procesie, bez tego wypisany tekst bylby powtorzony
+        sys.stdout.flush()
+        sys.stderr.flush()
+        self.executor = ProcessPoolExecutor(visitor.workers, mp_context=multiprocessing.get_context('fork'),
+                                            initializer=init_worker, initargs=(visitor, stages))
+
+    def get_index(self, stage):
+        return self.indexes.get(stage)
+
+    def map(self, index, chunks):
+        return list(self.executor.map(run_chunk, ((index, chunk) for chunk in chunks)))
+
+    def shutdown(self):
+        self.executor.shutdown()
+
+
+def get_pool(visitor, stage) -> WorkerPool:
+    pool = visitor.worker_pool
+    if pool is None or pool.get_index(stage) is None:
+        stages = (pool.stages if pool is not None else ()) + (stage,)
+        close_pool(visitor)
+        pool = visitor.worker_pool = WorkerPool(visitor, stages)
+    return pool
+
+
+def close_pool(visitor):
+    if visitor.worker_pool is not None:
+        visitor.worker_pool.shutdown()
+        visitor.worker_pool = None
+
+
+# etap dla elementow czesci listy, w kopii wizytora z osobnym kontekstem (stream)
+# None, gdy wyniku nie da sie przeslac albo lambda zglosila blad; ten zostanie zgloszony przy liczeniu
+# w procesie glownym, z typem i komunikatem jak przy zwyklym where/foreach
+def run_chunk(task):
+    visitor, stages = _worker
+    index, values = task
+    try:
+        result = list(stream(visitor, values, (stages[index],)))
+    except Exception:
+        return None
+    if not SHARED_TYPES.issuperset(map(type, result)):
+        return None
+    return result
+
+
+# etap where/foreach policzony na czesciach listy w procesach puli wizytora, wyniki w kolejnosci listy
+# None, gdy liste trzeba policzyc w tym procesie: krotka lista, jeden proces, brak fork, lambda z efektami
+# ubocznymi (wypisany tekst i zmiany obiektow zostalyby w procesach potomnych), elementy innych typow
+# niz SHARED_TYPES albo czesc, ktorej nie udalo sie policzyc
+def run_parallel(visitor, values, stage):
+    workers = visitor.workers
+    if workers <= 1 or type(values) is not list or len(values) < MIN_PARALLEL_LENGTH or not can_fork():
+        return None
+    if not is_deferrable(visitor, stage[2]):
+        return None
+    if not SHARED_TYPES.issuperset(map(type, values)):
+        return None
+    size = -(-len(values) // (workers * CHUNKS_PER_WORKER))
+    pool = get_pool(visitor, stage)
+    results = pool.map(pool.get_index(stage), (values[start:start + size] for start in range(0, len(values), size)))
+    if any(result is None for result in results):
+        return None
+    return [item for result in results for item in result]
@@ -0,0 +1,148 @@
+from collections import OrderedDict
+
+from interpreter.parser.syntax_tree import *
+from .builtins import BuiltInFunction
+from ..parser.tree_walker import TreeWalker
+
+# funkcje wbudowane bez efektow ubocznych; cialo lambdy dla where/foreach/any/... sprawdzane jest jak cialo funkcji
+PURE_BUILT_INS = ('to_bool', 'to_int', 'to_float', 'get', 'where', 'foreach', 'parallelWhere', 'parallelForeach',
+                  'take', 'first', 'any', 'all', 'count', 'aggregate', 'sum', 'min', 'max', 'average')
+
+# typy argumentow i wynikow zapamietywanych wywolan, wartosci pozostalych typow (Array, obiekty) moga sie zmieniac
+MEMO_TYPES = frozenset((int, float, str, bool, type(None)))
+
+# zapamietywanie jest wlaczane jawnie (memo_size albo BN_MEMO_SIZE)
+DEFAULT_MEMO_SIZE = 0
+
+# brak wyniku w pamieci
+MISS = object()
+
+
+# pamiec wynikow jednej czystej funkcji, usuwa najdawniej uzywany wpis po przekroczeniu size
+class MemoCache:
+    __slots__ = ('name', 'size', 'entries', 'hits', 'misses', 'evictions')
+
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # typy sa czescia klucza, bo 1, 1.0 i True sa tym samym kluczem slownika; None, gdy wywolania nie da sie zapamietac
+    # float jest w kluczu jako repr, bo 0.0 i -0.0 sa rowne, a daja rozne wyniki (jak w bytecode.constant)
+    def get_key(self, args):
+        types = tuple(map(type, args))
+        if MEMO_TYPES.issuperset(types):
+            if float in types:
+                return types, tuple(repr(arg) if type(arg) is float else arg for arg in args)
+            return types, tuple(args)
+        return None
+
+    def get(self, key):
+        result = self.entries.get(key, MISS)
+        if result is MISS:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return result
+
+    def put(self, key, result):
+        if type(result) not in MEMO_TYPES:
+            return
+        entries = self.entries
+        entries[key] = result
+        if len(entries) > self.size:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self.entries),
+            'max_size': self.size,
+        }
+
+
+# wybiera funkcje programu, ktorych wynik zalezy tylko od argumentow: bez przypisan i odczytow atrybutow,
+# wywolujace tylko funkcje z PURE_BUILT_INS i inne czyste funkcje BN (rowniez rekurencyjnie)
+# nieprzeparsowane funkcje leniwe i funkcje zastapione importem nie sa czyste
+class PurityAnalyzer(TreeWalker):
+    def __init__(self, functions):
+        super().__init__()
+        # tablica funkcji wizytora, po dodaniu funkcji programu i importow
+        self.functions = functions
+        self.pure = True
+        # funkcje BN wywolywane przez analizowana funkcje
+        self.calls = set()
+        # return albo break w analizowanym kodzie
+        self.jumps = False
+        self.pure_functions = set()
+
+    def analyze(self, program: Program) -> set:
+        self.visit_program(program)
+        return self.pure_functions
+
+    def visit_program(self, element: Program):
+        candidates = {}
+        for function in element.functions.values():
+            if isinstance(function, LazyFunctionDefinition) and not function.is_parsed():
+                continue
+            if self.functions.get(function.name) is not function:
+                continue
+            function.accept(self)
+            if self.pure:
+                candidates[function] = self.calls
+
+        changed = True
+        while changed:
+            changed = False
+            for function, calls in list(candidates.items()):
+                if not all(call in candidates for call in calls):
+                    del candidates[function]
+                    changed = True
+        self.pure_functions = set(candidates)
+
+    def visit_function_definition(self, element: FunctionDefintion):
+        self.pure = True
+        self.calls = set()
+        self.visit(element.statements)
+
+    # cialo lambdy bez efektow ubocznych, wywolan funkcji BN i return/break (sequence.is_deferrable)
+    # cialem moze byc tez samo wyrazenie ($x => x > 1), sprawdzane tak samo
+    def is_pure_lambda(self, statements) -> bool:
+        if statements is None or isinstance(statements, Statements) and not statements.statements:
+            return False
+        self.pure = True
+        self.calls = set()
+        self.jumps = False
+        self.visit(statements)
+        return self.pure and not self.calls and not self.jumps
+
+    def visit_identifier(self, element: Identifier):
+        if element.parent is not None:
+            self.pure = False
+
+    def visit_return_statement(self, element: ReturnStatement):
+        self.jumps = True
+        super().visit_return_statement(element)
+
+    def visit_break_statement(self, element):
+        self.jumps = True
+
+    def visit_assignment(self, element: Assignment):
+        self.visit(element.value)
+        if element.target.parent is not None:
+            self.pure = False
+
+    def visit_function_call(self, element: FunctionCall):
+        super().visit_function_call(element)
+        function = self.functions.get(element.function_name)
+        if isinstance(function, FunctionDefintion):
+            self.calls.add(function)
+        elif not (isinstance(function, BuiltInFunction) and element.function_name in PURE_BUILT_INS):
+            self.pure = False
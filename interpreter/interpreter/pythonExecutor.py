@@ -0,0 +1,141 @@
+from interpreter.parser.syntax_tree import *
+from .closureExecutor import ClosureExecutor, TailCall, _KEEP
+from .interpreter_error import *
+from .linker import DEFINED
+from .purity import DEFAULT_MEMO_SIZE, MISS
+from .transpiler import GENERATED_FILENAME, RUNTIME, PythonTranspiler
+from ..parser.ast_cache import get_code_cache_key, read_code_cache, write_code_cache
+
+
+# silnik wykonujacy program przetlumaczony przez PythonTranspiler na modul pythonowy
+# funkcje, ktorych nie da sie przetlumaczyc (np. nieprzeparsowane funkcje leniwe albo zbyt gleboko
+# zagniezdzone), oraz funkcje wbudowane wykonuje ClosureExecutor
+class PythonExecutor(ClosureExecutor):
+    def __init__(self, recursion_limit=100, cache_path=None, memo_size=DEFAULT_MEMO_SIZE, workers=None):
+        super().__init__(recursion_limit, memo_size, workers)
+        # plik z kodem bajtowym modulu (ast_cache.get_cache_path(..., CODE_CACHE_SUFFIX)), None wylacza zapis
+        self.cache_path = cache_path
+        self.generated = {}
+        self.line_positions = []
+        self.loaded_from_cache = False
+
+    def visit_program(self, element: Program):
+        super().visit_program(element)
+        self.load_module(element)
+
+    def load_module(self, program: Program):
+        # nieprzeparsowana funkcja leniwa moze zawierac return w lambdzie, ktory ustawia return_flag
+        lazy = any(isinstance(function, LazyFunctionDefinition) and not function.is_parsed()
+                   for function in program.functions.values())
+        transpiler = PythonTranspiler(check_return_flag=lazy)
+        source = transpiler.transpile(program)
+        if transpiler.lambda_returns and not lazy:
+            transpiler = PythonTranspiler(check_return_flag=True)
+            source = transpiler.transpile(program)
+
+        if (code := self.compile_module(source)) is None:
+            return
+        namespace = dict(RUNTIME)
+        namespace.update(transpiler.constants)
+        exec(code, namespace)
+        self.generated = {element: namespace[name] for element, name in transpiler.functions}
+        self.line_positions = transpiler.get_line_positions()
+
+    def compile_module(self, source):
+        key = get_code_cache_key(source)
+        if self.cache_path is not None and (code := read_code_cache(self.cache_path, key)) is not None:
+            self.loaded_from_cache = True
+            return code
+        try:
+            code = compile(source, GENERATED_FILENAME, 'exec')
+        except (SyntaxError, RecursionError, MemoryError):
+            # za glebokie wyrazenia dla kompilatora pythona, caly program wykonuje ClosureExecutor
+            return None
+        if self.cache_path is not None:
+            write_code_cache(self.cache_path, key, code)
+        return code
+
+    # funkcje wywolywane z kodu ClosureExecutor (main, funkcje wbudowane where/foreach)
+    def compile_function(self, element: FunctionDefintion):
+        if (function := self.generated.get(element)) is not None:
+            return lambda args: function(self, args, _KEEP)
+        return super().compile_function(element)
+
+    def compile_statements(self, element: Statements):
+        if (body := self.generated.get(element)) is not None:
+            return lambda: body(self)
+        return super().compile_statements(element)
+
+    # wywolanie z wygenerowanego kodu, licznik rekurencji obsluguje wywolujacy
+    # funkcje przetlumaczone nie korzystaja z kontekstu, wiec nie dostaja nowego
+    def call_function(self, name, element, parent_value, arguments_list):
+        args = [parent_value] + arguments_list if parent_value is not None else arguments_list
+        target = element.target
+        if target is None or target.epoch is not self.functions_epoch:
+            target = self.link_call(element)
+        if target.kind != DEFINED:
+            return self.call_native(target, args, arguments_list)
+        memo = target.memo
+        key = memo.get_key(args) if memo is not None else None
+        if key is not None and (result := memo.get(key)) is not MISS:
+            return result
+        try:
+            if (generated := self.generated.get(target.function)) is not None:
+                result = generated(self, args, arguments_list)
+                if type(result) is TailCall:
+                    result = self.run_tail_calls(result)
+            else:
+                self.add_context()
+                result = self.call_compiled(target.function, args, arguments_list)
+                self.pop_context()
+        except RecursionError:
+            # stos pythona skonczyl sie przed limitem glebokosci BN (recursion_limit)
+            raise RecursionLimitExceeded() from None
+        if key is not None:
+            memo.put(key, result)
+        return result
+
+    # "return f(...);" z wygenerowanego kodu; licznik rekurencji zwiekszyl wywolujacy, a funkcje BN
+    # wykonuje trampolina (run_tail_calls) w miejscu wywolania funkcji zawierajacej ten return
+    def tail_call(self, name, element, parent_value, arguments_list):
+        args = [parent_value] + arguments_list if parent_value is not None else arguments_list
+        target = element.target
+        if target is None or target.epoch is not self.functions_epoch:
+            target = self.link_call(element)
+        if target.kind == DEFINED:
+            if (memo := target.memo) is not None and (key := memo.get_key(args)) is not None \
+                    and (result := memo.get(key)) is not MISS:
+                self.decrement_recursion_depth()
+                return result
+            return TailCall(target.function, args, arguments_list)
+        result = self.call_native(target, args, arguments_list)
+        self.decrement_recursion_depth()
+        return result
+
+    def call_tail(self, call: TailCall):
+        if (generated := self.generated.get(call.function)) is not None:
+            return generated(self, call.args, call.arguments_list)
+        self.add_context()
+        result = self.get_compiled(call.function, self.compile_function)(call.args)
+        self.pop_context()
+        return call.arguments_list if result is _KEEP else result
+
+    def visit_function_call(self, element: FunctionCall):
+        try:
+            super().visit_function_call(element)
+        except Exception as error:
+            self.add_position_note(error)
+            raise
+
+    # blad z wygenerowanego kodu dostaje notatke z pozycja w pliku BN najglebszej ramki tego kodu
+    def add_position_note(self, error):
+        if any(note.startswith('BN position') for note in getattr(error, '__notes__', ())):
+            return
+        position = None
+        traceback = error.__traceback__
+        while traceback is not None:
+            if traceback.tb_frame.f_code.co_filename == GENERATED_FILENAME:
+                position = self.line_positions[traceback.tb_lineno - 1]
+            traceback = traceback.tb_next
+        if position is not None:
+            error.add_note(f"BN position: line {position.line}, column {position.column}")
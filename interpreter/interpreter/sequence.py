@@ -0,0 +1,211 @@
+import numpy as np
+
+from .storage import sort_values
+from .vectorize import vector_foreach, vector_where
+
+# rodzaje etapow sekwencji
+WHERE = 0
+FOREACH = 1
+TAKE = 2
+
+
+# wartosci listy: Array i Sequence przez to_list (tablica typowana zostaje w zmiennej),
+# zwykla lista i tablica NumPy (np. z importu) bez zmian
+def get_values(lst):
+    return lst if type(lst) is list or type(lst) is np.ndarray else lst.to_list()
+
+
+# elementy do jednego przejscia: sekwencja jest liczona po kolei, bez zapisywania listy,
+# a tablica typowana Array czytana bez kopiowania
+def get_items(lst):
+    if type(lst) is Sequence or type(lst) is list or type(lst) is np.ndarray:
+        return lst
+    return lst.iter_items()
+
+
+# cialo lambdy, ktore moze byc wykonane pozniej: bez efektow ubocznych, wywolan funkcji BN i return/break
+# (return w lambdzie ustawia return_flag wywolujacego, wiec musi zostac wykonany od razu)
+# blad w takiej lambdzie (np. dzielenie przez zero) jest zglaszany dopiero przy uzyciu wyniku, a gdy wynik
+# nie jest uzyty, wcale - celowa roznica wobec wykonania zachlannego, tak jak w leniwych zapytaniach LINQ
+def is_deferrable(visitor, statements) -> bool:
+    cache = visitor.deferrable_lambdas
+    if (deferrable := cache.get(statements)) is None:
+        # import tutaj, bo purity importuje builtins, a builtins ten modul
+        from .purity import PurityAnalyzer
+        deferrable = cache[statements] = PurityAnalyzer(visitor.functions).is_pure_lambda(statements)
+    return deferrable
+
+
+# leniwy wynik where/foreach/take: zrodlo i kolejne etapy, wykonywane w jednym przebiegu dopiero, gdy potrzebna
+# jest lista (get, sort, print, wynik main) albo kolejne elementy (first, any, take)
+# zachowuje sie jak Array: value daje liste, a set_value zastepuje ja przy przypisaniu listy do zmiennej
+class Sequence:
+    __slots__ = ('visitor', 'source', 'stages', 'items', 'shared')
+
+    def __init__(self, visitor, source, stages):
+        self.visitor = visitor
+        # elementy zrodla z chwili wywolania where/foreach/take: lista albo kopia Array (Array.snapshot)
+        # wspoldzielaca elementy do pierwszej zmiany, wiec przypisanie i append po wywolaniu nie zmieniaja wyniku
+        self.source = source
+        self.stages = stages
+        self.items = None
+        # items wspoldzielone ze zrodlem innej sekwencji, kopiowane przed pierwsza zmiana
+        self.shared = False
+
+    # kolejny etap sekwencji, ktora nie ma jeszcze listy, dolacza do tego samego przebiegu
+    @staticmethod
+    def extend(visitor, lst, stage):
+        if type(lst) is Sequence and lst.items is None:
+            return Sequence(visitor or lst.visitor, lst.source, lst.stages + (stage,))
+        # obiekt, ktory nie jest lista, nie ma snapshot, wiec blad jest zglaszany od razu, tak jak przy wykonaniu
+        # zachlannym
+        source = lst if type(lst) is list or type(lst) is np.ndarray else lst.snapshot()
+        return Sequence(visitor, source, (stage,))
+
+    def snapshot(self):
+        items = self.value
+        self.shared = True
+        return items
+
+    # lista do zmiany: policzona i nie wspoldzielona z inna sekwencja
+    def own_items(self):
+        items = self.value
+        if self.shared:
+            items = self.items = items[:]
+            self.shared = False
+        return items
+
+    @property
+    def value(self):
+        if self.items is None:
+            self.items = self.materialize()
+        return self.items
+
+    @value.setter
+    def value(self, value):
+        self.set_value(value)
+
+    def set_value(self, value, owned=False):
+        self.items = value
+        self.shared = False
+
+    def get_value(self):
+        return self.value
+
+    # operacje builtins na liscie, tak jak w Array
+    def to_list(self):
+        return self.value
+
+    def length(self):
+        return len(self.value)
+
+    def get(self, index):
+        return self.value[index]
+
+    def append(self, value):
+        self.own_items().append(value)
+
+    def pop(self, index):
+        return self.own_items().pop(index)
+
+    def sort(self):
+        sort_values(self.own_items())
+
+    # etapy na poczatku, ktore da sie policzyc na tablicach NumPy, sa liczone od razu na calej liscie,
+    # pozostale w jednym przebiegu przez elementy
+    def materialize(self):
+        items = get_values(self.source)
+        stages = list(self.stages)
+        while stages:
+            kind, *arguments = stages[0]
+            if kind == TAKE:
+                result = items[:arguments[0]]
+            elif kind == WHERE:
+                result = vector_where(self.visitor, items, *arguments)
+            else:
+                result = vector_foreach(self.visitor, items, *arguments)
+            if result is None:
+                break
+            items = result
+            stages.pop(0)
+        if not stages:
+            return items
+        return list(stream(self.visitor, items, stages))
+
+    def __iter__(self):
+        if self.items is not None:
+            return iter(self.items)
+        return stream(self.visitor, get_values(self.source), self.stages)
+
+    def __len__(self):
+        return len(self.value)
+
+    def __getitem__(self, index):
+        return self.value[index]
+
+    def __bool__(self):
+        return bool(self.value)
+
+    def __eq__(self, other):
+        return self.value == get_values(other) if isinstance(other, (list, Sequence)) else NotImplemented
+
+    __hash__ = None
+
+    # porownania z lista jak dla listy, ktora zwrocilby zachlanny where/foreach
+    def __lt__(self, other):
+        return self.value < get_values(other) if isinstance(other, (list, Sequence)) else NotImplemented
+
+    def __le__(self, other):
+        return self.value <= get_values(other) if isinstance(other, (list, Sequence)) else NotImplemented
+
+    def __gt__(self, other):
+        return self.value > get_values(other) if isinstance(other, (list, Sequence)) else NotImplemented
+
+    def __ge__(self, other):
+        return self.value >= get_values(other) if isinstance(other, (list, Sequence)) else NotImplemented
+
+    def __add__(self, other):
+        return self.value + get_values(other)
+
+    def __repr__(self):
+        return repr(self.value)
+
+
+# elementy przechodza przez wszystkie etapy po kolei; kazdy etap ma wlasny kontekst, tak jak osobne wywolania
+# where/foreach, a last_result wywolujacego zostaje bez zmian; take konczy przebieg po ostatnim elemencie
+def stream(visitor, items, stages):
+    contexts = [visitor.context.new_context() if kind != TAKE else None for kind, *_ in stages]
+    taken = [0] * len(stages)
+    if any(kind == TAKE and not arguments[0] for kind, *arguments in stages):
+        return
+    for item in items:
+        finished = False
+        for index, (kind, *arguments) in enumerate(stages):
+            if kind == TAKE:
+                taken[index] += 1
+                finished = finished or taken[index] == arguments[0]
+                continue
+            result = run_lambda(visitor, contexts[index], arguments[0], arguments[1], item, kind == FOREACH)
+            if kind == FOREACH:
+                item = result
+            elif not result:
+                break
+        else:
+            yield item
+        if finished:
+            return
+
+
+# jeden obrot petli where (wynik ciala) albo foreach (wartosc zmiennej lambdy) w podanym kontekscie
+# kontekst trafia na stos wizytora jak przy add_context, zeby wywolania where/foreach w ciele lambdy wracaly do niego
+def run_lambda(visitor, context, name, statements, item, read_variable):
+    saved_result = visitor.last_result
+    visitor.context_stack.append(context)
+    visitor.context = context
+    try:
+        context.add_variable(name, item)
+        statements.accept(visitor)
+        return context.variables.get(name) if read_variable else visitor.last_result
+    finally:
+        visitor.pop_context()
+        visitor.last_result = saved_result
@@ -0,0 +1,50 @@
+from array import array
+
+import numpy as np
+
+# listy BN same int, same float albo same bool trzymane sa w array.array (8 bajtow na int i float, 1 na bool)
+# zamiast w liscie wskaznikow na obiekty pythona; inny element zamienia tablice z powrotem na liste
+TYPECODES = {int: 'q', float: 'd', bool: 'b'}
+ITEM_TYPES = {typecode: item_type for item_type, typecode in TYPECODES.items()}
+DTYPES = {'q': np.int64, 'd': np.float64, 'b': np.int8}
+
+# krotsze listy zostaja listami, sprawdzenie typow elementow kosztuje wiecej niz oszczednosc pamieci
+# (pusta lista dostaje tablice przy pierwszym append)
+MIN_TYPED_LENGTH = 32
+
+
+# tablica dla listy elementow jednego typu z TYPECODES, None dla pozostalych
+# int spoza int64 zostaje w liscie, tak jak liczba calkowita pythona
+def to_typed(values):
+    types = set(map(type, values))
+    if len(types) != 1 or (typecode := TYPECODES.get(types.pop())) is None:
+        return None
+    try:
+        return array(typecode, values)
+    except OverflowError:
+        return None
+
+
+def to_list(storage):
+    if storage.typecode == 'b':
+        return list(map(bool, storage))
+    return storage.tolist()
+
+
+# sortowanie listy z builtins.sort, rowniez dla sekwencji
+def sort_values(values):
+    if all(isinstance(i, (int, float)) for i in values):
+        values.sort()
+    else:
+        raise ValueError("List contains non-numeric elements")
+
+
+# sortowanie tablicy typowanej w NumPy na miejscu, z ta sama kolejnoscia co list.sort; float z NaN przez sorted,
+# bo NumPy przenosi NaN na koniec; wynik to posortowana tablica
+def sort_typed(storage):
+    view = np.frombuffer(storage, dtype=DTYPES[storage.typecode])
+    if storage.typecode == 'd' and np.isnan(view).any():
+        return array('d', sorted(storage))
+    # sortowanie stabilne, bo 0.0 i -0.0 sa rowne, ale wypisywane inaczej
+    view.sort(kind='stable')
+    return storage
@@ -0,0 +1,485 @@
+import keyword
+import math
+import re
+
+from interpreter.parser.syntax_tree import *
+from .interpreter import UNDEFINED
+from .interpreter import Array as ArrayValue
+from .closureExecutor import _KEEP
+from . import operations
+from ..parser.resolver import SlotResolver
+
+# nazwa "pliku" wygenerowanego modulu, po niej ramki z kodu BN sa rozpoznawane w tracebacku
+GENERATED_FILENAME = '<bn>'
+
+# CPython pozwala na 20 zagniezdzonych petli i blokow try oraz na 100 poziomow wciec,
+# glebiej zagniezdzone funkcje zostaja przy ClosureExecutor
+MAX_BLOCKS = 18
+MAX_INDENT = 90
+
+# zmienne tymczasowe i stale nie zmieniaja sie miedzy policzeniem a uzyciem
+_STABLE = re.compile(r'_t\d+|K\d+')
+
+
+def undefined(name):
+    raise KeyError(f"Variable '{name}' is not defined.")
+
+
+def divide(left_value, right_value, position):
+    if right_value == 0:
+        raise ZeroDivisionError("Division by zero is not allowed")
+    return operations.divide_values(left_value, right_value, position)
+
+
+# nazwy dostepne w wygenerowanym module
+RUNTIME = {
+    'Array': ArrayValue,
+    'UNDEFINED': UNDEFINED,
+    '_KEEP': _KEEP,
+    'undefined': undefined,
+    'divide': divide,
+    'sum_values': operations.sum_values,
+    'sub_values': operations.sub_values,
+    'multiply_values': operations.multiply_values,
+    'or_is_decided': operations.or_is_decided,
+    'or_values': operations.or_values,
+    'and_is_decided': operations.and_is_decided,
+    'and_values': operations.and_values,
+}
+
+_ARTH_FUNCTIONS = {
+    SumExpression: 'sum_values',
+    SubExpression: 'sub_values',
+    MulExpression: 'multiply_values',
+    DivExpression: 'divide',
+}
+
+_COMPARISONS = {
+    EqualOperation: '==',
+    NotEqualOperation: '!=',
+    GreaterOperation: '>',
+    GreaterEqualOperation: '>=',
+    LessOperation: '<',
+    LessEqualOperation: '<=',
+}
+
+_LITERALS = (LiteralBool, LiteralInt, LiteralFloat, LiteralString)
+
+# wyrazenia, ktore na pewno nie zwracaja listy, przypisanie ich wyniku nie sprawdza opakowania w Array
+_NOT_LISTS = _LITERALS + (SubExpression, MulExpression, DivExpression)
+
+
+class UnsupportedConstruct(Exception):
+    pass
+
+
+# zamienia funkcje programu i ciala lambd na zrodlo modulu pythonowego
+# zmienne funkcji sa zmiennymi lokalnymi pythona (v_nazwa), zmienne lambd zostaja w slowniku kontekstu funkcji
+# wbudowanej; _r pelni role last_result, a wyniki wywolan i wyrazen logicznych trafiaja do zmiennych _t
+class PythonTranspiler:
+    def __init__(self, check_return_flag=False):
+        # return w ciele lambdy ustawia return_flag, ktory przerywa funkcje po najblizszej instrukcji
+        self.check_return_flag = check_return_flag
+        self.lines = []
+        self.literals = set()
+        self.constants = {}
+        self.constant_names = {}
+        self.functions = []
+        self.lambda_returns = False
+        self.pending_lambdas = []
+        self.position = None
+        self.indent = 0
+
+    def transpile(self, program: Program) -> str:
+        for function in program.functions.values():
+            if isinstance(function, LazyFunctionDefinition) and not function.is_parsed():
+                continue
+            self.try_transpile(self.emit_function, function)
+        while self.pending_lambdas:
+            self.try_transpile(self.emit_lambda_body, self.pending_lambdas.pop(0))
+        return self.get_source()
+
+    def get_source(self) -> str:
+        return ''.join('    ' * indent + text + '\n' for indent, text, position in self.lines)
+
+    # pozycja w pliku BN dla kazdej linii wygenerowanego zrodla (indeks = numer linii - 1)
+    def get_line_positions(self) -> list:
+        return [position for indent, text, position in self.lines]
+
+    def try_transpile(self, emit, element):
+        lines, functions, lambdas = len(self.lines), len(self.functions), len(self.pending_lambdas)
+        try:
+            emit(element)
+        except UnsupportedConstruct:
+            del self.lines[lines:]
+            del self.functions[functions:]
+            del self.pending_lambdas[lambdas:]
+            self.indent = 0
+
+    def emit(self, text):
+        if self.indent > MAX_INDENT:
+            raise UnsupportedConstruct()
+        self.lines.append((self.indent, text, self.position))
+
+    def constant(self, value) -> str:
+        if (name := self.constant_names.get(id(value))) is None:
+            name = self.constant_names[id(value)] = f'K{len(self.constants)}'
+            self.constants[name] = value
+        return name
+
+    def temporary(self) -> str:
+        self.temporaries += 1
+        return f'_t{self.temporaries}'
+
+    def start_function(self, element, name):
+        self.functions.append((element, name))
+        self.position = element.position
+        self.temporaries = 0
+        self.blocks = 0
+        self.loops = 0
+        self.defined = set()
+
+    def emit_function(self, element: FunctionDefintion):
+        self.start_function(element, f'f{len(self.functions)}')
+        self.in_lambda = False
+        parameters = element.parameters
+        resolver = SlotResolver()
+        resolver.resolve(element)
+        variables = [name for name in resolver.slots if name not in parameters]
+
+        self.emit(f'def {self.functions[-1][1]}(vm, args, arguments_list):')
+        self.indent += 1
+        self.emit(f'if len(args) != {len(parameters)}:')
+        self.emit(f'    raise ValueError(f"Expected {len(parameters)} arguments, got {{len(args)}} at postion: {{{self.constant(element.position)}}}")')
+        if parameters:
+            self.emit(f'{", ".join(self.local(name) for name in parameters)}, = args')
+        for name in parameters:
+            self.emit(f'if isinstance({self.local(name)}, list):')
+            self.emit(f'    {self.local(name)} = Array({self.local(name)})')
+            self.defined.add(name)
+        if variables:
+            self.emit(f'{" = ".join(self.local(name) for name in variables)} = UNDEFINED')
+        self.emit('_r = arguments_list')
+        self.emit_statements(element.statements)
+        self.emit('return _r')
+        self.indent -= 1
+
+    # cialo lambdy wywolywane przez where/foreach w kontekscie funkcji wbudowanej, _KEEP zostawia last_result bez zmian
+    # cialo bez nawiasow ($x => x > 1) jest jednym wyrazeniem, ktorego wartosc staje sie last_result
+    def emit_lambda_body(self, element):
+        self.start_function(element, f'l{len(self.functions)}')
+        self.in_lambda = True
+        self.emit(f'def {self.functions[-1][1]}(vm):')
+        self.indent += 1
+        self.emit('context = vm.context')
+        self.emit('_r = _KEEP')
+        self.emit_statement(element)
+        self.emit('return _r')
+        self.indent -= 1
+
+    def local(self, name) -> str:
+        return f'v_{name}'
+
+    def open_block(self):
+        self.blocks += 1
+        if self.blocks > MAX_BLOCKS:
+            raise UnsupportedConstruct()
+
+    # instrukcje
+
+    def emit_statements(self, element: Statements):
+        defined = set(self.defined)
+        start = len(self.lines)
+        for statement in element.statements if element is not None else []:
+            self.emit_statement(statement)
+            if isinstance(statement, (ReturnStatement, BreakStatement)):
+                continue
+            if self.in_lambda:
+                self.emit('if vm.return_flag:')
+                self.emit('    return _r')
+            elif self.check_return_flag:
+                self.emit('if vm.return_flag:')
+                self.emit('    vm.return_flag = False')
+                self.emit('    return _r')
+        if len(self.lines) == start:
+            self.emit('pass')
+        self.defined = defined
+
+    def emit_statement(self, element):
+        self.position = element.position
+        if isinstance(element, Statements):
+            self.emit_statements(element)
+        elif isinstance(element, ReturnStatement):
+            self.emit_return(element)
+        elif isinstance(element, IfStatement):
+            self.emit_if(element)
+        elif isinstance(element, WhileStatement):
+            self.emit_while(element)
+        elif isinstance(element, BreakStatement):
+            self.emit_break(element)
+        elif isinstance(element, Assignment):
+            self.emit_assignment(element)
+        else:
+            self.emit(f'_r = {self.expression(element)}')
+
+    def emit_return(self, element: ReturnStatement):
+        if isinstance(element.statement, FunctionCall) and not self.in_lambda:
+            self.emit(f'_r = {self.tail_call(element.statement)}')
+        elif element.statement is not None:
+            self.emit(f'_r = {self.expression(element.statement)}')
+        if self.in_lambda:
+            self.lambda_returns = True
+            self.emit('vm.return_flag = True')
+        elif self.check_return_flag:
+            # flaga ustawiona przez lambde w tej instrukcji nie moze wyjsc poza funkcje
+            self.emit('vm.return_flag = False')
+        self.emit('return _r')
+
+    def emit_if(self, element: IfStatement):
+        self.emit(f'_r = {self.expression(element.condition)}')
+        self.emit('if _r:')
+        self.indent += 1
+        self.emit_statements(element.statements)
+        self.indent -= 1
+        if element.else_statement:
+            self.position = element.position
+            self.emit('else:')
+            self.indent += 1
+            self.emit_statements(element.else_statement)
+            self.indent -= 1
+
+    # jak w ExecuteVisitor: warunek liczony dwa razy przed pierwszym obrotem, a petla trwa, dopoki wynik
+    # ostatniej instrukcji ciala jest prawdziwy
+    def emit_while(self, element: WhileStatement):
+        self.emit(f'_r = {self.expression(element.condition)}')
+        self.emit('while _r:')
+        self.open_block()
+        self.loops += 1
+        self.indent += 1
+        self.emit(f'_r = {self.expression(element.condition)}')
+        self.emit('if not _r:')
+        self.emit('    break')
+        self.emit_statements(element.statements)
+        self.indent -= 1
+        self.loops -= 1
+        self.blocks -= 1
+
+    def emit_break(self, element: BreakStatement):
+        if self.loops:
+            self.emit('break')
+        else:
+            self.emit(f'raise RuntimeError(f"Break statement used outside of while loop at position: {{{self.constant(element.position)}}}")')
+
+    def emit_assignment(self, element: Assignment):
+        target = element.target
+        position = self.constant(element.position)
+        # przypisania, ktore moga rzucic wyjatek, dostaja te same komunikaty bledow co w ExecuteVisitor
+        protected = target.parent is not None or not self.is_safe(element.value)
+        if protected:
+            self.emit('try:')
+            self.open_block()
+            self.indent += 1
+        self.emit(f'_r = {self.expression(element.value)}')
+        if target.parent is not None:
+            object = self.temporary()
+            self.emit(f'{object} = {self.expression(target.parent)}')
+            self.emit(f'{self.attribute(object, target.name)} = _r')
+            self.emit(f'_r = {object}')
+        elif self.in_lambda:
+            self.emit(f'context.add_variable({target.name!r}, _r, {isinstance(element.value, Array)})')
+        else:
+            self.emit_store(target.name, isinstance(element.value, _NOT_LISTS), isinstance(element.value, Array))
+        if protected:
+            self.indent -= 1
+            self.blocks -= 1
+            self.position = element.position
+            self.emit('except AttributeError as e:')
+            self.emit(f'    raise AttributeError(f"Attribute error: {{str(e)}} at position: {{{position}}}")')
+            self.emit('except Exception as e:')
+            self.emit(f'    raise RuntimeError(f"Error during assignment: {{str(e)}} at position: {{{position}}}")')
+        if target.parent is None:
+            self.defined.add(target.name)
+
+    # te same reguly co Context.set_slot: lista trafia do Array, a przypisana zmienna dostaje ja przez set_value
+    def emit_store(self, name, not_list, owned=False):
+        variable = self.local(name)
+        if not_list:
+            self.emit(f'{variable} = _r')
+            return
+        self.emit('if isinstance(_r, list):')
+        if name in self.defined:
+            self.emit(f'    {variable}.set_value(_r, {owned})')
+        else:
+            self.emit(f'    if {variable} is not UNDEFINED:')
+            self.emit(f'        {variable}.set_value(_r, {owned})')
+            self.emit('    else:')
+            self.emit(f'        {variable} = Array(_r, {owned})')
+        self.emit('else:')
+        self.emit(f'    {variable} = _r')
+
+    # wartosc, ktorej policzenie i zapis nie rzucaja wyjatku (zmienne nigdy nie trzymaja golej listy)
+    def is_safe(self, element) -> bool:
+        if isinstance(element, _LITERALS):
+            return True
+        return isinstance(element, Identifier) and element.parent is None and not self.in_lambda \
+            and element.name in self.defined
+
+    # wyrazenia zwracaja kod, ktory mozna wstawic w wyrazenie pythonowe, wywolania i wyrazenia logiczne
+    # dopisuja wczesniej instrukcje liczace wynik do zmiennej tymczasowej
+
+    def expression(self, element) -> str:
+        if element is None:
+            # brakujacy wezel (np. "f(1, )"), blad zglosi ClosureExecutor przy wykonaniu
+            raise UnsupportedConstruct()
+        position = self.position
+        self.position = element.position
+        try:
+            return self.node_expression(element)
+        finally:
+            self.position = position
+
+    def node_expression(self, element) -> str:
+        if isinstance(element, _LITERALS):
+            return self.literal(element.value)
+        if isinstance(element, Identifier):
+            return self.identifier(element)
+        if isinstance(element, ArthExpression):
+            left, right = self.expressions([element.left, element.right])
+            return f'{_ARTH_FUNCTIONS[type(element)]}({left}, {right}, {self.constant(element.position)})'
+        if isinstance(element, BinaryOperation):
+            left, right = self.expressions([element.left, element.right])
+            return f'({left} {_COMPARISONS[type(element)]} {right})'
+        if isinstance(element, FunctionCall):
+            return self.function_call(element)
+        if isinstance(element, OrExpression):
+            return self.logic_expression(element, 'or')
+        if isinstance(element, AndExpression):
+            return self.logic_expression(element, 'and')
+        if isinstance(element, Negation):
+            return self.negation(element)
+        if isinstance(element, Array):
+            return f'[{", ".join(self.expressions(element.items))}]'
+        if isinstance(element, FunctionArguments):
+            return f'[{", ".join(self.expressions(element.arguments))}]'
+        if isinstance(element, LambdaExpression):
+            return self.lambda_expression(element)
+        raise UnsupportedConstruct()
+
+    # operandy liczone po kolei: gdy pozniejszy operand dopisze instrukcje, wczesniejsze zostaja
+    # policzone przed nimi, zeby kolejnosc efektow i bledow byla taka jak w ExecuteVisitor
+    def expressions(self, elements) -> list:
+        codes = []
+        for element in elements:
+            start = len(self.lines)
+            code = self.expression(element)
+            if len(self.lines) > start:
+                pinned = []
+                for index, earlier in enumerate(codes):
+                    if not self.is_stable(earlier):
+                        codes[index] = self.temporary()
+                        pinned.append((self.indent, f'{codes[index]} = {earlier}', self.lines[start][2]))
+                self.lines[start:start] = pinned
+            codes.append(code)
+        return codes
+
+    def is_stable(self, code) -> bool:
+        return code in self.literals or _STABLE.fullmatch(code) is not None
+
+    def literal(self, value) -> str:
+        if isinstance(value, float) and not math.isfinite(value):
+            return self.constant(value)
+        code = repr(value)
+        code = f'({code})' if code.startswith('-') else code
+        self.literals.add(code)
+        return code
+
+    def identifier(self, element: Identifier) -> str:
+        if element.parent is not None:
+            return self.attribute(self.expression(element.parent), element.name)
+        if self.in_lambda:
+            return f'context.get_variable({element.name!r})'
+        variable = self.local(element.name)
+        if element.name in self.defined:
+            return variable
+        return f'({variable} if {variable} is not UNDEFINED else undefined({element.name!r}))'
+
+    def attribute(self, object, name) -> str:
+        if name.isidentifier() and not keyword.iskeyword(name):
+            return f'{object}.{name}'
+        return f'getattr({object}, {name!r})'
+
+    def function_call(self, element: FunctionCall) -> str:
+        result = self.temporary()
+        self.emit('try:')
+        self.open_block()
+        self.indent += 1
+        self.emit('vm.increment_recursion_depth()')
+        parent, arguments = self.expressions([element.parent, element.arguments]) if element.parent is not None \
+            else ('None', self.expression(element.arguments))
+        self.emit(f'{result} = vm.call_function({element.function_name!r}, {self.constant(element)}, {parent}, {arguments})')
+        self.indent -= 1
+        self.blocks -= 1
+        self.emit('finally:')
+        self.emit('    vm.decrement_recursion_depth()')
+        return result
+
+    # wynikiem jest wynik funkcji natywnej albo TailCall dla funkcji BN, ktory trafia do wywolujacego przez return
+    def tail_call(self, element: FunctionCall) -> str:
+        result = self.temporary()
+        self.emit('try:')
+        self.open_block()
+        self.indent += 1
+        self.emit('vm.increment_recursion_depth()')
+        parent, arguments = self.expressions([element.parent, element.arguments]) if element.parent is not None \
+            else ('None', self.expression(element.arguments))
+        self.emit(f'{result} = vm.tail_call({element.function_name!r}, {self.constant(element)}, {parent}, {arguments})')
+        self.indent -= 1
+        self.blocks -= 1
+        self.emit('except BaseException:')
+        self.emit('    vm.decrement_recursion_depth()')
+        self.emit('    raise')
+        return result
+
+    # to samo co ExecuteVisitor.visit_or_expression / visit_and_expression, kolejne wyrazy w zagniezdzonych if
+    def logic_expression(self, element, operator) -> str:
+        result = self.temporary()
+        first = self.expression(element.nodes[0])
+        self.emit(f'{result} = {first}')
+        self.emit(f'if not {result}:' if operator == 'or' else f'if {result}:')
+        indent = self.indent
+        self.indent += 1
+        for node in element.nodes[1:]:
+            self.emit(f'if {operator}_is_decided({result}):')
+            self.emit(f'    {result} = {operator == "or"}')
+            self.emit('else:')
+            self.indent += 1
+            code = self.expression(node)
+            self.emit(f'{result} = {operator}_values({result}, {code})')
+        if len(element.nodes) == 1:
+            self.emit('pass')
+        self.indent = indent
+        return result
+
+    # jak w ExecuteVisitor blad typu przy liczeniu operandu tez zamieniany jest na "Invalid negation"
+    def negation(self, element: Negation) -> str:
+        result = self.temporary()
+        self.emit('try:')
+        self.open_block()
+        self.indent += 1
+        code = self.expression(element.node)
+        self.emit(f'{result} = (not {code})' if element.negation_type == 'Logic' else f'{result} = (-{code})')
+        self.indent -= 1
+        self.blocks -= 1
+        self.emit('except TypeError:')
+        self.emit(f'    raise TypeError(f"Invalid negation at position: {{{self.constant(element.position)}}}")')
+        return result
+
+    def lambda_expression(self, element: LambdaExpression) -> str:
+        if self.in_lambda:
+            self.emit(f'context.add_variable({element.variable_name!r}, None)')
+        else:
+            self.emit(f'{self.local(element.variable_name)} = None')
+            self.defined.add(element.variable_name)
+        if element.statements is not None:
+            self.pending_lambdas.append(element.statements)
+        return f'[{element.variable_name!r}, {self.constant(element.statements)}]'
@@ -0,0 +1,229 @@
+import operator
+
+import numpy as np
+
+from interpreter.parser.syntax_tree import *
+
+# krotsze listy where/foreach przechodza przez interpreter, zamiana na tablice NumPy sie nie oplaca
+MIN_VECTOR_LENGTH = 32
+
+# granice modulu wartosci calkowitych: int64 bez przepelnienia i liczby dokladnie zamieniane na float64
+INT64_BOUND = 2 ** 63
+FLOAT_EXACT_BOUND = 2 ** 53
+
+_ARTH_OPERATIONS = {
+    SumExpression: (operator.add, lambda left, right: left + right),
+    SubExpression: (operator.sub, lambda left, right: left + right),
+    MulExpression: (operator.mul, lambda left, right: left * right),
+}
+
+_COMPARISONS = {
+    EqualOperation: operator.eq,
+    NotEqualOperation: operator.ne,
+    GreaterOperation: operator.gt,
+    GreaterEqualOperation: operator.ge,
+    LessOperation: operator.lt,
+    LessEqualOperation: operator.le,
+}
+
+
+# lambda lub dane, dla ktorych wynik NumPy moglby sie roznic od interpretera; where/foreach wykonuja wtedy cialo lambdy
+class NotVectorizable(Exception):
+    pass
+
+
+def is_bool(value) -> bool:
+    return isinstance(value, (bool, np.bool_)) or isinstance(value, np.ndarray) and value.dtype.kind == 'b'
+
+
+def is_int(value) -> bool:
+    return type(value) is int or isinstance(value, np.ndarray) and value.dtype.kind == 'i'
+
+
+# jednoelementowe cialo lambdy zamienione na funkcje kernel(x, limit) -> (wartosc, ograniczenie modulu)
+# x to tablica elementow listy, limit to ograniczenie modulu elementow; ograniczenie wyniku ma znaczenie tylko
+# dla wartosci calkowitych, ktore w pythonie sa dokladne, a w NumPy maja 64 bity
+class KernelCompiler:
+    def __init__(self, variable_name):
+        self.variable_name = variable_name
+
+    # wyrazenie i informacja, czy cialo przypisuje wynik do zmiennej lambdy (foreach zwraca wtedy ten wynik)
+    # cialo bez nawiasow ($x => x > 1) jest jednym wyrazeniem
+    def compile_body(self, statements):
+        if statements is not None and not isinstance(statements, Statements):
+            return self.compile(statements), False
+        if statements is None or len(statements.statements) != 1:
+            raise NotVectorizable()
+        statement = statements.statements[0]
+        if isinstance(statement, Assignment):
+            target = statement.target
+            if target.parent is not None or target.name != self.variable_name:
+                raise NotVectorizable()
+            return self.compile(statement.value), True
+        return self.compile(statement), False
+
+    def compile(self, element):
+        if type(element) in _ARTH_OPERATIONS:
+            return self.compile_arth(element, *_ARTH_OPERATIONS[type(element)])
+        if type(element) in _COMPARISONS:
+            return self.compile_comparison(element, _COMPARISONS[type(element)])
+        if isinstance(element, DivExpression):
+            return self.compile_division(element)
+        if isinstance(element, Identifier) and element.parent is None and element.name == self.variable_name:
+            return lambda x, limit: (x, limit)
+        if isinstance(element, (LiteralInt, LiteralFloat, LiteralBool)):
+            value = element.value
+            if type(value) is int and abs(value) >= INT64_BOUND:
+                raise NotVectorizable()
+            bound = abs(value) if type(value) is int else 0
+            return lambda x, limit: (value, bound)
+        if isinstance(element, Negation):
+            return self.compile_negation(element)
+        if isinstance(element, (AndExpression, OrExpression)):
+            return self.compile_logic(element, np.logical_and if isinstance(element, AndExpression) else np.logical_or)
+        raise NotVectorizable()
+
+    # dodawanie bool w NumPy jest alternatywa, a w pythonie dodawaniem liczb, wiec bool nie jest argumentem
+    def compile_arth(self, element, operation, combine_bounds):
+        left, right = self.compile(element.left), self.compile(element.right)
+
+        def arth(x, limit):
+            left_value, left_bound = left(x, limit)
+            right_value, right_bound = right(x, limit)
+            if is_bool(left_value) or is_bool(right_value):
+                raise NotVectorizable()
+            bound = combine_bounds(left_bound, right_bound)
+            if is_int(left_value) and is_int(right_value) and bound >= INT64_BOUND:
+                raise NotVectorizable()
+            return operation(left_value, right_value), bound
+        return arth
+
+    # liczba calkowita porownywana z float i dzielona jest w NumPy zamieniana na float64
+    def compile_comparison(self, element, comparison):
+        left, right = self.compile(element.left), self.compile(element.right)
+
+        def compare(x, limit):
+            left_value, left_bound = left(x, limit)
+            right_value, right_bound = right(x, limit)
+            if is_int(left_value) != is_int(right_value) and max(left_bound, right_bound) >= FLOAT_EXACT_BOUND:
+                raise NotVectorizable()
+            return comparison(left_value, right_value), 0
+        return compare
+
+    def compile_division(self, element: DivExpression):
+        left, right = self.compile(element.left), self.compile(element.right)
+
+        def divide(x, limit):
+            left_value, left_bound = left(x, limit)
+            right_value, right_bound = right(x, limit)
+            if is_bool(left_value) or is_bool(right_value) or max(left_bound, right_bound) >= FLOAT_EXACT_BOUND:
+                raise NotVectorizable()
+            # blad dzielenia przez zero zglasza interpreter
+            if np.any(np.equal(right_value, 0)):
+                raise NotVectorizable()
+            return np.true_divide(left_value, right_value), 0
+        return divide
+
+    def compile_negation(self, element: Negation):
+        node = self.compile(element.node)
+        logic = element.negation_type == 'Logic'
+
+        def negation(x, limit):
+            value, bound = node(x, limit)
+            if logic:
+                return np.logical_not(value), 0
+            if is_bool(value):
+                raise NotVectorizable()
+            return np.negative(value), bound
+        return negation
+
+    # "and"/"or" na wartosciach logicznych daja ten sam wynik co operacje na tablicach bool
+    def compile_logic(self, element, combine):
+        nodes = [self.compile(node) for node in element.nodes]
+
+        def logic(x, limit):
+            result = None
+            for node in nodes:
+                value, _ = node(x, limit)
+                if not is_bool(value):
+                    raise NotVectorizable()
+                result = value if result is None else combine(result, value)
+            return result, 0
+        return logic
+
+
+# kernel dla ciala lambdy zapamietany w wizytorze, None gdy ciala nie da sie zamienic na operacje NumPy
+def get_kernel(visitor, name, statements):
+    kernels = visitor.vector_kernels
+    if statements in kernels:
+        return kernels[statements]
+    try:
+        kernel = KernelCompiler(name).compile_body(statements)
+    except NotVectorizable:
+        kernel = None
+    kernels[statements] = kernel
+    return kernel
+
+
+# elementy listy jako tablica int64, float64 albo bool i ograniczenie ich modulu
+# lista bool zostaje tablica bool, zeby foreach zwracal bool, a nie int (dzialania arytmetyczne na bool
+# wykonuje interpreter, compile_arth); int, float i bool razem nie sa zamieniane, bo wynik pythona zalezy
+# od typu kazdego elementu
+def to_array(values):
+    if len(values) < MIN_VECTOR_LENGTH:
+        return None
+    array = np.array(values)
+    if array.ndim != 1:
+        return None
+    kind = array.dtype.kind
+    if kind == 'b':
+        return array, 0
+    if kind == 'f':
+        if array.dtype != np.float64 or set(map(type, values)) != {float}:
+            return None
+        return array, 0
+    if kind != 'i' or array.dtype != np.int64 or set(map(type, values)) != {int}:
+        return None
+    return array, max(int(array.max()), -int(array.min()))
+
+
+def evaluate(visitor, values, name, statements):
+    if type(values) is not list or (kernel := get_kernel(visitor, name, statements)) is None:
+        return None
+    if (converted := to_array(values)) is None:
+        return None
+    array, limit = converted
+    expression, assigns = kernel
+    try:
+        with np.errstate(all='ignore'):
+            value, _ = expression(array, limit)
+    except NotVectorizable:
+        return None
+    if not isinstance(value, np.ndarray) or value.shape != array.shape:
+        return None
+    return value, assigns
+
+
+# prawdziwosc wyniku lambdy dla kazdego elementu (NaN jest prawdziwe tak jak w pythonie)
+def vector_mask(visitor, values, name, statements):
+    if (result := evaluate(visitor, values, name, statements)) is None:
+        return None
+    value, _ = result
+    return value if value.dtype.kind == 'b' else value != 0
+
+
+# where: elementy, dla ktorych wynik lambdy jest prawdziwy
+def vector_where(visitor, values, name, statements):
+    if (mask := vector_mask(visitor, values, name, statements)) is None:
+        return None
+    return list(map(values.__getitem__, np.flatnonzero(mask).tolist()))
+
+
+# foreach: wartosci zmiennej lambdy po przypisaniu
+def vector_foreach(visitor, values, name, statements):
+    if (result := evaluate(visitor, values, name, statements)) is None:
+        return None
+    value, assigns = result
+    if not assigns:
+        return None
+    return value.tolist()
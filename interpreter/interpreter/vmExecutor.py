@@ -0,0 +1,326 @@
+from interpreter.parser.syntax_tree import *
+from .bytecode import *
+from .executeVisitor import ExecuteVisitor
+from .interpreter import Array as ArrayValue
+from .interpreter import UNDEFINED
+from .interpreter_error import *
+from .linker import DEFINED
+from .purity import DEFAULT_MEMO_SIZE, MISS
+from . import operations
+
+# wynik ciala lambdy, ktore nie ustawilo last_result
+_KEEP = object()
+
+
+class Frame:
+    __slots__ = ('code', 'pc', 'stack', 'locals', 'result', 'tail_calls', 'memo', 'memo_key')
+
+    def __init__(self, code: CodeObject, locals, result):
+        self.code = code
+        self.pc = 0
+        self.stack = []
+        self.locals = locals
+        self.result = result
+        # wywolania zastapione przez te ramke (TAIL_CALL), kazde zwiekszylo licznik rekurencji
+        self.tail_calls = 0
+        # pamiec czystej funkcji i klucz, pod ktorym RETURN zapisuje wynik
+        self.memo = None
+        self.memo_key = None
+
+
+# maszyna stosowa wykonujaca kod z BytecodeCompiler, wywolania funkcji BN odkladaja ramki na wlasny stos
+# ramek zamiast wywolywac sie rekurencyjnie w pythonie; limit glebokosci (recursion_limit) pilnowany jest
+# tak samo jak w ExecuteVisitor, funkcje wbudowane i importowane wykonuje ExecuteVisitor
+class VMExecutor(ExecuteVisitor):
+    def __init__(self, recursion_limit=100, memo_size=DEFAULT_MEMO_SIZE, workers=None):
+        super().__init__(recursion_limit, memo_size, workers)
+        self.codes = {}
+        # bez analizy programu (visit_program) kazda instrukcja sprawdza return_flag
+        self.check_return_flag = True
+
+    def visit_program(self, element: Program):
+        super().visit_program(element)
+        # nieprzeparsowana funkcja leniwa moze zawierac return w lambdzie, ktory ustawia return_flag
+        if any(isinstance(function, LazyFunctionDefinition) and not function.is_parsed()
+               for function in element.functions.values()):
+            return
+        compiler = BytecodeCompiler(check_return_flag=False)
+        codes = self.compile_program(compiler, element)
+        if not compiler.lambda_returns:
+            self.check_return_flag = False
+            self.codes = codes
+
+    def compile_program(self, compiler, program: Program) -> dict:
+        codes = {function: compiler.compile_function(function) for function in program.functions.values()}
+        while compiler.lambdas:
+            statements = compiler.lambdas.pop()
+            codes[statements] = compiler.compile_lambda_body(statements)
+        return codes
+
+    def get_code(self, element) -> CodeObject:
+        if (code := self.codes.get(element)) is None:
+            compiler = BytecodeCompiler(self.check_return_flag)
+            if isinstance(element, FunctionDefintion):
+                code = compiler.compile_function(element)
+            else:
+                code = compiler.compile_lambda_body(element)
+            self.codes[element] = code
+        return code
+
+    # wejscia z ExecuteVisitor: wywolanie main w Interpreter.execute i ciala lambd w where/foreach
+    def call_function_definition(self, element, args):
+        self.last_result = self.run(self.create_frame(element, args, self.last_result))
+
+    def visit_statements(self, element: Statements):
+        result = self.run(Frame(self.get_code(element), None, _KEEP))
+        if result is not _KEEP:
+            self.last_result = result
+
+    def create_frame(self, element: FunctionDefintion, args, arguments_list) -> Frame:
+        code = self.get_code(element)
+        if len(args) != code.parameters:
+            raise ValueError(f"Expected {code.parameters} arguments, got {len(args)} at postion: {element.position}")
+        locals = [UNDEFINED] * code.frame_size
+        # te same reguly co Context.set_slot
+        for slot, arg in enumerate(args):
+            if isinstance(arg, list):
+                if (variable := locals[slot]) is not UNDEFINED:
+                    variable.set_value(arg)
+                else:
+                    locals[slot] = ArrayValue(arg)
+            else:
+                locals[slot] = arg
+        return Frame(code, locals, arguments_list)
+
+    def run(self, frame: Frame):
+        frames = [frame]
+        recursion_depth = self.recursion_depth
+        try:
+            return self.dispatch(frames)
+        except Exception as error:
+            # jak bloki finally w ExecuteVisitor.visit_function_call
+            self.recursion_depth = recursion_depth
+            raise self.translate_error(frames, error)
+
+    # wyjatek przechodzi przez obszary przypisan i negacji kolejnych ramek od najglebszej,
+    # tak jak przez bloki try w ExecuteVisitor
+    def translate_error(self, frames, error):
+        for frame in reversed(frames):
+            pc = frame.pc - 2
+            regions = [region for region in frame.code.regions if region[0] <= pc < region[1]]
+            for start, end, kind, position in sorted(regions, key=lambda region: region[1] - region[0]):
+                if kind == NEGATION_REGION:
+                    if isinstance(error, TypeError):
+                        error = TypeError(f"Invalid negation at position: {position}")
+                elif isinstance(error, AttributeError):
+                    error = AttributeError(f"Attribute error: {str(error)} at position: {position}")
+                else:
+                    error = RuntimeError(f"Error during assignment: {str(error)} at position: {position}")
+        return error
+
+    def dispatch(self, frames):
+        frame = frames[-1]
+        instructions = frame.code.instructions
+        constants = frame.code.constants
+        stack = frame.stack
+        push = stack.append
+        pop = stack.pop
+        locals = frame.locals
+        result = frame.result
+        pc = 0
+        try:
+            # kolejnosc warunkow odpowiada czestosci instrukcji
+            while True:
+                opcode = instructions[pc]
+                argument = instructions[pc + 1]
+                pc += 2
+                if opcode == LOAD_FAST:
+                    push(locals[argument])
+                elif opcode == BINARY_FAST_CONST:
+                    slot, operation, value, position = constants[argument]
+                    push(operation(locals[slot], value, position))
+                elif opcode == COMPARE_FAST_CONST:
+                    slot, comparison, value = constants[argument]
+                    push(comparison(locals[slot], value))
+                elif opcode == SET_RESULT_JUMP_IF_FALSE:
+                    result = pop()
+                    if not result:
+                        pc = argument
+                elif opcode == ASSIGN_LOCAL:
+                    result = pop()
+                    if isinstance(result, list):
+                        if (variable := locals[argument]) is not UNDEFINED:
+                            variable.set_value(result)
+                        else:
+                            locals[argument] = ArrayValue(result)
+                    else:
+                        locals[argument] = result
+                elif opcode == JUMP:
+                    pc = argument
+                elif opcode == BINARY:
+                    right = pop()
+                    operation, position = constants[argument]
+                    stack[-1] = operation(stack[-1], right, position)
+                elif opcode == LOAD_CONST:
+                    push(constants[argument])
+                elif opcode == BINARY_CONST:
+                    operation, value, position = constants[argument]
+                    stack[-1] = operation(stack[-1], value, position)
+                elif opcode == COMPARE_CONST:
+                    comparison, value = constants[argument]
+                    stack[-1] = comparison(stack[-1], value)
+                elif opcode == COMPARE:
+                    right = pop()
+                    stack[-1] = constants[argument][0](stack[-1], right)
+                elif opcode == JUMP_IF_RESULT_FALSE:
+                    if not result:
+                        pc = argument
+                elif opcode == SET_RESULT:
+                    result = pop()
+                elif opcode == LOAD_LOCAL:
+                    value = locals[argument]
+                    if value is UNDEFINED:
+                        raise KeyError(f"Variable '{frame.code.local_names[argument]}' is not defined.")
+                    push(value)
+                elif opcode == ENTER_CALL:
+                    self.increment_recursion_depth()
+                    if argument:
+                        push(None)
+                elif opcode == BUILD_LIST:
+                    if argument == 1:
+                        stack[-1] = [stack[-1]]
+                    elif argument:
+                        items = stack[-argument:]
+                        del stack[-argument:]
+                        push(items)
+                    else:
+                        push([])
+                elif opcode == CALL or opcode == TAIL_CALL:
+                    arguments_list = pop()
+                    parent_value = pop()
+                    element = constants[argument]
+                    args = [parent_value] + arguments_list if parent_value is not None else arguments_list
+                    target = element.target
+                    if target is None or target.epoch is not self.functions_epoch:
+                        target = self.link_call(element)
+                    memo = target.memo
+                    key = memo.get_key(args) if memo is not None else None
+                    if key is not None and (cached := memo.get(key)) is not MISS:
+                        push(cached)
+                        self.decrement_recursion_depth()
+                    elif target.kind == DEFINED:
+                        frame.pc = pc
+                        frame.result = result
+                        if opcode == TAIL_CALL:
+                            # wynik calego lancucha zapisuje pierwsze wywolanie, ktore mialo klucz
+                            replaced = frame
+                            frame = self.create_frame(target.function, args, arguments_list)
+                            frame.tail_calls = replaced.tail_calls + 1
+                            if replaced.memo_key is not None:
+                                frame.memo, frame.memo_key = replaced.memo, replaced.memo_key
+                            else:
+                                frame.memo, frame.memo_key = memo, key
+                            frames[-1] = frame
+                        else:
+                            frame = self.create_frame(target.function, args, arguments_list)
+                            frame.memo, frame.memo_key = memo, key
+                            frames.append(frame)
+                        instructions = frame.code.instructions
+                        constants = frame.code.constants
+                        stack = frame.stack
+                        push = stack.append
+                        pop = stack.pop
+                        locals = frame.locals
+                        result = frame.result
+                        pc = 0
+                    else:
+                        frame.pc = pc
+                        push(self.call_native(target, args, arguments_list))
+                        self.decrement_recursion_depth()
+                elif opcode == RETURN or opcode == CHECK_RETURN_FLAG:
+                    if opcode == CHECK_RETURN_FLAG and not self.return_flag:
+                        continue
+                    frames.pop()
+                    if argument:
+                        # cialo lambdy jest zawsze jedyna ramka swojego wywolania run
+                        if argument == 1:
+                            self.return_flag = True
+                        return result
+                    self.return_flag = False
+                    if frame.memo_key is not None:
+                        frame.memo.put(frame.memo_key, result)
+                    if frame.tail_calls:
+                        self.recursion_depth = max(self.recursion_depth - frame.tail_calls, 0)
+                    if not frames:
+                        return result
+                    self.decrement_recursion_depth()
+                    frame = frames[-1]
+                    instructions = frame.code.instructions
+                    constants = frame.code.constants
+                    stack = frame.stack
+                    push = stack.append
+                    pop = stack.pop
+                    locals = frame.locals
+                    push(result)
+                    result = frame.result
+                    pc = frame.pc
+                elif opcode == LOAD_NAME:
+                    push(self.context.get_variable(constants[argument]))
+                elif opcode == LOAD_ATTR:
+                    stack[-1] = getattr(stack[-1], constants[argument])
+                elif opcode == ASSIGN_NAME:
+                    result = pop()
+                    self.context.add_variable(constants[argument], result)
+                elif opcode == ASSIGN_LOCAL_LITERAL:
+                    result = pop()
+                    if (variable := locals[argument]) is not UNDEFINED:
+                        variable.set_value(result, True)
+                    else:
+                        locals[argument] = ArrayValue(result, True)
+                elif opcode == ASSIGN_NAME_LITERAL:
+                    result = pop()
+                    self.context.add_variable(constants[argument], result, True)
+                elif opcode == ASSIGN_ATTR:
+                    object = pop()
+                    setattr(object, constants[argument], pop())
+                    result = object
+                elif opcode == NOT:
+                    stack[-1] = not stack[-1]
+                elif opcode == NEGATIVE:
+                    stack[-1] = - stack[-1]
+                elif opcode == JUMP_IF_TRUE_OR_KEEP:
+                    if stack[-1]:
+                        pc = argument
+                elif opcode == JUMP_IF_FALSE_OR_KEEP:
+                    if not stack[-1]:
+                        pc = argument
+                elif opcode == OR_DECIDED:
+                    if operations.or_is_decided(stack[-1]):
+                        stack[-1] = True
+                        pc = argument
+                elif opcode == OR_VALUES:
+                    right = pop()
+                    stack[-1] = operations.or_values(stack[-1], right)
+                elif opcode == AND_DECIDED:
+                    if operations.and_is_decided(stack[-1]):
+                        stack[-1] = False
+                        pc = argument
+                elif opcode == AND_VALUES:
+                    right = pop()
+                    stack[-1] = operations.and_values(stack[-1], right)
+                elif opcode == CLEAR_LOCAL:
+                    locals[argument] = None
+                elif opcode == CLEAR_NAME:
+                    self.context.add_variable(constants[argument], None)
+                elif opcode == MAKE_LAMBDA:
+                    push(list(constants[argument]))
+                elif opcode == RAISE_BREAK:
+                    raise RuntimeError(f"Break statement used outside of while loop at position: {constants[argument]}")
+                elif opcode == FALLBACK:
+                    constants[argument].accept(self)
+                    push(self.last_result)
+                else:
+                    raise RuntimeError(f"Unknown opcode {opcode}")
+        except Exception:
+            frame.pc = pc
+            raise
@@ -0,0 +1,221 @@
+import re
+from typing import Optional
+
+from ..source.source import DEFAULT_BUFFER_SIZE, Source
+from ..source.source_position import OffsetPosition
+from ..tokens.token import Token, TokenType
+from ..tokens.token_buffer import TokenBuffer
+from .error import LexerError
+from .lexer import Lexer
+
+# jeden wzorzec dla najczestszych leksemow ASCII, reszta przypadkow (unicode, sekwencje ucieczki,
+# bledy) trafia do wolniejszej sciezki, ktora odtwarza zachowanie Lexera znak po znaku
+_MASTER = re.compile(r'''\s*(?:
+     (?P<identifier>[A-Za-z][A-Za-z0-9]*)
+    |(?P<number>\d+)
+    |(?P<string>"[^"\\\n]*")
+    |(?P<operator>==|!=|<=|>=|=>|[-+*/(){}\[\];,.$!=<>])
+    |(?P<comment>\#[^\n]*)
+)?''', re.VERBOSE)
+
+_DIGITS = re.compile(r'\d*')
+
+# operator dwuznakowy dostaje pozycje drugiego znaku, tak jak w Lexer.build_one_or_two_char_token
+_TWO_CHARS_OPERATORS = {
+    '==': TokenType.EQUAL_OPERATOR,
+    '!=': TokenType.NOT_EQUAL_OPERATOR,
+    '<=': TokenType.LESS_OR_EQUAL_THAN_OPERATOR,
+    '>=': TokenType.GREATER_OR_EQUAL_THAN_OPERATOR,
+    '=>': TokenType.LAMBDA_OPERATOR,
+}
+
+_ONE_CHAR_OPERATORS = {
+    '!': TokenType.NEGATION_OPERATOR,
+    '=': TokenType.ASSIGN_OPERATOR,
+    '<': TokenType.LESS_THAN_OPERATOR,
+    '>': TokenType.GREATER_THAN_OPERATOR,
+}
+
+
+# lexer skanujacy cale leksemy naraz, zwraca te same tokeny i bledy co Lexer
+# tekst czytany jest fragmentami konczacymi sie na koncu linii (Source.read_chunk), w oknie _text
+# zaczynajacym sie pod offsetem _base_offset zrodla
+class FastLexer(Lexer):
+    def __init__(self, source:Source, max_string = 1000000, max_int = pow(2,63)-1, max_float=15, max_iden = 40, skip_comments = False, window_size = DEFAULT_BUFFER_SIZE) -> None:
+        super().__init__(source, max_string, max_int, max_float, max_iden, skip_comments)
+        self._window_size = window_size
+        self._base_offset = source.get_offset()
+        self._text = source.read_chunk(window_size)
+        self._length = len(self._text)
+        self._line_index = source.line_index
+        self._pos = 0
+        self._tokens = self._scan()
+        # liczby o tylu cyfrach na pewno nie przekrocza max_int
+        self._safe_int_digits = len(str(int(max_int))) - 2 if max_int >= 1 else 0
+        self._operators = dict(self.one_line_operators)
+        self._operators.update(_ONE_CHAR_OPERATORS)
+
+    # dokleja kolejny fragment do nieprzeczytanej czesci okna, False na koncu zrodla
+    def _refill(self) -> bool:
+        chunk = self._source.read_chunk(self._window_size)
+        if not chunk:
+            return False
+        self._base_offset += self._pos
+        self._text = self._text[self._pos:] + chunk
+        self._length = len(self._text)
+        self._pos = 0
+        return True
+
+    def _position_at(self, index) -> OffsetPosition:
+        return OffsetPosition(self._base_offset + index, self._line_index)
+
+    def _char_at(self, index) -> str:
+        return self._text[index] if index < self._length else 'EOF'
+
+    def get_next_token(self) -> Token:
+        token_type, value, start = next(self._tokens)
+        return Token(token_type, value, OffsetPosition(self._base_offset + start, self._line_index))
+
+    def tokenize_all(self) -> TokenBuffer:
+        buffer = TokenBuffer(self._line_index)
+        append = buffer.append
+        EOF = TokenType.EOF
+        for token_type, value, start in self._tokens:
+            append(token_type, value, self._base_offset + start)
+            if token_type == EOF:
+                return buffer
+
+    # generator krotek (typ, wartosc, indeks poczatku w oknie), po koncu tekstu zwraca EOF w nieskonczonosc
+    # okno konczy sie na koncu linii, wiec leksem nie jest w nim uciety; kolejny fragment doczytywany jest,
+    # gdy do konca okna zostaly biale znaki
+    def _scan(self):
+        text = self._text
+        length = self._length
+        match_at = _MASTER.match
+        keywords = self.keywords
+        operators = self._operators
+        max_iden = self._max_iden
+        max_string = self._max_string
+        skip_comments = self._skip_comments
+        IDENTIFIER, NUMBER, STRING, OPERATOR = 1, 2, 3, 4
+        ID, STRING_VALUE, COMMENT = TokenType.ID, TokenType.STRING_VALUE, TokenType.COMMENT
+
+        while True:
+            match = match_at(text, self._pos)
+            kind = match.lastindex
+            if kind is None:
+                if match.end() == length and self._refill():
+                    text, length = self._text, self._length
+                    continue
+                yield self._scan_char_by_char(match.end())
+                continue
+            start, end = match.span(kind)
+
+            if kind == IDENTIFIER:
+                if end < length and text[end] >= '\x80':
+                    yield self._scan_identifier(start)
+                    continue
+                if end - start > max_iden:
+                    raise LexerError("Identifier too long", self._position_at(start + max_iden))
+                self._pos = end
+                buffer = text[start:end]
+                yield keywords.get(buffer, ID), (None if buffer in keywords else buffer), start
+            elif kind == NUMBER:
+                yield self._scan_number(start, end)
+            elif kind == STRING:
+                if end - start - 2 > max_string:
+                    raise LexerError("String too long", self._position_at(start + 1 + max_string))
+                self._pos = end
+                yield STRING_VALUE, text[start + 1:end - 1], start
+            elif kind == OPERATOR:
+                self._pos = end
+                if end - start == 2:
+                    yield _TWO_CHARS_OPERATORS[text[start:end]], None, start + 1
+                else:
+                    yield operators[text[start]], None, start
+            else:
+                self._pos = end
+                if not skip_comments:
+                    yield COMMENT, text[start + 1:end], start
+
+    def _scan_char_by_char(self, start):
+        self._pos = start
+        char = self._char_at(start)
+        if char == 'EOF':
+            return TokenType.EOF, None, start
+        if char.isdecimal():
+            return self._scan_number(start, _DIGITS.match(self._text, start).end())
+        if char == '"':
+            return self._scan_string(start)
+        if char.isalpha():
+            return self._scan_identifier(start)
+        raise LexerError("Can't match any token", self._position_at(start))
+
+    def _scan_identifier(self, start):
+        text = self._text
+        index = start
+        while index < self._length and (text[index].isalpha() or text[index].isdecimal()):
+            if index - start == self._max_iden:
+                raise LexerError("Identifier too long", self._position_at(index))
+            index += 1
+        self._pos = index
+        buffer = text[start:index]
+        if token_type := self.keywords.get(buffer):
+            return token_type, None, start
+        return TokenType.ID, buffer, start
+
+    def _scan_number(self, start, end):
+        digits = self._text[start:end]
+        if end - start <= self._safe_int_digits:
+            int_part = int(digits)
+        else:
+            int_part = self._checked_int(digits, start)
+        if self._char_at(end) != '.':
+            self._pos = end
+            return TokenType.INT_VALUE, int_part, start
+
+        fraction_start = end + 1
+        char = self._char_at(fraction_start)
+        if not char.isdecimal() and char != ';':
+            raise LexerError("Invalid character in float number, you should use digitals", self._position_at(fraction_start))
+        fraction_end = _DIGITS.match(self._text, fraction_start).end()
+        i = fraction_end - fraction_start
+        if i > self._max_float:
+            raise LexerError("Too many numbers after the decimal point", self._position_at(fraction_start + self._max_float))
+        fractional_part = int(self._text[fraction_start:fraction_end]) if i else 0
+        self._pos = fraction_end
+        total_number = float(int_part) + fractional_part * 10 ** -i
+        return TokenType.FLOAT_VALUE, total_number, start
+
+    # dokladnie ten sam test przepelnienia co Lexer.build_int_part
+    def _checked_int(self, digits, start) -> int:
+        int_part = 0
+        for i, char in enumerate(digits):
+            if int_part > (self._max_int - int(char)) / 10:
+                raise LexerError("Integer value too large", self._position_at(start + i))
+            int_part = int_part * 10 + int(char)
+        return int_part
+
+    # napisy z sekwencjami ucieczki albo niezakonczone, odtwarza Lexer._build_string
+    def _scan_string(self, start):
+        index = start + 1
+        string = []
+        while (char := self._char_at(index)) != '"':
+            if len(string) == self._max_string:
+                raise LexerError("String too long", self._position_at(index))
+            elif char == 'EOF' or char == '\n':
+                raise LexerError("Can't match any token, invalid string", self._position_at(index))
+            elif char == '\\':
+                index += 1
+                char = self._char_at(index)
+                if escape_sequence := self.escape_characters.get(char):
+                    string.append(escape_sequence)
+                    index += 1
+                else:
+                    string.append('\\')
+                    string.append(char)
+            else:
+                string.append(char)
+                index += 1
+        self._pos = index + 1
+        return TokenType.STRING_VALUE, ''.join(string), start
@@ -1,20 +1,23 @@
 from ..source.source import Source
-from ..source.source_position import SourcePosition
+from ..source.source_position import OffsetPosition
 from ..tokens.token import Token, TokenType
+from ..tokens.token_buffer import TokenBuffer
 from typing import Optional
 from .error import LexerError
 
 ## error handler dla Lexera, na niekrytyczne błędy
 class Lexer:
-    def __init__(self, source:Source, max_string = 1000000, max_int = pow(2,63)-1, max_float=15, max_iden = 40) -> None:
+    # skip_comments=True pomija komentarze bez budowania ich tekstu, domyslnie zwracane sa tokeny COMMENT
+    def __init__(self, source:Source, max_string = 1000000, max_int = pow(2,63)-1, max_float=15, max_iden = 40, skip_comments = False) -> None:
         self._source = source
-        self._position = SourcePosition(1, 1)
+        self._skip_comments = skip_comments
         self._max_string = max_string
         self._max_int = max_int
         self._max_float = max_float
         self._max_iden = max_iden
-        self._token_start = SourcePosition(1, 1)
+        self._token_start = self._source.get_position()
         self._current_char = self._source.get_char() # dodano pole przechowujace aktualny znak
+        self._slicing = source.supports_slicing
 
         self.one_line_operators = {
             "+": TokenType.ADD_OPERATOR,
@@ -65,18 +68,43 @@ class Lexer:
 
     def _next_char(self):
         self._source.next_char()
-        self._position = self._get_position()
         self._current_char = self._source.get_char()
 
-    def _get_position(self) -> SourcePosition:
+    # pozycja jest tworzona tylko na poczatku tokenu albo przy bledzie
+    @property
+    def _position(self):
         return self._source.get_position()
+
+    def _get_position(self) -> OffsetPosition:
+        return self._source.get_position()
+
+    def _get_mark(self) -> Optional[int]:
+        return self._source.get_mark() if self._slicing else None
+
+    # leksem wyciety ze zrodla albo zlozony ze zbuforowanych znakow
+    def _get_lexeme(self, start, chars) -> str:
+        if self._slicing:
+            return self._source.get_text(start, self._source.get_mark())
+        return ''.join(chars)
     
     def _skip_whitespace(self):
         while self._current_char.isspace():
             self._next_char()
 
+    # leksuje cale zrodlo do zwartego bufora tablic, bez przechowywania obiektow Token
+    def tokenize_all(self) -> TokenBuffer:
+        buffer = TokenBuffer(self._source.line_index)
+        while True:
+            token = self.get_next_token()
+            buffer.append(token.type, token.value, token.position.offset)
+            if token.type == TokenType.EOF:
+                return buffer
+
     def get_next_token(self) -> Token:
         self._skip_whitespace()
+        while self._skip_comments and self._current_char == '#':
+            self._skip_comment()
+            self._skip_whitespace()
         self._token_start = self._position
 
         token = \
@@ -98,12 +126,18 @@ class Lexer:
             return None
         comment_content = []
         self._next_char()
+        start = self._get_mark()
         while self._current_char != '\n' and self._current_char != 'EOF':
-            comment_content.append(self._current_char)
+            if not self._slicing:
+                comment_content.append(self._current_char)
             self._next_char()
-        comment = ''.join(comment_content)
+        comment = self._get_lexeme(start, comment_content)
         return Token(TokenType.COMMENT, comment, self._token_start)
 
+    def _skip_comment(self):
+        while self._current_char != '\n' and self._current_char != 'EOF':
+            self._next_char()
+
     def _build_eof(self) -> Optional[Token]:
         if self._current_char == 'EOF':
             return Token(TokenType.EOF, None, self._get_position()) # none zamiast ''
@@ -113,13 +147,17 @@ class Lexer:
         if not self._current_char.isalpha():
             return None
         buffer = []
+        length = 0
+        start = self._get_mark()
         while self._current_char is not None and self._current_char not in ['EOF'] and self._current_char.isalpha() or self._current_char.isdecimal():
-            if len(buffer) == self._max_iden:
+            if length == self._max_iden:
                 raise LexerError("Identifier too long", self._get_position())
-            buffer.append(self._current_char)
+            if not self._slicing:
+                buffer.append(self._current_char)
+            length += 1
             self._next_char()
 
-        buffer = ''.join(buffer)
+        buffer = self._get_lexeme(start, buffer)
         if buffer == '':
             return None
         elif tokenType := self.keywords.get(buffer): # zmiana na tokenType := self.keywords.get(buffer)
@@ -163,7 +201,23 @@ class Lexer:
         escape_counter = 0
         string = []
         self._next_char()
+        # dopoki nie ma sekwencji ucieczki, tekst mozna wyciac bezposrednio ze zrodla
+        slicing = self._slicing
+        start = self._get_mark()
+        length = 0
         while self._current_char != '"':
+            if slicing:
+                if self._current_char == '\\':
+                    string = list(self._source.get_text(start, self._get_mark()))
+                    slicing = False
+                elif length == self._max_string:
+                    raise LexerError("String too long", self._position)
+                elif self._current_char == 'EOF' or self._current_char == '\n':
+                    raise LexerError("Can't match any token, invalid string", self._position)
+                else:
+                    length += 1
+                    self._next_char()
+                    continue
             # wyrzucenie licznika i, sprawdzenie po ilosci elementow w tablicy
             if len(string) == self._max_string:
                 raise LexerError("String too long", self._position)
@@ -181,7 +235,7 @@ class Lexer:
             else:
                 string.append(self._current_char)
                 self._next_char()
-        string = ''.join(string)
+        string = self._source.get_text(start, self._get_mark()) if slicing else ''.join(string)
         self._next_char()
         return(Token(TokenType.STRING_VALUE, string, self._token_start))
     
@@ -0,0 +1,109 @@
+import hashlib
+import marshal
+import os
+import pickle
+import tempfile
+import types
+from importlib.util import MAGIC_NUMBER
+
+from .. import __version__
+from ..source.mapped_source import MemoryMappedSource
+from .syntax_tree import Program
+
+# katalog z zapisanymi drzewami skladniowymi, tworzony obok pliku zrodlowego (jak __pycache__)
+CACHE_DIRECTORY = '__bncache__'
+CACHE_SUFFIX = '.ast'
+# modul wygenerowany przez PythonTranspiler, skompilowany do kodu bajtowego jak pliki .pyc
+CODE_CACHE_SUFFIX = '.pyc'
+
+
+# options: konfiguracja parsera i optymalizacji, drzewo zbudowane z innymi opcjami nie jest trafieniem
+def get_cache_key(data: bytes, options: str = '') -> str:
+    digest = hashlib.sha256(__version__.encode())
+    digest.update(b'\0')
+    digest.update(options.encode())
+    digest.update(b'\0')
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def get_cache_path(path, suffix = CACHE_SUFFIX) -> str:
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, CACHE_DIRECTORY, name + suffix)
+
+
+# kod bajtowy zalezy tez od wersji pythona, stad numer MAGIC_NUMBER w kluczu
+def get_code_cache_key(source: str) -> str:
+    return get_cache_key(MAGIC_NUMBER + b'\0' + source.encode())
+
+
+# zwraca drzewo z pamieci podrecznej albo None, uszkodzony lub nieaktualny wpis traktowany jest jak brak wpisu
+def read_cache(cache_path, key):
+    try:
+        with open(cache_path, 'rb') as file:
+            cached_key, program = pickle.load(file)
+    except Exception:
+        return None
+    if cached_key != key or not isinstance(program, Program):
+        return None
+    return program
+
+
+def write_cache(cache_path, key, program) -> bool:
+    return write_atomic(cache_path, lambda file: pickle.dump((key, program), file, pickle.HIGHEST_PROTOCOL))
+
+
+def read_code_cache(cache_path, key):
+    try:
+        with open(cache_path, 'rb') as file:
+            cached_key, code = marshal.load(file)
+    except Exception:
+        return None
+    if cached_key != key or not isinstance(code, types.CodeType):
+        return None
+    return code
+
+
+def write_code_cache(cache_path, key, code) -> bool:
+    return write_atomic(cache_path, lambda file: marshal.dump((key, code), file))
+
+
+# zapis przez plik tymczasowy i os.replace, inny proces nie zobaczy niepelnego wpisu
+def write_atomic(cache_path, dump) -> bool:
+    directory = os.path.dirname(cache_path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    except OSError:
+        return False
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            dump(file)
+        os.replace(temporary_path, cache_path)
+        return True
+    except Exception:
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+        return False
+
+
+# parse_program dostaje MemoryMappedSource pliku, klucz liczony jest z bajtow zmapowanego pliku bez ich dekodowania,
+# a przy trafieniu w pamieci podrecznej lexer i parser nie sa uruchamiane
+# options opisuje, jak parse_program buduje drzewo (parser, optymalizacje); domyslnie nazwa funkcji parse_program
+def load_program(path, parse_program, use_cache = True, options = None) -> Program:
+    with MemoryMappedSource(path) as source:
+        if not use_cache:
+            return parse_program(source)
+
+        if options is None:
+            name = getattr(parse_program, '__qualname__', type(parse_program).__qualname__)
+            options = f'{parse_program.__module__}.{name}'
+        key = get_cache_key(source.get_data(), options)
+        cache_path = get_cache_path(path)
+        program = read_cache(cache_path, key)
+        if program is None:
+            program = parse_program(source)
+            write_cache(cache_path, key, program)
+    return program
@@ -0,0 +1,150 @@
+from ..interpreter import operations
+from .syntax_tree import *
+from .tree_walker import TreeWalker
+
+# dluzsze napisy nie sa zwijane, zeby drzewo nie puchlo od wynikow typu "a" * 1000000
+MAX_FOLDED_STRING = 1000
+
+LITERAL_NODES = (LiteralBool, LiteralInt, LiteralFloat, LiteralString)
+
+ARTH_OPERATIONS = {
+    SumExpression: operations.sum_values,
+    SubExpression: operations.sub_values,
+    MulExpression: operations.multiply_values,
+    DivExpression: operations.divide_values,
+}
+
+COMPARISONS = {
+    EqualOperation: lambda left, right: left == right,
+    NotEqualOperation: lambda left, right: left != right,
+    GreaterOperation: lambda left, right: left > right,
+    GreaterEqualOperation: lambda left, right: left >= right,
+    LessOperation: lambda left, right: left < right,
+    LessEqualOperation: lambda left, right: left <= right,
+}
+
+
+def make_literal(position, value):
+    if isinstance(value, bool):
+        return LiteralBool(position, value)
+    if isinstance(value, int):
+        return LiteralInt(position, value)
+    if isinstance(value, float):
+        return LiteralFloat(position, value)
+    if isinstance(value, str) and len(value) <= MAX_FOLDED_STRING:
+        return LiteralString(position, value)
+    return None
+
+
+# czy instrukcja ustawia last_result zanim cokolwiek go odczyta, "return;" i "break;" zostawiaja poprzednia wartosc
+def sets_last_result(statement) -> bool:
+    if isinstance(statement, BreakStatement):
+        return False
+    if isinstance(statement, ReturnStatement):
+        return statement.statement is not None
+    return True
+
+
+# zwijanie stalych i usuwanie martwego kodu, zwiniety wezel zastepuje odwiedzony (TreeWalker.replacement)
+# wyrazenia, ktorych obliczenie rzuca wyjatek, zostaja w drzewie, zeby blad pojawil sie dopiero przy wykonaniu
+class ConstantFolder(TreeWalker):
+    def __init__(self):
+        super().__init__()
+        self.folded_nodes = 0
+        self.removed_statements = 0
+
+    def optimize(self, element):
+        return self.visit(element)
+
+    def visit_negation(self, element: Negation):
+        super().visit_negation(element)
+        if not isinstance(element.node, LITERAL_NODES):
+            return
+        try:
+            if element.negation_type == 'Logic':
+                value = not element.node.value
+            else:
+                value = - element.node.value
+        except TypeError:
+            return
+        self.fold(element, value)
+
+    def visit_arth_expression(self, element: ArthExpression):
+        self.visit_operands(element)
+        if not isinstance(element.left, LITERAL_NODES) or not isinstance(element.right, LITERAL_NODES):
+            return
+        if isinstance(element, DivExpression) and element.right.value == 0:
+            return
+        try:
+            value = ARTH_OPERATIONS[type(element)](element.left.value, element.right.value, element.position)
+        except (TypeError, ValueError, OverflowError, MemoryError):
+            return
+        self.fold(element, value)
+
+    def visit_binary_operation(self, element: BinaryOperation):
+        self.visit_operands(element)
+        if not isinstance(element.left, LITERAL_NODES) or not isinstance(element.right, LITERAL_NODES):
+            return
+        try:
+            value = COMPARISONS[type(element)](element.left.value, element.right.value)
+        except TypeError:
+            return
+        self.fold(element, value)
+
+    def fold(self, element, value):
+        if literal := make_literal(element.position, value):
+            self.folded_nodes += 1
+            self.replacement = literal
+
+    visit_sum_expression = visit_arth_expression
+    visit_sub_expression = visit_arth_expression
+    visit_mul_expression = visit_arth_expression
+    visit_div_expression = visit_arth_expression
+
+    visit_equal_operation = visit_binary_operation
+    visit_not_equal_operation = visit_binary_operation
+    visit_greater_operation = visit_binary_operation
+    visit_greater_equal_operation = visit_binary_operation
+    visit_less_operation = visit_binary_operation
+    visit_less_equal_operation = visit_binary_operation
+
+    def visit_statements(self, element: Statements):
+        statements = []
+        for index, statement in enumerate(element.statements):
+            for statement in self.prune_if(self.visit(statement)):
+                # samotny literal, po ktorym nastepna instrukcja nadpisuje last_result, nic nie robi
+                if statements and isinstance(statements[-1], LITERAL_NODES) and sets_last_result(statement):
+                    statements.pop()
+                    self.removed_statements += 1
+                statements.append(statement)
+                if isinstance(statement, (ReturnStatement, BreakStatement)):
+                    break
+            if statements and isinstance(statements[-1], (ReturnStatement, BreakStatement)):
+                # instrukcje po return/break nigdy sie nie wykonaja
+                self.removed_statements += len(element.statements) - index - 1
+                break
+        element.statements = statements
+
+    # if ze stalym warunkiem zastepowany jest instrukcjami wybranej galezi, a bez galezi samym warunkiem,
+    # ktory zostaje wynikiem (last_result) tak jak przy wykonaniu
+    def prune_if(self, statement) -> list:
+        if not isinstance(statement, IfStatement) or not isinstance(statement.condition, LITERAL_NODES):
+            return [statement]
+        condition = statement.condition
+        if condition.value:
+            branch = statement.statements
+            if branch is None:
+                return [statement]
+        else:
+            branch = statement.else_statement
+            if branch is None:
+                self.removed_statements += 1
+                return [condition]
+        self.removed_statements += 1
+        if sets_last_result(branch.statements[0]):
+            return list(branch.statements)
+        return [condition] + branch.statements
+
+
+def optimize_program(program: Program) -> Program:
+    return ConstantFolder().optimize(program)
@@ -2,13 +2,20 @@ from typing import Optional
 from ..tokens.token import Token 
 from ..tokens.token import TokenType
 from ..lexer.lexer import Lexer
+from ..tokens.token_buffer import LexerCursor, TokenCursor
 from .syntax_error import *
 from .syntax_tree import *
 
 class Parser:
-    def  __init__(self, lexer: Lexer) -> None:
+    # lazy_functions=True zapamietuje tylko zakres tokenow ciala kazdej funkcji, cialo jest parsowane przy pierwszym wywolaniu
+    def  __init__(self, lexer: Lexer, lazy_functions = False) -> None:
+        # do dopasowania nawiasow potrzebny jest caly strumien tokenow w buforze
+        if not isinstance(lexer, TokenCursor):
+            lexer = lexer.tokenize_all().cursor() if lazy_functions else LexerCursor(lexer)
+        # wartosc i pozycje aktualnego tokenu parser czyta z kursora (get_value, get_position)
         self.lexer = lexer
-        self.current_token = None
+        self.lazy_functions = lazy_functions
+        self.token_type = None
         self.consume_token()
 
         self.ARTH_OPERATORS = {
@@ -38,15 +45,21 @@ class Parser:
     def raise_exception(self, token_type):
         raise ExpectedExpressionError(self.current_token, token_type) #currentTokenType na tekst?
 
+    # aktualny token jako obiekt Token, dla komunikatow bledow
+    @property
+    def current_token(self) -> Token:
+        return self.lexer.get_token()
+
+    # petla zamiast rekurencji, dlugie serie komentarzy nie wyczerpuja limitu rekurencji
     def consume_token(self):
-        self.current_token = self.lexer.get_next_token()
-        if self.current_token.type == TokenType.COMMENT:
-            self.consume_token()
+        self.token_type = self.lexer.advance()
+        while self.token_type == TokenType.COMMENT:
+            self.token_type = self.lexer.advance()
     
     def check_token_type(self, types) -> bool:
         if isinstance(types, TokenType):
             types = {types}
-        return self.current_token.type in types
+        return self.token_type in types
 
     def try_consume(self, types):
         if not self.check_token_type(types):
@@ -61,17 +74,32 @@ class Parser:
         token = self.current_token
         self.consume_token()
         return token
+
+    # try_consume i must_be bez obiektu Token, zwracaja typ albo wartosc zuzytego tokenu
+    def try_skip(self, types):
+        if not self.check_token_type(types):
+           return None
+        token_type = self.token_type
+        self.consume_token()
+        return token_type
+
+    def must_be_value(self, types):
+        if not self.check_token_type(types):
+           self.raise_exception(types)
+        value = self.lexer.get_value()
+        self.consume_token()
+        return value
     
     # program = { include_statement | function_definition };
     # dodanie do funcrions/includes w funkcji parsujacej te konsytrukcje 
     def parse_program(self):
         functions = {}
         includes = []
-        position = self.current_token.position
+        position = self.lexer.get_position()
 
         while self.parse_function_definition(functions) or self.parse_include_statement(includes):
             continue
-        if self.current_token.type != TokenType.EOF:
+        if self.token_type != TokenType.EOF:
             raise ParsingError(self.current_token, 'Invalid syntax, after parsing a program there is left')
         if not functions and not includes:
             raise ParsingError(self.current_token, 'Invalid syntax, there is no possibility to build program.')
@@ -80,45 +108,90 @@ class Parser:
     
     # function_definition = "def", function_name, "(", parameters , ")" , statements; 
     def parse_function_definition(self, functions) -> Optional[FunctionDefintion]:
-        if not self.try_consume(TokenType.DEF):
+        if not self.try_skip(TokenType.DEF):
             return None
-        position = self.current_token.position
-        if functions.get(name := self.must_be(TokenType.ID).value):
+        position = self.lexer.get_position()
+        if functions.get(name := self.must_be_value(TokenType.ID)):
             raise RedefintionFuntionError(self.current_token, name)
-        self.must_be(TokenType.LEFT_BRACKET)
+        self.must_be_value(TokenType.LEFT_BRACKET)
         params = self.parse_parameters()
-        self.must_be(TokenType.RIGHT_BRACKET)
+        self.must_be_value(TokenType.RIGHT_BRACKET)
+        if self.lazy_functions and (fun := self.parse_lazy_function_body(position, name, params)):
+            functions[name] = fun
+            return fun
         statements = self.parse_statements()
         if not statements:
             ExpectedBlockStatements(self.current_token, 'Expected block statements in function definition')
         functions[name] = (fun := FunctionDefintion(position, name, params, statements))
         return fun
 
+    def parse_lazy_function_body(self, position, name, params) -> Optional[LazyFunctionDefinition]:
+        if not self.check_token_type(TokenType.LEFT_CURLY_BRACKET):
+            return None
+        start = self.lexer.tell() - 1
+        if (end := self.find_closing_bracket(start)) is None:
+            # niezamkniety blok, parsowanie od razu zglosi blad w tym samym miejscu co tryb zwykly
+            return None
+        self.lexer.seek(end)
+        self.consume_token()
+        return LazyFunctionDefinition(position, name, params, self.lexer.buffer, start, end, type(self))
+
+    # indeks tokenu za "}" zamykajacym blok otwarty na indeksie start
+    # petla po indeksach, bo wycinek kopiowalby cala reszte tablicy typow dla kazdej funkcji
+    def find_closing_bracket(self, start) -> Optional[int]:
+        left = TokenType.LEFT_CURLY_BRACKET.value
+        right = TokenType.RIGHT_CURLY_BRACKET.value
+        types = self.lexer.buffer.types
+        depth = 0
+        for index in range(start, self.lexer.end):
+            token_type = types[index]
+            if token_type == left:
+                depth += 1
+            elif token_type == right:
+                depth -= 1
+                if depth == 0:
+                    return index + 1
+        return None
+
+    # cialo leniwej funkcji, zakres tokenow musi zostac zuzyty w calosci
+    def parse_function_body(self):
+        statements = self.parse_statements()
+        if self.token_type != TokenType.EOF:
+            raise ParsingError(self.current_token, 'Invalid syntax, after parsing a function body there is left')
+        return statements
+
+    # parsuje ciala wszystkich leniwych funkcji, zeby zglosic bledy skladniowe takze w funkcjach, ktore nie zostaly wywolane
+    def validate_program(self, program: Program) -> Program:
+        for function in program.functions.values():
+            if isinstance(function, LazyFunctionDefinition) and not function.is_parsed():
+                function.parse_body()
+        return program
+
     # include_statement = "from", library_name, "import", object_name, 	{coma, object_name}, semicolon; 
     def parse_include_statement(self, includes):
-        if not self.try_consume(TokenType.FROM_NAME):
+        if not self.try_skip(TokenType.FROM_NAME):
             return None
-        position = self.current_token.position
-        library_name = self.must_be([TokenType.ID, TokenType.STRING_VALUE]).value
-        self.must_be(TokenType.IMPORT_NAME)
+        position = self.lexer.get_position()
+        library_name = self.must_be_value([TokenType.ID, TokenType.STRING_VALUE])
+        self.must_be_value(TokenType.IMPORT_NAME)
         object_names = []
-        object_name = self.must_be(TokenType.ID).value
+        object_name = self.must_be_value(TokenType.ID)
         object_names.append(object_name)
-        while self.try_consume(TokenType.COMMA):
-            object_name = self.must_be(TokenType.ID).value
+        while self.try_skip(TokenType.COMMA):
+            object_name = self.must_be_value(TokenType.ID)
             object_names.append(object_name)
-        self.must_be(TokenType.SEMICOLON)
+        self.must_be_value(TokenType.SEMICOLON)
         includes.append(inc := IncludeStatement(position, library_name, object_names))
         return inc
     
     # lambda_expression = "$", variable_name, "=>", statements; 
     def parse_lambda_expression(self):
-        if not self.try_consume(TokenType.LAMBDA_ID):
+        if not self.try_skip(TokenType.LAMBDA_ID):
             return None
-        position = self.current_token.position
-        variable_name = self.must_be(TokenType.ID).value
+        position = self.lexer.get_position()
+        variable_name = self.must_be_value(TokenType.ID)
 
-        self.must_be(TokenType.LAMBDA_OPERATOR)
+        self.must_be_value(TokenType.LAMBDA_OPERATOR)
         if not (statements := self.parse_statements() \
                 or self.parse_or_expression()):
             ExpectedBlockStatements(self.current_token, 'Expected block statements after lambda expression')
@@ -128,7 +201,7 @@ class Parser:
     def parse_function_call_or_assignment(self):
         if expression := self.parse_chained_expression():
             if isinstance(expression, FunctionCall):
-                self.must_be(TokenType.SEMICOLON)
+                self.must_be_value(TokenType.SEMICOLON)
                 return expression
             return self.parse_variable_assignment(expression)
         return None
@@ -143,25 +216,30 @@ class Parser:
     def parse_chained_expression(self):
         if not (element := self.parse_id(None)):
             return None
-        while self.try_consume(TokenType.DOT):
+        while self.try_skip(TokenType.DOT):
             if not (element := self.parse_id(element)):
                 raise ParsingError(self.current_token, "There is no variable access or function call after DOT.")
         return element
 
     def parse_id(self, parent):
-        if not (token := self.try_consume(TokenType.ID)):
+        if not self.check_token_type(TokenType.ID):
             return None
-        if element := self.parse_typical_function_call(token, parent):
+        position = self.lexer.get_position()
+        name = self.must_be_value(TokenType.ID)
+        if element := self.parse_call(position, name, parent):
             return element
         else:
-            return Identifier(token.position, token.value, parent) #parent
+            return Identifier(position, name, parent) #parent
     
     def parse_typical_function_call(self, token: Token, parent):
-        if not self.try_consume(TokenType.LEFT_BRACKET):
+        return self.parse_call(token.position, token.value, parent)
+
+    def parse_call(self, position, name, parent):
+        if not self.try_skip(TokenType.LEFT_BRACKET):
             return None
         arguments = self.parse_arguments()
-        self.must_be(TokenType.RIGHT_BRACKET)
-        return FunctionCall(token.position, token.value, arguments, parent) #parent
+        self.must_be_value(TokenType.RIGHT_BRACKET)
+        return FunctionCall(position, name, arguments, parent) #parent
     # drzewo dla FunctionCall i Identifier, ktore maja parenta
         
     # parameters = [ variable_name, {comma, variable_name} ]; 
@@ -170,7 +248,7 @@ class Parser:
         if (param := self.parse_parameter()) == None:
             return params
         params.append(param)
-        while self.try_consume(TokenType.COMMA):
+        while self.try_skip(TokenType.COMMA):
             if not (param := self.parse_parameter()):
                 raise InvalidParametersDefintion(self.current_token)
             elif param in params:
@@ -181,21 +259,21 @@ class Parser:
 
     # czy warto obudowywac?
     def parse_parameter(self):
-        if param := self.try_consume(TokenType.ID):
-            return param.value
+        if self.check_token_type(TokenType.ID):
+            return self.must_be_value(TokenType.ID)
         return None
     
     # statements = "{", {statement}, "}";
     # obudowanie bloku stms w klase
     # zmiana aby w przyszlosci dopuscic brak bloku statements,  self.must_be(TokenType.LEFT_CURLY_BRACKET) - try_consume
     def parse_statements(self):
-        if not self.try_consume(TokenType.LEFT_CURLY_BRACKET): 
+        if not self.try_skip(TokenType.LEFT_CURLY_BRACKET): 
             return None
-        position = self.current_token.position
+        position = self.lexer.get_position()
         statements = []
         while stm := self.parse_statement():
             statements.append(stm)
-        self.must_be(TokenType.RIGHT_CURLY_BRACKET)
+        self.must_be_value(TokenType.RIGHT_CURLY_BRACKET)
         if len(statements) == 0:
             raise EmptyBlockOfStatements(self.current_token)
         return Statements(position, statements)
@@ -213,38 +291,38 @@ class Parser:
     
     # nawiasy do wyrzucenia
     def parse_return_statement(self):
-        position = self.current_token.position
-        if not self.try_consume(TokenType.RETURN_NAME):
+        position = self.lexer.get_position()
+        if not self.try_skip(TokenType.RETURN_NAME):
             return None
         expr = self.parse_or_expression()
-        self.must_be(TokenType.SEMICOLON)
+        self.must_be_value(TokenType.SEMICOLON)
         return ReturnStatement(position, expr)
 
     #if = "if", "(", expression, ")", statements, ["else", statements]; 
     def parse_if_statement(self):
-        if not self.try_consume(TokenType.IF_NAME):
+        if not self.try_skip(TokenType.IF_NAME):
             return None
-        position = self.current_token.position
-        self.must_be(TokenType.LEFT_BRACKET)
+        position = self.lexer.get_position()
+        self.must_be_value(TokenType.LEFT_BRACKET)
         if not (if_condition := self.parse_or_expression()):
             raise EmptyIfCondition(self.current_token)
-        self.must_be(TokenType.RIGHT_BRACKET)
+        self.must_be_value(TokenType.RIGHT_BRACKET)
         if not (if_statements := self.parse_statements()):
             ExpectedBlockStatements(self.current_token, 'Expected block statements in if statement')
         else_statements = None
-        if self.try_consume(TokenType.ELSE_NAME):
+        if self.try_skip(TokenType.ELSE_NAME):
             if not (else_statements := self.parse_statements()):
                 raise ExpectedBlockStatements(self.current_token, 'Expected block statements in else statement')
         return IfStatement(position, if_condition, if_statements, else_statements)
 
     #while = "while", "(", expression, ")", statements; 
     def parse_while_statement(self):
-        if self.try_consume(TokenType.WHILE_NAME):
-            position = self.current_token.position
-            self.must_be(TokenType.LEFT_BRACKET)
+        if self.try_skip(TokenType.WHILE_NAME):
+            position = self.lexer.get_position()
+            self.must_be_value(TokenType.LEFT_BRACKET)
             if not (while_condition := self.parse_or_expression()):
                 raise InvalidStatement(self.current_token, "Invalid while condition")
-            self.must_be(TokenType.RIGHT_BRACKET)
+            self.must_be_value(TokenType.RIGHT_BRACKET)
             if not (while_statements := self.parse_statements()):
                 ExpectedBlockStatements(self.current_token, 'Expected block statements in while statement')
             return WhileStatement(position, while_condition, while_statements)
@@ -252,18 +330,18 @@ class Parser:
     
     # break_statement = "break", semicolon ; 
     def parse_break_statement(self):
-        position = self.current_token.position
-        if not self.try_consume(TokenType.BREAK_NAME):
+        position = self.lexer.get_position()
+        if not self.try_skip(TokenType.BREAK_NAME):
             return None
-        self.must_be(TokenType.SEMICOLON)
+        self.must_be_value(TokenType.SEMICOLON)
         return BreakStatement(position)
 
     # or_expression = and_expression, {"or", and_expression}; 
     def parse_or_expression(self):
-        position = self.current_token.position
+        position = self.lexer.get_position()
         if left := self.parse_and_expression():
             expressions = [left]
-            while self.try_consume(TokenType.OR_OPERATOR):
+            while self.try_skip(TokenType.OR_OPERATOR):
                 if expression := self.parse_and_expression():
                     expressions.append(expression)
                 else:
@@ -276,10 +354,10 @@ class Parser:
 
     # and_expresion = relation_expresion, {"and", relation_condition}; 
     def parse_and_expression(self):
-        position = self.current_token.position
+        position = self.lexer.get_position()
         if left := self.parse_logic_expression():
             expressions = [left]
-            while self.try_consume(TokenType.AND_OPERATOR):
+            while self.try_skip(TokenType.AND_OPERATOR):
                 if expression := self.parse_logic_expression():
                     expressions.append(expression)
                 else:
@@ -293,9 +371,9 @@ class Parser:
     # logic_expression = arth_expression, [relational_operator, arth_expression];
     # skorzystac z jednego LOGIC_OPERATORS,  
     def parse_logic_expression(self):
-        position = self.current_token.position
+        position = self.lexer.get_position()
         if left := self.parse_arth_expression():
-            if creator := self.LOGIC_OPERATIONS_MAPPING.get(self.current_token.type):
+            if creator := self.LOGIC_OPERATIONS_MAPPING.get(self.token_type):
                 self.consume_token()
                 if right := self.parse_arth_expression():
                     return creator(position, left, right)
@@ -306,21 +384,21 @@ class Parser:
     # wyrzucic negacje, AddExpression, SubExpression, kolejna mapa 
     def parse_arth_expression(self):
         if left := self.parse_term():
-            while creator := self.ARTH_OPERATORS.get(self.current_token.type):
+            while creator := self.ARTH_OPERATORS.get(self.token_type):
                 self.consume_token()
                 if not (next_expr := self.parse_term()):
                     raise InvalidArthExpression(self.current_token)
-                left = creator(self.current_token.position, left,  next_expr)
+                left = creator(self.lexer.get_position(), left,  next_expr)
             return left
         return None
     
     # term = factor, { multiply_operator, factor }; 
     def parse_term(self):
         if left := self.parse_factor():
-            while creator := self.MUL_OPERATORS.get(self.current_token.type):
+            while creator := self.MUL_OPERATORS.get(self.token_type):
                 self.consume_token()
                 if next_expr := self.parse_factor():
-                    left = creator(self.current_token.position, left, next_expr)
+                    left = creator(self.lexer.get_position(), left, next_expr)
                 else:
                     raise InvalidTerm(self.current_token)              
             return left
@@ -329,11 +407,11 @@ class Parser:
     # factor = [negation_operator], (literal_value | object_expression | function_call | "(", arth_expression, ")");
     # modyfikacja do pijedyncznego znaku negacji  
     def parse_factor(self):
-        position = self.current_token.position
+        position = self.lexer.get_position()
         is_negation = False
-        if negation_token := self.try_consume([TokenType.NEGATION_OPERATOR, TokenType.SUB_OPERATOR]):
+        if negation_token := self.try_skip([TokenType.NEGATION_OPERATOR, TokenType.SUB_OPERATOR]):
             is_negation = True
-            if negation_token.type == TokenType.NEGATION_OPERATOR:
+            if negation_token == TokenType.NEGATION_OPERATOR:
                 negation_type = 'Logic'
             else:
                 negation_type = 'Arth'
@@ -362,55 +440,55 @@ class Parser:
         return None
 
     def parse_expression(self):
-        if self.try_consume(TokenType.LEFT_BRACKET):
+        if self.try_skip(TokenType.LEFT_BRACKET):
             operation = self.parse_or_expression()
-            self.must_be(TokenType.RIGHT_BRACKET)
+            self.must_be_value(TokenType.RIGHT_BRACKET)
             return operation
         return None
     
     # LiteralBool i value
     def parse_boolean(self):
-        position = self.current_token.position
-        if token := self.try_consume(self.BOOLEAN):
-            if token.type == TokenType.TRUE_VALUE:
-                return LiteralBool(position, True)
-            return LiteralBool(position, False)
-        return None
+        if not self.check_token_type(self.BOOLEAN):
+            return None
+        position = self.lexer.get_position()
+        if self.try_skip(self.BOOLEAN) == TokenType.TRUE_VALUE:
+            return LiteralBool(position, True)
+        return LiteralBool(position, False)
 
     def parse_number(self):
-        position = self.current_token.position
-        if token := self.try_consume(TokenType.INT_VALUE):
-            return LiteralInt(position, token.value)
-        return None
+        if not self.check_token_type(TokenType.INT_VALUE):
+            return None
+        position = self.lexer.get_position()
+        return LiteralInt(position, self.must_be_value(TokenType.INT_VALUE))
 
     def parse_float(self):
-        position = self.current_token.position
-        if token := self.try_consume(TokenType.FLOAT_VALUE):
-            return LiteralFloat(position, token.value)
-        return None
+        if not self.check_token_type(TokenType.FLOAT_VALUE):
+            return None
+        position = self.lexer.get_position()
+        return LiteralFloat(position, self.must_be_value(TokenType.FLOAT_VALUE))
 
     def parse_string(self):
-        position = self.current_token.position
-        if token := self.try_consume(TokenType.STRING_VALUE):
-            return LiteralString(position, token.value)
-        return None
+        if not self.check_token_type(TokenType.STRING_VALUE):
+            return None
+        position = self.lexer.get_position()
+        return LiteralString(position, self.must_be_value(TokenType.STRING_VALUE))
 
     # array= "[", [or_expression, {comma , or_expression}] , "]"; 
     def parse_array(self):
-        if not self.try_consume(TokenType.LEFT_QUADRATIC_BRACKET):
+        if not self.try_skip(TokenType.LEFT_QUADRATIC_BRACKET):
             return None
-        position = self.current_token.position
+        position = self.lexer.get_position()
         elements = []
 
         if first_element := self.parse_or_expression():
             elements.append(first_element)
 
-            while self.try_consume(TokenType.COMMA):
+            while self.try_skip(TokenType.COMMA):
                 if (next_element := self.parse_or_expression()) is None:
                     raise InvalidArrayDefinition(self.current_token, "Expected an expression after ',' in array")
                 elements.append(next_element)
         
-        self.must_be(TokenType.RIGHT_QUADRATIC_BRACKET)
+        self.must_be_value(TokenType.RIGHT_QUADRATIC_BRACKET)
         
         return Array(position, elements)
     
@@ -422,11 +500,11 @@ class Parser:
         return arguments
     
     def parse_function_arguments(self):
-        position = self.current_token.position
+        position = self.lexer.get_position()
         arguments = []
         if arg := self.parse_or_expression():
             arguments.append(arg)
-            while self.try_consume(TokenType.COMMA):
+            while self.try_skip(TokenType.COMMA):
                 arguments.append(self.parse_or_expression())
         
         return FunctionArguments(position, arguments)
@@ -435,8 +513,8 @@ class Parser:
     def parse_variable_assignment(self, expression):
         if not isinstance(expression, Identifier):
             raise InvalidVariableAssignment(self.current_token, 'You define invalid variable assignment')
-        self.must_be(TokenType.ASSIGN_OPERATOR)
+        self.must_be_value(TokenType.ASSIGN_OPERATOR)
         if not (assign_expr := self.parse_or_expression()):
             raise InvalidVariableAssignment(self.current_token, 'You define invalid variable assignment')
-        self.must_be(TokenType.SEMICOLON)
+        self.must_be_value(TokenType.SEMICOLON)
         return Assignment(expression.position, expression, assign_expr) #Assignment
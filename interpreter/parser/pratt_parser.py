@@ -0,0 +1,120 @@
+from ..tokens.token import TokenType
+from .parser import Parser
+from .syntax_error import *
+from .syntax_tree import *
+
+# poziomy operatorow od najsilniej wiazacego, operand poziomu n to wyrazenie poziomu n - 1
+FACTOR = 0
+TERM = 1
+ARTH = 2
+LOGIC = 3
+AND = 4
+OR = 5
+
+_LITERALS = {
+    TokenType.INT_VALUE: LiteralInt,
+    TokenType.FLOAT_VALUE: LiteralFloat,
+    TokenType.STRING_VALUE: LiteralString,
+}
+
+
+# parser wyrazen metoda wspinaczki po priorytetach, buduje te same wezly (z tymi samymi pozycjami)
+# co Parser, ale zamiast siedmiu wywolan na kazdy operand parsuje czynnik i dokleja do niego
+# operatory kolejnych poziomow w jednej ramce
+class PrattParser(Parser):
+    def parse_or_expression(self):
+        return self.parse_level(OR)
+
+    def parse_and_expression(self):
+        return self.parse_level(AND)
+
+    def parse_logic_expression(self):
+        return self.parse_level(LOGIC)
+
+    def parse_arth_expression(self):
+        return self.parse_level(ARTH)
+
+    def parse_term(self):
+        return self.parse_level(TERM)
+
+    def parse_level(self, level):
+        position = self.lexer.get_position()
+        if not (left := self.parse_factor()):
+            return None
+        if level == FACTOR:
+            return left
+        token_type = self.token_type
+
+        # term = factor, { multiply_operator, factor };
+        while creator := self.MUL_OPERATORS.get(token_type):
+            self.consume_token()
+            if not (right := self.parse_factor()):
+                raise InvalidTerm(self.current_token)
+            left = creator(self.lexer.get_position(), left, right)
+            token_type = self.token_type
+        if level == TERM:
+            return left
+
+        # arth_expression = term, {sum_operator, term};
+        while creator := self.ARTH_OPERATORS.get(token_type):
+            self.consume_token()
+            if not (right := self.parse_level(TERM)):
+                raise InvalidArthExpression(self.current_token)
+            left = creator(self.lexer.get_position(), left, right)
+            token_type = self.token_type
+        if level == ARTH:
+            return left
+
+        # logic_expression = arth_expression, [relational_operator, arth_expression];
+        if creator := self.LOGIC_OPERATIONS_MAPPING.get(token_type):
+            self.consume_token()
+            if not (right := self.parse_level(ARTH)):
+                raise InvalidLogicExpression(self.current_token)
+            left = creator(position, left, right)
+            token_type = self.token_type
+        if level == LOGIC:
+            return left
+
+        # and_expresion = relation_expresion, {"and", relation_condition};
+        if token_type == TokenType.AND_OPERATOR:
+            expressions = [left]
+            while self.token_type == TokenType.AND_OPERATOR:
+                self.consume_token()
+                if not (right := self.parse_level(LOGIC)):
+                    raise InvalidAndExpression(self.current_token)
+                expressions.append(right)
+            left = AndExpression(position, expressions)
+            token_type = self.token_type
+        if level == AND:
+            return left
+
+        # or_expression = and_expression, {"or", and_expression};
+        if token_type == TokenType.OR_OPERATOR:
+            expressions = [left]
+            while self.token_type == TokenType.OR_OPERATOR:
+                self.consume_token()
+                if not (right := self.parse_level(AND)):
+                    raise InvalidOrExpression(self.current_token)
+                expressions.append(right)
+            left = OrExpression(position, expressions)
+        return left
+
+    # literaly, identyfikatory i nawiasy rozpoznawane po typie tokenu, bez przechodzenia przez kolejne parse_*
+    def parse_factor(self):
+        token_type = self.token_type
+        if literal := _LITERALS.get(token_type):
+            position = self.lexer.get_position()
+            return literal(position, self.must_be_value(token_type))
+        if token_type == TokenType.ID:
+            return self.parse_function_call_or_object_expression()
+        if token_type == TokenType.TRUE_VALUE or token_type == TokenType.FALSE_VALUE:
+            position = self.lexer.get_position()
+            self.consume_token()
+            return LiteralBool(position, token_type == TokenType.TRUE_VALUE)
+        if token_type == TokenType.LEFT_BRACKET:
+            return self.parse_expression()
+        if token_type == TokenType.LEFT_QUADRATIC_BRACKET:
+            return self.parse_array()
+        if token_type == TokenType.NEGATION_OPERATOR or token_type == TokenType.SUB_OPERATOR:
+            return super().parse_factor()
+        return None
@@ -0,0 +1,34 @@
+from .syntax_tree import *
+from .tree_walker import TreeWalker
+
+
+# nadaje parametrom, zmiennym lokalnym i zmiennym lambd funkcji stale indeksy w ramce (tablicy) kontekstu
+# parametry dostaja pierwsze indeksy w kolejnosci deklaracji; ciala lambd wykonywane sa w osobnym
+# kontekscie funkcji wbudowanej, wiec identyfikatory wewnatrz nich zostaja przy wyszukiwaniu po nazwie
+class SlotResolver(TreeWalker):
+    def __init__(self):
+        super().__init__()
+        self.slots = {}
+
+    def resolve(self, function: FunctionDefintion) -> FunctionDefintion:
+        self.slots = {}
+        for parameter in function.parameters:
+            self.get_slot(parameter)
+        self.visit(function.statements)
+        function.frame_size = len(self.slots)
+        return function
+
+    def get_slot(self, name) -> int:
+        return self.slots.setdefault(name, len(self.slots))
+
+    def visit_function_definition(self, element: FunctionDefintion):
+        self.resolve(element)
+
+    def visit_lambda_expression(self, element: LambdaExpression):
+        element.slot = self.get_slot(element.variable_name)
+
+    def visit_identifier(self, element: Identifier):
+        if element.parent is None:
+            element.slot = self.get_slot(element.name)
+        else:
+            element.parent.accept(self)
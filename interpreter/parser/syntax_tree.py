@@ -4,7 +4,10 @@ from abc import abstractmethod
 import importlib
 
 
+# wezly maja __slots__, zeby duze drzewa nie trzymaly slownika atrybutow dla kazdego wezla
 class Node:
+    __slots__ = ('position',)
+
     def __init__(self, position: SourcePosition) -> None:
         self.position = position
 
@@ -14,6 +17,8 @@ class Node:
 
 
 class Program(Node):
+    __slots__ = ('functions', 'includes')
+
     def __init__(self, position, functions, includes) -> None:
         super().__init__(position)
         self.functions = functions
@@ -28,11 +33,15 @@ class Program(Node):
 
 
 class FunctionDefintion(Node):
+    # frame_size ustawia SlotResolver przy pierwszym wywolaniu funkcji
+    __slots__ = ('name', 'parameters', 'statements', 'frame_size')
+
     def __init__(self, position, name, parameters, statements) -> None:
         super().__init__(position)
         self.name = name
         self.parameters = parameters
         self.statements = statements
+        self.frame_size = None
 
     def accept(self, visitor: Visitor) -> None:
         visitor.visit_function_definition(self)
@@ -43,7 +52,39 @@ class FunctionDefintion(Node):
         return f'Function "{self.name}":\n  Parameters: {parameters_str}\n  Statements:\n    {statements_str}'
 
 
+# funkcja z zapamietanym zakresem tokenow ciala ("{" ... "}"), cialo jest parsowane przy pierwszym uzyciu statements
+class LazyFunctionDefinition(FunctionDefintion):
+    __slots__ = ('tokens', 'start', 'end', 'parser_class', '_statements')
+
+    def __init__(self, position, name, parameters, tokens, start, end, parser_class) -> None:
+        Node.__init__(self, position)
+        self.name = name
+        self.parameters = parameters
+        self.frame_size = None
+        self.tokens = tokens
+        self.start = start
+        self.end = end
+        self.parser_class = parser_class
+        self._statements = None
+
+    @property
+    def statements(self):
+        if self._statements is None:
+            return self.parse_body()
+        return self._statements
+
+    def parse_body(self):
+        parser = self.parser_class(self.tokens.cursor(self.start, self.end))
+        self._statements = parser.parse_function_body()
+        return self._statements
+
+    def is_parsed(self) -> bool:
+        return self._statements is not None
+
+
 class IncludeStatement(Node):
+    __slots__ = ('library_name', 'objects_names')
+
     def __init__(self, position: SourcePosition, library_name, objects_names) -> None:
         super().__init__(position)
         self.library_name = library_name
@@ -58,16 +99,21 @@ class IncludeStatement(Node):
 
 
 class LambdaExpression(Node):
+    __slots__ = ('variable_name', 'statements', 'slot')
+
     def __init__(self, position: SourcePosition, variable_name, statements) -> None:
         super().__init__(position)
         self.variable_name = variable_name
         self.statements = statements
+        self.slot = None
 
     def accept(self, visitor: Visitor):
         visitor.visit_lambda_expression(self)
 
 
 class FunctionArguments(Node):
+    __slots__ = ('arguments',)
+
     def __init__(self, position: SourcePosition, arguments) -> None:
         super().__init__(position)
         self.arguments = arguments
@@ -77,10 +123,14 @@ class FunctionArguments(Node):
 
 
 class Identifier(Node):
+    # slot to indeks zmiennej w ramce funkcji, None oznacza wyszukiwanie po nazwie w slowniku kontekstu
+    __slots__ = ('name', 'parent', 'slot')
+
     def __init__(self, position, name, parent=None) -> None:
         super().__init__(position)
         self.name = name
         self.parent = parent
+        self.slot = None
 
     def accept(self, visitor: Visitor) -> None:
         visitor.visit_identifier(self)
@@ -90,6 +140,8 @@ class Identifier(Node):
 
 
 class Parameter(Node):
+    __slots__ = ('name',)
+
     def __init__(self, position, name) -> None:
         super().__init__(position)
         self.name = name
@@ -102,6 +154,8 @@ class Parameter(Node):
 
 
 class ReturnStatement(Node):
+    __slots__ = ('statement',)
+
     def __init__(self, position, statement):
         super().__init__(position)
         self.statement = statement
@@ -114,6 +168,8 @@ class ReturnStatement(Node):
 
 
 class IfStatement(Node):
+    __slots__ = ('condition', 'statements', 'else_statement')
+
     def __init__(self, position, condition, statements, else_statement) -> None:
         super().__init__(position)
         self.condition = condition
@@ -130,6 +186,8 @@ class IfStatement(Node):
 
 
 class WhileStatement(Node):
+    __slots__ = ('condition', 'statements')
+
     def __init__(self, position, condition, statements) -> None:
         super().__init__(position)
         self.condition = condition
@@ -144,6 +202,8 @@ class WhileStatement(Node):
 
 
 class BreakStatement(Node):
+    __slots__ = ()
+
     def __str__(self):
         return f'BreakStatement at {self.position}'
 
@@ -152,6 +212,8 @@ class BreakStatement(Node):
 
 
 class MultiParameterExpression(Node):
+    __slots__ = ('nodes',)
+
     def __init__(self, position, nodes):
         super().__init__(position)
         self.nodes = nodes
@@ -165,6 +227,8 @@ class MultiParameterExpression(Node):
 
 
 class OrExpression(MultiParameterExpression):
+    __slots__ = ()
+
     def __init__(self, position, nodes):
         super().__init__(position, nodes)
 
@@ -176,6 +240,8 @@ class OrExpression(MultiParameterExpression):
 
 
 class AndExpression(MultiParameterExpression):
+    __slots__ = ()
+
     def __init__(self, position, nodes):
         super().__init__(position, nodes)
 
@@ -187,6 +253,8 @@ class AndExpression(MultiParameterExpression):
 
 
 class Negation(Node):
+    __slots__ = ('node', 'negation_type')
+
     def __init__(self, position, node, negation_type):
         super().__init__(position)
         self.node = node
@@ -200,6 +268,8 @@ class Negation(Node):
 
 
 class ArthExpression(Node):
+    __slots__ = ('left', 'right')
+
     def __init__(self, position, left, right):
         super().__init__(position)
         self.left = left
@@ -213,6 +283,8 @@ class ArthExpression(Node):
 
 
 class SumExpression(ArthExpression):
+    __slots__ = ()
+
     def __init__(self, position, left, right):
         super().__init__(position, left, right)
 
@@ -221,6 +293,8 @@ class SumExpression(ArthExpression):
 
 
 class SubExpression(ArthExpression):
+    __slots__ = ()
+
     def __init__(self, position, left, right):
         super().__init__(position, left, right)
 
@@ -229,6 +303,8 @@ class SubExpression(ArthExpression):
 
 
 class MulExpression(ArthExpression):
+    __slots__ = ()
+
     def __init__(self, position, left, right):
         super().__init__(position, left, right)
 
@@ -237,6 +313,8 @@ class MulExpression(ArthExpression):
 
 
 class DivExpression(ArthExpression):
+    __slots__ = ()
+
     def __init__(self, position, left, right):
         super().__init__(position, left, right)
 
@@ -245,6 +323,8 @@ class DivExpression(ArthExpression):
 
 
 class BinaryOperation(Node):
+    __slots__ = ('left', 'right')
+
     def __init__(self, position, left, right):
         super().__init__(position)
         self.left = left
@@ -258,6 +338,8 @@ class BinaryOperation(Node):
 
 
 class EqualOperation(BinaryOperation):
+    __slots__ = ()
+
     def __init__(self, position, left, right):
         super().__init__(position, left, right)
 
@@ -269,6 +351,8 @@ class EqualOperation(BinaryOperation):
 
 
 class NotEqualOperation(BinaryOperation):
+    __slots__ = ()
+
     def __init__(self, position, left, right):
         super().__init__(position, left, right)
 
@@ -280,6 +364,8 @@ class NotEqualOperation(BinaryOperation):
 
 
 class GreaterOperation(BinaryOperation):
+    __slots__ = ()
+
     def __init__(self, position, left, right):
         super().__init__(position, left, right)
 
@@ -291,6 +377,8 @@ class GreaterOperation(BinaryOperation):
 
 
 class GreaterEqualOperation(BinaryOperation):
+    __slots__ = ()
+
     def __init__(self, position, left, right):
         super().__init__(position, left, right)
 
@@ -302,6 +390,8 @@ class GreaterEqualOperation(BinaryOperation):
 
 
 class LessOperation(BinaryOperation):
+    __slots__ = ()
+
     def __init__(self, position, left, right):
         super().__init__(position, left, right)
 
@@ -313,6 +403,8 @@ class LessOperation(BinaryOperation):
 
 
 class LessEqualOperation(BinaryOperation):
+    __slots__ = ()
+
     def __init__(self, position, left, right):
         super().__init__(position, left, right)
 
@@ -324,6 +416,8 @@ class LessEqualOperation(BinaryOperation):
 
 
 class LiteralBool(Node):
+    __slots__ = ('value',)
+
     def __init__(self, position: SourcePosition, value) -> None:
         super().__init__(position)
         self.value = value
@@ -336,6 +430,8 @@ class LiteralBool(Node):
 
 
 class LiteralInt(Node):
+    __slots__ = ('value',)
+
     def __init__(self, position: SourcePosition, value) -> None:
         super().__init__(position)
         self.value = value
@@ -348,6 +444,8 @@ class LiteralInt(Node):
 
 
 class LiteralFloat(Node):
+    __slots__ = ('value',)
+
     def __init__(self, position: SourcePosition, value) -> None:
         super().__init__(position)
         self.value = value
@@ -360,6 +458,8 @@ class LiteralFloat(Node):
 
 
 class LiteralString(Node):
+    __slots__ = ('value',)
+
     def __init__(self, position: SourcePosition, value) -> None:
         super().__init__(position)
         self.value = value
@@ -372,6 +472,8 @@ class LiteralString(Node):
 
 
 class Array(Node):
+    __slots__ = ('items',)
+
     def __init__(self, position: SourcePosition, items) -> None:
         super().__init__(position)
         self.items = items
@@ -385,6 +487,8 @@ class Array(Node):
 
 
 class Assignment(Node):
+    __slots__ = ('target', 'value')
+
     def __init__(self, position: SourcePosition, target, value):
         super().__init__(position)
         self.target = target
@@ -398,11 +502,15 @@ class Assignment(Node):
 
 
 class FunctionCall(Node):
+    # target to cel wywolania (linker.CallTarget) ustawiany przez ExecuteVisitor.link_call
+    __slots__ = ('function_name', 'arguments', 'parent', 'target')
+
     def __init__(self, position: SourcePosition, function_name, arguments, parent=None) -> None:
         super().__init__(position)
         self.function_name = function_name
         self.arguments = arguments
         self.parent = parent
+        self.target = None
 
     def accept(self, visitor: Visitor) -> None:
         visitor.visit_function_call(self)
@@ -412,6 +520,8 @@ class FunctionCall(Node):
 
 
 class Statements(Node):
+    __slots__ = ('statements',)
+
     def __init__(self, position: SourcePosition, statements) -> None:
         super().__init__(position)
         self.statements = statements
@@ -0,0 +1,119 @@
+from ..interpreter.visitor import Visitor
+from .syntax_tree import *
+
+
+# przejscie po calym drzewie: kazdy wezel odwiedza swoje dzieci, podklasy nadpisuja tylko interesujace je wezly
+# wezel moze zostac zastapiony innym: metoda visit_* ustawia replacement po odwiedzeniu dzieci,
+# a wezel nadrzedny zapisuje zastepstwo w miejscu odwiedzonego dziecka
+# nieprzeparsowane ciala funkcji leniwych sa pomijane
+class TreeWalker(Visitor):
+    def __init__(self):
+        super().__init__()
+        self.replacement = None
+
+    # wezel, ktory zastepuje odwiedzony (ten sam, jesli zadna metoda visit_* nie ustawila replacement)
+    def visit(self, element):
+        if element is None:
+            return None
+        self.replacement = None
+        element.accept(self)
+        replacement, self.replacement = self.replacement, None
+        return element if replacement is None else replacement
+
+    def visit_child(self, element, name):
+        child = getattr(element, name)
+        if (replacement := self.visit(child)) is not child:
+            setattr(element, name, replacement)
+
+    def visit_items(self, items):
+        for index, item in enumerate(items):
+            if (replacement := self.visit(item)) is not item:
+                items[index] = replacement
+
+    def visit_program(self, element: Program):
+        for function in element.functions.values():
+            if not isinstance(function, LazyFunctionDefinition) or function.is_parsed():
+                function.accept(self)
+
+    def visit_function_definition(self, element: FunctionDefintion):
+        self.visit_child(element, 'statements')
+
+    def visit_include_statement(self, element):
+        pass
+
+    def visit_lambda_expression(self, element: LambdaExpression):
+        self.visit_child(element, 'statements')
+
+    def visit_function_arguments(self, element: FunctionArguments):
+        self.visit_items(element.arguments)
+
+    def visit_identifier(self, element: Identifier):
+        self.visit_child(element, 'parent')
+
+    def visit_parameter(self, element):
+        pass
+
+    def visit_return_statement(self, element: ReturnStatement):
+        self.visit_child(element, 'statement')
+
+    def visit_if_statement(self, element: IfStatement):
+        self.visit_child(element, 'condition')
+        self.visit_child(element, 'statements')
+        self.visit_child(element, 'else_statement')
+
+    def visit_while_statement(self, element: WhileStatement):
+        self.visit_child(element, 'condition')
+        self.visit_child(element, 'statements')
+
+    def visit_break_statement(self, element):
+        pass
+
+    def visit_or_expression(self, element: OrExpression):
+        self.visit_items(element.nodes)
+
+    def visit_and_expression(self, element: AndExpression):
+        self.visit_items(element.nodes)
+
+    def visit_negation(self, element: Negation):
+        self.visit_child(element, 'node')
+
+    def visit_operands(self, element):
+        self.visit_child(element, 'left')
+        self.visit_child(element, 'right')
+
+    visit_sum_expression = visit_operands
+    visit_sub_expression = visit_operands
+    visit_mul_expression = visit_operands
+    visit_div_expression = visit_operands
+    visit_equal_operation = visit_operands
+    visit_not_equal_operation = visit_operands
+    visit_greater_operation = visit_operands
+    visit_greater_equal_operation = visit_operands
+    visit_less_operation = visit_operands
+    visit_less_equal_operation = visit_operands
+
+    def visit_literal_bool(self, element):
+        pass
+
+    def visit_literal_int(self, element):
+        pass
+
+    def visit_literal_float(self, element):
+        pass
+
+    def visit_literal_string(self, element):
+        pass
+
+    def visit_array(self, element: Array):
+        self.visit_items(element.items)
+
+    def visit_assignment(self, element: Assignment):
+        self.visit_child(element, 'value')
+        self.visit_child(element, 'target')
+
+    def visit_function_call(self, element: FunctionCall):
+        self.visit_child(element, 'parent')
+        self.visit_child(element, 'arguments')
+
+    def visit_statements(self, element: Statements):
+        self.visit_items(element.statements)
@@ -0,0 +1,81 @@
+import mmap
+
+from .source import Source
+
+# dlugosc sekwencji UTF-8 na podstawie pierwszego bajtu
+def _utf8_length(byte: int) -> int:
+    if byte >= 0xF0:
+        return 4
+    if byte >= 0xE0:
+        return 3
+    if byte >= 0xC0:
+        return 2
+    return 1
+
+_ASCII = [chr(byte) for byte in range(0x80)]
+_CR = ord('\r')
+_LF = ord('\n')
+
+# plik jest mapowany do pamieci i przegladany po offsetach, bez dekodowania calej zawartosci
+class MemoryMappedSource(Source):
+    supports_slicing = True
+
+    def __init__(self, path) -> None:
+        self._file = open(path, 'rb')
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # pustego pliku nie da sie zmapowac
+            self._data = b''
+        self._size = len(self._data)
+        self._offset = 0
+        self._mark = 0
+        super().__init__(self._data)
+
+    def _read_char(self) -> str:
+        offset = self._offset
+        self._mark = offset
+        if offset >= self._size:
+            return ''
+        byte = self._data[offset]
+        if byte < 0x80:
+            self._offset = offset + 1
+            return _ASCII[byte]
+        end = offset + _utf8_length(byte)
+        self._offset = end
+        return self._data[offset:end].decode('utf-8')
+
+    def _consume_line_feed(self) -> bool:
+        if self._offset < self._size and self._data[self._offset] == _LF:
+            self._offset += 1
+            return True
+        return False
+
+    # fragment konczy sie za bajtem '\n', wiec nie rozcina znaku UTF-8; dekodowany jest tylko ten fragment
+    def _read_block(self, size) -> str:
+        start = self._offset
+        end = self._data.find(b'\n', start + size - 1) + 1 if start + size < self._size else 0
+        self._offset = end = end or self._size
+        return self._data[start:end].decode('utf-8')
+
+    # offset w bajtach, pod ktorym zaczyna sie aktualny znak
+    def get_mark(self) -> int:
+        return self._mark
+
+    def get_text(self, start: int, end: int) -> str:
+        return self._data[start:end].decode('utf-8')
+
+    # cala zmapowana zawartosc pliku jako bufor bajtow, np. do klucza pamieci podrecznej bez dekodowania
+    def get_data(self):
+        return self._data
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -1,44 +1,121 @@
 import io
+import re
 import typing
 
-from .source_position import SourcePosition
+from .source_position import LineIndex, OffsetPosition
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+_LINE_FEED = re.compile('\n')
 
 class Source:
+    # zrodla trzymajace caly tekst pozwalaja lexerowi wycinac leksemy bez kopiowania znak po znaku
+    supports_slicing = False
+
     def __init__(self, source:typing.Union[io.TextIOBase, io.StringIO]) -> None:
-        self.current_position = SourcePosition(1, 0)
+        # zamiast obiektu pozycji dla kazdego znaku liczony jest offset i tablica poczatkow linii
+        self.offset = -1
+        self.line_index = LineIndex()
         # usunieto pole next_position
         self.current_char = 'STX' # null tutaj lub 'stx'
         self.source = source
         self.next_char()
 
+    def _read_char(self) -> str:
+        return self.source.read(1)
+
+    # wywolywane po '\r', zwraca True jesli nastepny znak to '\n' (i go konsumuje)
+    def _consume_line_feed(self) -> bool:
+        currency = self.source.tell()
+        next_char = self.source.read(1)
+        if next_char == '\n':
+            return True
+        self.source.seek(currency)
+        return False
+
     def next_char(self):
+        self.offset += 1
         if self.current_char == '\n':
-            self.current_position = self.current_position.next_line()
-        char = self.source.read(1)
+            self.line_index.add_line(self.offset)
+        char = self._read_char()
 
-        if char == '\r':
-            currency = self.source.tell()
-            next_char = self.source.read(1)
-            if next_char == '\n':
-                char = '\n'
-            else:
-                self.source.seek(currency)
+        if char == '\r' and self._consume_line_feed():
+            char = '\n'
 
         if not char:
             self.current_char = 'EOF'
-            self.current_position = self.current_position.next_char()
-        
-        #elif char == '\n':
-        #    self.current_char = char
-        #    self.current_position = self.current_position.next_char()
-        #    self.current_position.next_line()
-
         else:
             self.current_char = char
-            self.current_position = self.current_position.next_char()
+
+    # co najmniej size znakow i reszta ostatniej linii, '' na koncu zrodla
+    def _read_block(self, size) -> str:
+        block = self.source.read(size)
+        if block and block[-1] != '\n':
+            block += self.source.readline()
+        return block
+
+    # kolejny fragment tekstu od aktualnego znaku do konca linii (CRLF zamienione na LF), '' na koncu zrodla;
+    # zrodlo przechodzi na pierwszy znak za fragmentem, a zaden leksem nie przechodzi przez koniec linii,
+    # wiec FastLexer skanuje tekst fragmentami, bez dekodowania calego pliku naraz
+    def read_chunk(self, size=DEFAULT_BUFFER_SIZE) -> str:
+        if self.current_char == 'EOF':
+            return ''
+        text = (self.current_char + self._read_block(size)).replace('\r\n', '\n')
+        base = self.offset
+        # poczatek linii za ostatnim znakiem dodaje next_char
+        for line_feed in _LINE_FEED.finditer(text, 0, len(text) - 1):
+            self.line_index.add_line(base + line_feed.end())
+        self.offset = base + len(text) - 1
+        self.current_char = text[-1]
+        self.next_char()
+        return text
 
     def get_char(self) -> str:
         return self.current_char
 
-    def get_position(self) -> SourcePosition:
-        return self.current_position
+    def get_offset(self) -> int:
+        return self.offset
+
+    def get_position(self) -> OffsetPosition:
+        return OffsetPosition(self.offset, self.line_index)
+
+
+# czyta zrodlo blokami, dzieki czemu nie wymaga seek/tell i dziala tez dla potokow i stdin
+class BufferedSource(Source):
+    def __init__(self, source:typing.Union[io.TextIOBase, io.StringIO], buffer_size=DEFAULT_BUFFER_SIZE) -> None:
+        if buffer_size < 1:
+            raise ValueError("Buffer size must be a positive number")
+        self._buffer_size = buffer_size
+        self._buffer = ''
+        self._index = 0
+        super().__init__(source)
+
+    def _fill_buffer(self) -> bool:
+        self._buffer = self.source.read(self._buffer_size)
+        self._index = 0
+        return bool(self._buffer)
+
+    def _read_char(self) -> str:
+        if self._index >= len(self._buffer) and not self._fill_buffer():
+            return ''
+        char = self._buffer[self._index]
+        self._index += 1
+        return char
+
+    def _consume_line_feed(self) -> bool:
+        # '\r' moze byc ostatnim znakiem bloku, wtedy '\n' jest na poczatku kolejnego
+        if self._index >= len(self._buffer) and not self._fill_buffer():
+            return False
+        if self._buffer[self._index] == '\n':
+            self._index += 1
+            return True
+        return False
+
+    def _read_block(self, size) -> str:
+        block = self._buffer[self._index:]
+        self._buffer = ''
+        self._index = 0
+        if len(block) < size:
+            block += self.source.read(size - len(block))
+        if block and block[-1] != '\n':
+            block += self.source.readline()
+        return block
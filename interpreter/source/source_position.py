@@ -1,3 +1,4 @@
+from bisect import bisect_right
 from dataclasses import dataclass
 
 
@@ -17,4 +18,56 @@ class SourcePosition:
     
     # dodano equal
     def __eq__(self, other):
-        return self.line == other.line and self.column == other.column
\ No newline at end of file
+        return self.line == other.line and self.column == other.column
+
+
+# tablica poczatkow linii, pozwala zamienic offset na linie i kolumne dopiero wtedy, gdy sa potrzebne
+class LineIndex:
+    def __init__(self) -> None:
+        self.line_starts = [0]
+
+    def add_line(self, offset: int):
+        self.line_starts.append(offset)
+
+    def get_position(self, offset: int) -> SourcePosition:
+        line = bisect_right(self.line_starts, offset)
+        return SourcePosition(line, offset - self.line_starts[line - 1] + 1)
+
+
+# pozycja przechowywana jako offset, linia i kolumna sa wyliczane leniwie
+class OffsetPosition:
+    __slots__ = ('offset', 'line_index')
+
+    def __init__(self, offset: int, line_index: LineIndex) -> None:
+        self.offset = offset
+        self.line_index = line_index
+
+    def resolve(self) -> SourcePosition:
+        return self.line_index.get_position(self.offset)
+
+    @property
+    def line(self) -> int:
+        return self.resolve().line
+
+    @property
+    def column(self) -> int:
+        return self.resolve().column
+
+    def next_char(self):
+        return self.resolve().next_char()
+
+    def next_line(self):
+        return self.resolve().next_line()
+
+    def get_possition_without_escaping(self, n):
+        return self.resolve().get_possition_without_escaping(n)
+
+    def __eq__(self, other):
+        position = self.resolve()
+        return position.line == other.line and position.column == other.column
+
+    def __hash__(self):
+        return hash(self.resolve())
+
+    def __repr__(self):
+        return repr(self.resolve())
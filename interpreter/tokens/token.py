@@ -4,6 +4,8 @@ from .token_type import TokenType
 from interpreter.source.source_position import SourcePosition
 
 class Token:
+    __slots__ = ('type', 'value', 'position')
+
     def __init__(self, type:TokenType, value: typing.Union[str, float, int], position:SourcePosition) -> None:
         self.type = type
         self.value = value
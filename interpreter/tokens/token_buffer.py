@@ -0,0 +1,139 @@
+from array import array
+import typing
+
+from .token import Token
+from .token_type import TokenType
+from ..source.source_position import LineIndex, OffsetPosition
+
+_TOKEN_TYPES = {token_type.value: token_type for token_type in TokenType}
+
+
+# strumien tokenow zapisany w rownoleglych tablicach zamiast listy obiektow Token:
+# kod typu, offset poczatku i indeks do tablicy (internowanych) wartosci
+class TokenBuffer:
+    def __init__(self, line_index: LineIndex) -> None:
+        self.types = array('B')
+        self.offsets = array('q')
+        self.value_ids = array('I')
+        self.values = [None]
+        self.line_index = line_index
+        self._interned = {}
+
+    def append(self, type: TokenType, value: typing.Union[str, float, int, None], offset: int):
+        self.types.append(type.value)
+        self.offsets.append(offset)
+        self.value_ids.append(self._intern(value))
+
+    def _intern(self, value) -> int:
+        if value is None:
+            return 0
+        # klucz z typem, zeby 1, 1.0 i True nie zostaly sklejone
+        key = (value.__class__, value)
+        value_id = self._interned.get(key)
+        if value_id is None:
+            value_id = len(self.values)
+            self.values.append(value)
+            self._interned[key] = value_id
+        return value_id
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def get_type(self, index: int) -> TokenType:
+        return _TOKEN_TYPES[self.types[index]]
+
+    def get_value(self, index: int):
+        return self.values[self.value_ids[index]]
+
+    def get_position(self, index: int) -> OffsetPosition:
+        return OffsetPosition(self.offsets[index], self.line_index)
+
+    def get_token(self, index: int) -> Token:
+        return Token(self.get_type(index), self.get_value(index), self.get_position(index))
+
+    def cursor(self, start=0, end=None) -> 'TokenCursor':
+        return TokenCursor(self, start, end)
+
+    # slownik internowania da sie odtworzyc z tablicy wartosci, wiec nie jest zapisywany
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_interned']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._interned = {(value.__class__, value): value_id for value_id, value in enumerate(self.values) if value_id}
+
+
+# kursor po buforze: parser czyta typ, wartosc i pozycje aktualnego tokenu wprost z tablic bufora,
+# bez obiektu na kazdy token (Token powstaje tylko w get_token, np. dla komunikatu bledu)
+class TokenCursor:
+    def __init__(self, buffer: TokenBuffer, start=0, end=None) -> None:
+        self.buffer = buffer
+        self.index = start
+        self.end = len(buffer) if end is None else end
+        self._types = buffer.types
+        self._offsets = buffer.offsets
+        self._value_ids = buffer.value_ids
+        self._values = buffer.values
+        self._line_index = buffer.line_index
+        # indeks aktualnego tokenu w buforze i jego typ
+        self._current = start
+        self._type = None
+        self._position_index = -1
+        self._position = None
+
+    # przechodzi do nastepnego tokenu i zwraca jego typ
+    def advance(self) -> TokenType:
+        index = self.index
+        if index >= self.end:
+            # za koncem zakresu zwracany jest EOF w miejscu pierwszego tokenu spoza zakresu
+            self._current = min(index, len(self._types) - 1)
+            self._type = TokenType.EOF
+        else:
+            self.index = index + 1
+            self._current = index
+            self._type = _TOKEN_TYPES[self._types[index]]
+        return self._type
+
+    def get_value(self):
+        current = self._current
+        return self._values[self._value_ids[current]] if current < self.end else None
+
+    # parser pyta o pozycje tego samego tokenu w kilku funkcjach parse_*, obiekt powstaje raz
+    def get_position(self) -> OffsetPosition:
+        if self._position_index != self._current:
+            self._position_index = self._current
+            self._position = OffsetPosition(self._offsets[self._current], self._line_index)
+        return self._position
+
+    def get_token(self) -> Token:
+        return Token(self._type, self.get_value(), self.get_position())
+
+    # indeks nastepnego tokenu, ktory wczyta advance
+    def tell(self) -> int:
+        return self.index
+
+    def seek(self, index: int):
+        self.index = index
+
+
+# kursor o tym samym interfejsie nad lexerem zwracajacym obiekty Token (get_next_token),
+# tokeny sa czytane na biezaco, bez zapisywania calego strumienia w buforze
+class LexerCursor:
+    def __init__(self, lexer) -> None:
+        self.lexer = lexer
+        self.token = None
+
+    def advance(self) -> TokenType:
+        self.token = self.lexer.get_next_token()
+        return self.token.type
+
+    def get_value(self):
+        return self.token.value
+
+    def get_position(self):
+        return self.token.position
+
+    def get_token(self) -> Token:
+        return self.token
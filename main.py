@@ -1,25 +1,39 @@
 import sys
-from interpreter.lexer.lexer import Lexer
-from interpreter.source.source import Source
-from interpreter.parser.parser import Parser
-from interpreter.interpreter.executeVisitor import ExecuteVisitor
+from interpreter.lexer.fast_lexer import FastLexer
+from interpreter.source.source import BufferedSource
+from interpreter.parser.pratt_parser import PrattParser
+from interpreter.parser.ast_cache import CODE_CACHE_SUFFIX, get_cache_path, load_program
+from interpreter.parser.optimizer import optimize_program
+from interpreter.interpreter.engines import create_visitor
+from interpreter.interpreter.pythonExecutor import PythonExecutor
 from interpreter.interpreter.printerVisitor import PrintVisitor
 from interpreter.interpreter.interpreter import Context, Interpreter
 
+# zoptymalizowane drzewo trafia tez do __bncache__, PARSE_OPTIONS jest czescia klucza wpisu
+PARSE_OPTIONS = 'pratt,skip_comments,optimize'
+
+def parse_program(source):
+    return optimize_program(PrattParser(FastLexer(source, skip_comments=True)).parse_program())
+
 def main():
     if len(sys.argv) > 1:
         file_path = sys.argv[1]
         try:
-            with open(file_path, 'r') as file:
-                source = Source(file)
-                lexer = Lexer(source)
-                parser = Parser(lexer)
-                visitor = ExecuteVisitor()
-                printerVisitor = PrintVisitor()
-                interpreter = Interpreter(parser.parse_program())
-                printerVisitor.visit_program(interpreter.program)
-                result = interpreter.execute(visitor)
-                print(result)
+            # '-' oznacza wczytanie programu ze standardowego wejscia, drzewa plikow trafiaja do __bncache__
+            if file_path == '-':
+                program = parse_program(BufferedSource(sys.stdin))
+            else:
+                program = load_program(file_path, parse_program, options=PARSE_OPTIONS)
+            # silnik wybierany zmienna srodowiskowa BN_ENGINE (domyslnie tree)
+            visitor = create_visitor()
+            # silnik python zapisuje skompilowany modul obok drzewa w __bncache__
+            if isinstance(visitor, PythonExecutor) and file_path != '-':
+                visitor.cache_path = get_cache_path(file_path, CODE_CACHE_SUFFIX)
+            printerVisitor = PrintVisitor()
+            interpreter = Interpreter(program)
+            printerVisitor.visit_program(interpreter.program)
+            result = interpreter.execute(visitor)
+            print(result)
         except FileNotFoundError:
             print(f"Błąd: Nie znaleziono pliku '{file_path}'. Proszę sprawdzić ścieżkę i spróbować ponownie.")
         except Exception as e:
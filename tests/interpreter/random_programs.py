@@ -0,0 +1,80 @@
+import io
+
+from interpreter.lexer.lexer import Lexer
+from interpreter.source.source import Source
+from interpreter.parser.parser import Parser
+from interpreter.interpreter.interpreter import Interpreter
+
+# generator losowych programow BN do porownywania silnikow wykonania (wynik albo typ i tresc bledu)
+
+LITERALS = ['0', '1', '7', '2.5', '0.0', '"a"', '""', 'true', 'false', '[1, 2]']
+VARIABLES = ['x', 'y', 'lst']
+OPERATORS = ['+', '-', '*', '/', '==', '!=', '<', '<=', '>', '>=', 'and', 'or']
+
+
+class ProgramGenerator:
+    def __init__(self, generator, functions=3):
+        self.generator = generator
+        self.functions = functions
+
+    def expression(self, depth=3, calls=0):
+        generator = self.generator
+        kind = generator.random()
+        if depth == 0 or kind < 0.3:
+            return generator.choice(LITERALS + VARIABLES)
+        if kind < 0.4:
+            return generator.choice(['!', '-']) + f'({self.expression(depth - 1, calls)})'
+        if kind < 0.5 and calls:
+            arguments = ', '.join(self.expression(depth - 1, calls) for _ in range(generator.randint(0, 2)))
+            return f'f{generator.randrange(calls)}({arguments})'
+        if kind < 0.55:
+            return f'lst.{generator.choice(["where", "foreach"])}($v => {{ {self.lambda_body()} }})'
+        if kind < 0.6:
+            return f'lst.get({generator.choice(["0", "1", "x"])})'
+        left = self.expression(depth - 1, calls)
+        right = self.expression(depth - 1, calls)
+        return f'({left} {generator.choice(OPERATORS)} {right})'
+
+    def lambda_body(self):
+        return self.generator.choice(['v = v > 1;', 'v = v * 2;', 'v = v + x;', 'return;', 'v = 1; return v;', 'w = v; v = w - 1;'])
+
+    def statements(self, depth=2, calls=0, in_loop=False):
+        generator = self.generator
+        statements = []
+        for _ in range(generator.randint(1, 4)):
+            kind = generator.random()
+            if depth == 0 or kind < 0.3:
+                statements.append(f'{generator.choice(VARIABLES)} = {self.expression(calls=calls)};')
+            elif kind < 0.38:
+                statements.append(f'({self.expression(calls=calls)})')
+            elif kind < 0.45 and calls:
+                statements.append(f'f{generator.randrange(calls)}({self.expression(1, calls)});')
+            elif kind < 0.5:
+                statements.append(f'lst.append({self.expression(1, calls)});')
+            elif kind < 0.68:
+                else_branch = f' else {{ {self.statements(depth - 1, calls, in_loop)} }}' if generator.random() < 0.5 else ''
+                statements.append(f'if ({self.expression(1, calls)}) {{ {self.statements(depth - 1, calls, in_loop)} }}{else_branch}')
+            elif kind < 0.8:
+                statements.append(f'while (i < 3) {{ i = i + 1; {self.statements(depth - 1, calls, True)} }}')
+            elif kind < 0.9 or not in_loop and generator.random() < 0.8:
+                statements.append(generator.choice(['return;', f'return {self.expression(1, calls)};']))
+            else:
+                statements.append('break;')
+        return ' '.join(statements)
+
+    def program(self):
+        functions = []
+        for index in range(self.functions):
+            parameters = ', '.join(['x', 'y'][:self.generator.randint(0, 2)])
+            functions.append(f'def f{index}({parameters}) {{ x = 1; y = 2; i = 0; lst = [1, 2, 3]; {self.statements(calls=index)} }}')
+        functions.append(f'def main() {{ x = 1; y = 2; i = 0; lst = [1, 2, 3]; {self.statements(calls=self.functions)} }}')
+        return '\n'.join(functions)
+
+
+def run_program(string, engine=None, visitor=None):
+    try:
+        program = Parser(Lexer(Source(io.StringIO(string)))).parse_program()
+        result = Interpreter(program, engine).execute(visitor)
+        return type(result), repr(result)
+    except Exception as error:
+        return type(error), str(error)
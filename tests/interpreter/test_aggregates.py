@@ -0,0 +1,76 @@
+import io
+import pytest
+
+from interpreter.lexer.lexer import Lexer
+from interpreter.source.source import Source
+from interpreter.parser.parser import Parser
+from interpreter.interpreter import builtins, vectorize
+from interpreter.interpreter.engines import ENGINES, create_visitor
+from interpreter.interpreter.interpreter import Interpreter
+
+NUMBERS = ', '.join(str(value * 7 % 100 - 30) for value in range(100))
+
+
+def execute(string, engine='tree'):
+    program = Parser(Lexer(Source(io.StringIO(string)))).parse_program()
+    return Interpreter(program).execute(create_visitor(engine))
+
+
+class TestAggregates:
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("string, expected", [
+        ('x = [3, 1, 2]; return sum(x);', 6),
+        ('x = [3, 1.5, 2]; return sum(x);', 6.5),
+        ('x = []; return sum(x);', 0),
+        ('x = [true, true, false]; return sum(x);', 2),
+        ('x = [3, 1, 2]; return min(x);', 1),
+        ('x = [3, 1, 2]; return x.max();', 3),
+        ('x = ["b", "a"]; return min(x);', "a"),
+        ('x = [1, 2]; return average(x);', 1.5),
+        ('x = [1, 2, 3]; return x.count();', 3),
+        ('x = [1, 2, 3]; return x.count($v => { v = v > 1; });', 2),
+        ('x = [1, 2, 3]; return x.all($v => { v = v > 0; });', True),
+        ('x = [1, 2, 3]; return x.all($v => { v = v > 1; });', False),
+        ('x = []; return x.all($v => { v = v > 1; });', True),
+        ('x = [1, 2, 3, 4]; return x.aggregate($p => { p = get(p, 0) * get(p, 1); });', 24),
+        ('x = [7]; return x.aggregate($p => { p = 0; });', 7),
+        ('x = [1, 2, 3, 4]; return x.where($v => { v = v > 1; }).foreach($v => { v = v * 2; }).sum();', 18),
+        ('x = [1, 2, 3, 4]; return x.foreach($v => { v = v - 3; }).max();', 1),
+        ('x = [1, 2, 3, 4]; return x.where($v => { v = v > 2; }).count($v => { v = v == 4; });', 1),
+        (f'x = [{NUMBERS}]; return [sum(x), min(x), max(x), x.count($v => {{ v = v > 10; }})];', [1950, -30, 69, 59]),
+        (f'x = [{NUMBERS}]; return [x.all($v => {{ v = v > -31; }}), x.any($v => {{ v = v > 69; }})];', [True, False])])
+    def test_results(self, engine, string, expected):
+        result = execute(f'def main() {{ {string} }}', engine)
+        assert result == expected and type(result) is type(expected)
+
+    @pytest.mark.parametrize("string", [
+        'x = []; return min(x);',
+        'x = []; return average(x);',
+        'x = []; return x.aggregate($p => { p = 0; });',
+        'x = [1, "a"]; return sum(x);',
+        'x = [1, "a"]; return max(x);'])
+    def test_errors(self, string):
+        with pytest.raises(ValueError):
+            execute(f'def main() {{ {string} }}')
+
+    def test_same_as_loop(self, monkeypatch):
+        monkeypatch.setattr(vectorize, 'MIN_VECTOR_LENGTH', 10 ** 9)
+        lambdas = execute(f'def main() {{ x = [{NUMBERS}]; return [x.count($v => {{ v = v > 10; }}), x.all($v => {{ v = v > 0; }})]; }}')
+        loop = execute(f'''def main() {{ x = [{NUMBERS}]; i = 0; n = 0; positive = true;
+            while (i < x.count()) {{ if (get(x, i) > 10) {{ n = n + 1; }} if (get(x, i) <= 0) {{ positive = false; }} i = i + 1; }}
+            return [n, positive]; }}''')
+        assert lambdas == loop == [59, False]
+
+    def test_numpy_arrays_use_numpy_reductions(self):
+        import numpy as np
+        values = np.array([[1, 5], [3, 2]])
+        assert builtins.sum_items(values) == 11 and builtins.max_item(values) == 5 and builtins.average(values) == 2.75
+        with pytest.raises(ValueError):
+            builtins.min_item(np.array([]))
+
+    def test_aggregates_are_pure(self):
+        visitor = create_visitor('tree', memo_size=256)
+        string = 'def f(n) { x = [n, 1]; return sum(x) + max(x); } def main() { return f(2) + f(2); }'
+        program = Parser(Lexer(Source(io.StringIO(string)))).parse_program()
+        assert Interpreter(program).execute(visitor) == 10
+        assert visitor.get_memo_stats()['f']['hits'] == 1
@@ -0,0 +1,91 @@
+import random
+import pytest
+
+from interpreter.interpreter.closureExecutor import ClosureExecutor
+from interpreter.interpreter.engines import create_visitor, ENGINES
+from interpreter.interpreter.executeVisitor import ExecuteVisitor
+from interpreter.interpreter.interpreter_error import RecursionLimitExceeded
+from . import test_interpreter
+from .random_programs import ProgramGenerator, run_program
+
+
+# caly zestaw testow interpretera uruchamiany z ClosureExecutor w miejscu ExecuteVisitor
+class TestClosureInterpreter(test_interpreter.TestInterpreter):
+    @pytest.fixture(autouse=True)
+    def closure_engine(self, monkeypatch):
+        monkeypatch.setattr(test_interpreter, 'ExecuteVisitor', ClosureExecutor)
+
+
+class TestClosureExecutor:
+    def test_same_results_as_tree_walker(self):
+        generator = ProgramGenerator(random.Random(13))
+        for _ in range(1000):
+            string = generator.program()
+            assert run_program(string, 'closure') == run_program(string, 'tree'), string
+
+    @pytest.mark.parametrize("string", [
+        'def f(a) { return; } def main() { return f(5); }',
+        'def f(a) { x = 1; } def main() { return f(5) + 1; }',
+        'def main() { i = 0; while (i < 5) { i = i + 1; x = 0; } return i; }',
+        'def main() { i = 0; while (i < 5) { i = i + 1; } return; }',
+        'def main() { lst = [1, 2]; lst.where($v => { return; }); x = 1; return 2; }',
+        'def main() { lst = [1, 2, 3]; return lst.where($v => { v = v > 1; }); }',
+        'def main() { if (0) { x = 1; } }',
+        'def main() { break; }',
+        'def main() { x = 1 / 0; }',
+        'def main() { return -"a"; }',
+        'def main() { return y; }',
+        'def f(n) { return f(n + 1); } def main() { return f(0); }',
+        'def main() { return f(1, ); } def f(a) { return a; }',
+        'def f(n) { if (n == 0) { return; } return f(n - 1); } def main() { x = 7; return f(3); }',
+        'def f(n) { if (n == 0) { x = 1; } else { return g(n - 1); } } def g(n) { return f(n); } def main() { return f(4); }',
+        'def f(n) { if (n == 0) { return "a"; } return f(n - 1); } def main() { x = -f(2); }',
+        'def f(n) { return print(n); } def main() { return f(3); }'])
+    def test_same_semantics(self, string):
+        assert run_program(string, 'closure') == run_program(string, 'tree')
+
+    def test_function_is_compiled_once(self):
+        visitor = ClosureExecutor()
+        run_program('def f(a) { return a * 2; } def main() { return f(1) + f(2) + f(3); }', visitor=visitor)
+        functions = [element for element in visitor.compiled if type(element).__name__ == 'FunctionDefintion']
+        assert sorted(function.name for function in functions) == ['f', 'main']
+
+    @pytest.mark.parametrize("engine", ['closure', 'python', 'vm'])
+    def test_deep_tail_recursion(self, engine):
+        visitor = create_visitor(engine, recursion_limit=200000)
+        string = 'def f(n, acc) { if (n == 0) { return acc; } return f(n - 1, acc + n); } def main() { return f(100000, 0); }'
+        assert run_program(string, visitor=visitor) == (int, '5000050000')
+        assert visitor.recursion_depth == 0
+
+    @pytest.mark.parametrize("engine", ['closure', 'python', 'vm'])
+    def test_tail_calls_count_towards_limit(self, engine):
+        visitor = create_visitor(engine, recursion_limit=1000)
+        result = run_program('def f(n) { return f(n + 1); } def main() { return f(0); }', visitor=visitor)
+        assert result[0] is RecursionLimitExceeded
+        assert visitor.recursion_depth == 0
+
+    @pytest.mark.parametrize("engine", ['tree', 'closure', 'python', 'vm'])
+    def test_deep_recursion_within_limit(self, engine):
+        visitor = create_visitor(engine, recursion_limit=200000)
+        result = run_program('def f(n) { if (n == 0) { return 0; } return f(n - 1) + 1; } def main() { return f(20000); }',
+                             visitor=visitor)
+        # vm nie korzysta ze stosu pythona, pozostale silniki zglaszaja koniec stosu jak przekroczenie limitu
+        assert result == (int, '20000') if engine == 'vm' else result[0] is RecursionLimitExceeded
+        assert visitor.recursion_depth == 0
+
+    def test_recursion_limit_from_environment(self, monkeypatch):
+        monkeypatch.setenv('BN_RECURSION_LIMIT', '5000')
+        assert create_visitor('closure').recursion_limit == 5000
+        assert create_visitor('vm', recursion_limit=10).recursion_limit == 10
+
+    def test_default_engine(self, monkeypatch):
+        monkeypatch.delenv('BN_ENGINE', raising=False)
+        assert type(create_visitor()) is ExecuteVisitor
+
+    def test_engine_from_environment(self, monkeypatch):
+        monkeypatch.setenv('BN_ENGINE', 'tree')
+        assert type(create_visitor()) is ExecuteVisitor
+        assert type(create_visitor('closure')) is ClosureExecutor
+        monkeypatch.setenv('BN_ENGINE', 'unknown')
+        with pytest.raises(ValueError):
+            create_visitor()
@@ -0,0 +1,93 @@
+import io
+import pytest
+
+from interpreter.lexer.lexer import Lexer
+from interpreter.source.source import Source
+from interpreter.parser.parser import Parser
+from interpreter.parser.syntax_tree import *
+from interpreter.source.source_position import SourcePosition
+from interpreter.interpreter.closureExecutor import ClosureExecutor
+from interpreter.interpreter.executeVisitor import ExecuteVisitor
+from interpreter.interpreter.feedback import GENERIC, SPECIALIZE_AFTER, SPECIALIZED, TypeFeedback
+from interpreter.interpreter.interpreter import Interpreter
+
+
+def parse(string):
+    return Parser(Lexer(Source(io.StringIO(string)))).parse_program()
+
+
+def site(expression_class=SumExpression):
+    position = SourcePosition(1, 1)
+    feedback = TypeFeedback()
+    return feedback, feedback.add_site(expression_class(position, None, None))
+
+
+class TestOperatorSite:
+    @pytest.mark.parametrize("expression_class, left, right, expected", [
+        (SumExpression, 2, 3, 5),
+        (SumExpression, 2.5, 0.5, 3.0),
+        (SumExpression, "a", "b", "ab"),
+        (SubExpression, 7, 2, 5),
+        (MulExpression, 1.5, 2.0, 3.0),
+        (DivExpression, 7, 2, 3.5)])
+    def test_monomorphic_site_specializes(self, expression_class, left, right, expected):
+        feedback, operator_site = site(expression_class)
+        for _ in range(SPECIALIZE_AFTER + 2):
+            assert operator_site.evaluate(left, right) == expected
+        assert operator_site.state == SPECIALIZED
+        assert feedback.get_counters() == {'sites': 1, 'specialized': 1, 'deoptimized': 0, 'active': 1, 'generic': 0}
+
+    def test_guard_failure_falls_back_to_generic(self):
+        feedback, operator_site = site()
+        for _ in range(SPECIALIZE_AFTER):
+            operator_site.evaluate(1, 2)
+        assert operator_site.evaluate(1, 2.5) == 3.5
+        assert operator_site.evaluate("a", 1) == "a1"
+        assert operator_site.state == GENERIC
+        assert feedback.get_counters()['deoptimized'] == 1
+
+    def test_polymorphic_site_stays_generic(self):
+        feedback, operator_site = site()
+        operator_site.evaluate(1, 2)
+        operator_site.evaluate(1.0, 2.0)
+        for _ in range(SPECIALIZE_AFTER):
+            operator_site.evaluate(1, 2)
+        assert operator_site.state == GENERIC
+        assert feedback.get_counters()['specialized'] == 0
+
+    def test_pair_without_specialization(self):
+        feedback, operator_site = site()
+        for _ in range(SPECIALIZE_AFTER + 1):
+            assert operator_site.evaluate(1, "a") == "1a"
+        assert operator_site.state == GENERIC
+
+    def test_type_error_from_specialized_site(self):
+        feedback, operator_site = site(SubExpression)
+        for _ in range(SPECIALIZE_AFTER):
+            operator_site.evaluate(3, 1)
+        with pytest.raises(TypeError) as error:
+            operator_site.evaluate("a", "b")
+        assert str(error.value) == "Unsupported operand types for -: 'str' and 'str' at position: SourcePosition(line=1, column=1)"
+
+
+class TestVisitorFeedback:
+    PROGRAM = '''def main() { i = 0; x = 0.0; s = "";
+        while (i < 20) { x = x + 0.5; s = s + "a"; i = i + 1; }
+        return i / 0; }'''
+
+    @pytest.mark.parametrize("visitor_class", [ExecuteVisitor, ClosureExecutor])
+    def test_sites_specialized_during_run(self, visitor_class):
+        visitor = visitor_class()
+        with pytest.raises(ZeroDivisionError, match="Division by zero is not allowed"):
+            Interpreter(parse(self.PROGRAM)).execute(visitor)
+        counters = visitor.type_feedback.get_counters()
+        assert counters['specialized'] == 3
+        assert counters['active'] == 3
+
+    @pytest.mark.parametrize("visitor_class", [ExecuteVisitor, ClosureExecutor])
+    def test_results_after_deoptimization(self, visitor_class):
+        program = parse('''def main() { i = 0; x = 0;
+            while (i < 20) { if (i == 15) { x = x + 0.5; } x = x + 1; i = i + 1; } return x; }''')
+        visitor = visitor_class()
+        assert Interpreter(program).execute(visitor) == 20.5
+        assert visitor.type_feedback.get_counters()['deoptimized'] == 1
@@ -520,7 +520,50 @@ class TestInterpreter:
         visitor = ExecuteVisitor()
         ret = interpreter.execute(visitor)
         assert ret == 0
-    
+
+    def test_undefined_variable_in_function(self):
+        parser = self._get_parser('def main() { y = x; x = 1; return y; }')
+        interpreter = Interpreter(parser.parse_program())
+        with pytest.raises(RuntimeError) as exc_info:
+            interpreter.execute(ExecuteVisitor())
+        assert "Variable 'x' is not defined." in str(exc_info.value)
+
+    def test_undefined_variable_never_assigned(self):
+        parser = self._get_parser('def main() { return x; }')
+        interpreter = Interpreter(parser.parse_program())
+        with pytest.raises(KeyError) as exc_info:
+            interpreter.execute(ExecuteVisitor())
+        assert exc_info.value.args[0] == "Variable 'x' is not defined."
+
+    def test_array_reassignment_keeps_reference(self):
+        parser = self._get_parser('def main() { a = [1]; b = a; b = [2, 3]; return a; }')
+        interpreter = Interpreter(parser.parse_program())
+        assert interpreter.execute(ExecuteVisitor()) == [2, 3]
+
+    def test_lambda_variable_in_function(self):
+        parser = self._get_parser("""
+                                    def main() {
+                                        y = 10;
+                                        lst = [1, 2, 3];
+                                        big = lst.where($x => { x = x > 1; });
+                                        doubled = big.foreach($z => { z = z * 2; });
+                                        return [x, z, y, doubled.get(0), doubled.get(1)];
+                                    }""")
+        interpreter = Interpreter(parser.parse_program())
+        assert interpreter.execute(ExecuteVisitor()) == [None, None, 10, 4, 6]
+
+    def test_function_slots(self):
+        parser = self._get_parser('def f(a, b) { c = a + b; lst = [c]; lst.where($x => { x = x + 1; }); return c; } def main() { return f(1, 2); }')
+        program = parser.parse_program()
+        assert Interpreter(program).execute(ExecuteVisitor()) == 3
+        function = program.functions['f']
+        assert function.frame_size == 5
+        assignment = function.statements.statements[0]
+        assert (assignment.target.slot, assignment.value.left.slot, assignment.value.right.slot) == (2, 0, 1)
+        call = function.statements.statements[2]
+        assert call.arguments.slot == 4
+        assert call.arguments.statements.statements[0].target.slot is None
+
 
     @staticmethod
     def _get_parser(string: str) -> Parser:
@@ -0,0 +1,114 @@
+import io
+import pytest
+
+from interpreter.lexer.lexer import Lexer
+from interpreter.source.source import Source
+from interpreter.parser.parser import Parser
+from interpreter.interpreter.builtins import BuiltInFunction
+from interpreter.interpreter.engines import ENGINES
+from interpreter.interpreter.executeVisitor import ExecuteVisitor
+from interpreter.interpreter.interpreter import Interpreter
+from interpreter.interpreter.interpreter_error import FunctionDoesNotExist
+from interpreter.interpreter.linker import DEFINED, LAMBDA_NATIVE, METHOD, MISSING, NATIVE
+
+
+def parse(string, lazy_functions=False):
+    return Parser(Lexer(Source(io.StringIO(string))), lazy_functions=lazy_functions).parse_program()
+
+
+def call_targets(program):
+    main = program.functions['main'].statements.statements
+    return [getattr(statement.value, 'target', None) for statement in main]
+
+
+class TestLinker:
+    def test_call_sites_linked_after_program(self):
+        program = parse('from student import Student; def f(a) { return a; } '
+                        'def main() { a = f(1); b = print(); c = [1]; c = c.where($x => { y = f(x); }); '
+                        'd = Student("Adam", 22); e = d.greet(); g = h(); }')
+        program.accept(ExecuteVisitor())
+        kinds = [target.kind if target else None for target in call_targets(program)]
+        assert kinds == [DEFINED, NATIVE, None, LAMBDA_NATIVE, NATIVE, METHOD, MISSING]
+        lambda_call = program.functions['main'].statements.statements[3].value.arguments.statements.statements[0].value
+        assert lambda_call.target.function is program.functions['f']
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_lookup_once_per_call_site(self, engine, monkeypatch):
+        calls = []
+        get_class_method = ExecuteVisitor.get_class_method
+        monkeypatch.setattr(ExecuteVisitor, 'get_class_method',
+                            lambda self, element: calls.append(element) or get_class_method(self, element))
+        program = parse('from student import Student; '
+                        'def main() { i = 0; s = Student("Adam", 22); while (i < 20) { x = s.greet(); i = i + 1; } return x; }')
+        assert Interpreter(program).execute(ENGINES[engine]()) == "Hello, my name is Adam and I am 22 years old."
+        assert len(calls) == 1
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_missing_function_raises_on_call(self, engine):
+        program = parse('def main() { x = 1; if (x == 2) { f(); } return g(x); }')
+        with pytest.raises(FunctionDoesNotExist):
+            Interpreter(program).execute(ENGINES[engine]())
+
+    def test_new_function_invalidates_targets(self):
+        program = parse('def main() { x = f(2); } def f(a) { return a; }')
+        visitor = ExecuteVisitor()
+        program.accept(visitor)
+        assert call_targets(program)[0].function is program.functions['f']
+        visitor.add_function('f', BuiltInFunction(lambda a: a * 10))
+        main = program.functions['main']
+        visitor.additional_args = ([], None)
+        main.accept(visitor)
+        assert visitor.last_result == 20
+        assert call_targets(program)[0].kind == NATIVE
+
+    def test_lazy_function_linked_on_first_call(self):
+        program = parse('def f(a) { return get(a, 1); } def main() { x = [6, 7]; return f(x); }', lazy_functions=True)
+        assert Interpreter(program).execute(ExecuteVisitor()) == 7
+        call = program.functions['f'].statements.statements[0].statement
+        assert call.target.kind == NATIVE
+
+
+SHAPES = '''
+class Square:
+    def __init__(self, side):
+        self.side = side
+
+    def area(self):
+        return self.side * self.side
+
+
+class Circle:
+    def __init__(self, radius):
+        self.radius = radius
+
+    def area(self):
+        return 3 * self.radius * self.radius
+
+
+class Text:
+    def upper(self):
+        return "imported " + self
+'''
+
+
+class TestImportedMethods:
+    @pytest.fixture(autouse=True)
+    def shapes_module(self, tmp_path, monkeypatch):
+        (tmp_path / 'shapes.py').write_text(SHAPES)
+        monkeypatch.syspath_prepend(str(tmp_path))
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_method_of_imported_class(self, engine):
+        program = parse('from shapes import Square; def measure(shape) { return shape.area(); } '
+                        'def main() { return [measure(Square(2)), measure(Square(3))]; }')
+        assert Interpreter(program).execute(ENGINES[engine]()) == [4, 9]
+        call = program.functions['measure'].statements.statements[0].statement
+        assert call.target.kind == METHOD
+        assert call.target.callable is call.target.function.obj.area
+
+    # metoda z klasy importowanej, a nie z typu odbiorcy (str.upper)
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_builtin_receiver_uses_imported_method(self, engine):
+        program = parse('from shapes import Text; def main() { i = 0; x = ""; '
+                        'while (i < 3) { s = "abc"; x = s.upper(); i = i + 1; } return x; }')
+        assert Interpreter(program).execute(ENGINES[engine]()) == "imported abc"
@@ -0,0 +1,100 @@
+import io
+import pytest
+
+from interpreter.lexer.lexer import Lexer
+from interpreter.source.source import Source
+from interpreter.parser.parser import Parser
+from interpreter.interpreter import builtins, parallel, sequence
+from interpreter.interpreter.engines import ENGINES, create_visitor
+from interpreter.interpreter.interpreter import Interpreter
+from interpreter.parser.syntax_tree import Statements
+
+NUMBERS = ', '.join(str(value * 7 % 100 - 30) for value in range(50))
+
+pytestmark = pytest.mark.skipif(not parallel.can_fork(), reason="parallel where/foreach needs fork")
+
+
+def execute(string, engine='tree', workers=3):
+    program = Parser(Lexer(Source(io.StringIO(string)))).parse_program()
+    return Interpreter(program).execute(create_visitor(engine, workers=workers))
+
+
+@pytest.fixture
+def parallel_runs(monkeypatch):
+    monkeypatch.setattr(parallel, 'MIN_PARALLEL_LENGTH', 10)
+    runs = []
+    run_parallel = parallel.run_parallel
+    monkeypatch.setattr(builtins, 'run_parallel', lambda *args: runs.append(run_parallel(*args)) or runs[-1])
+    return runs
+
+
+class TestParallel:
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("lambda_body", [
+        'w = v * 3; v = w > 20;',
+        'w = v * 3; if (w > 20) { v = w - 1; } else { v = "small"; }'])
+    @pytest.mark.parametrize("function", ['where', 'foreach'])
+    def test_same_results_as_sequential(self, engine, lambda_body, function, parallel_runs):
+        def string(name):
+            return f'def main() {{ x = [{NUMBERS}]; y = x.{name}($v => {{ {lambda_body} }}); return [y.count(), get(y, 7)]; }}'
+        assert execute(string('parallel' + function.capitalize()), engine) == execute(string(function), engine)
+        assert len(parallel_runs) == 1 and parallel_runs[0] is not None
+
+    def test_lambda_with_side_effects_runs_in_order(self, parallel_runs, capsys):
+        assert execute('def main() { x = [3, 2, 1, 0, 1, 2, 3, 4, 5, 6, 7]; x.parallelForeach($v => { print(v); }); return 0; }') == 0
+        assert capsys.readouterr().out.split() == ['3', '2', '1', '0', '1', '2', '3', '4', '5', '6', '7']
+        assert parallel_runs == []
+
+    def test_vectorizable_lambda_uses_numpy(self, parallel_runs):
+        assert execute(f'def main() {{ x = [{NUMBERS}]; return x.parallelWhere($v => {{ v = v > 60; }}); }}') == [61, 68, 66, 64]
+        assert parallel_runs == []
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_error_raised_by_main_process(self, engine, parallel_runs):
+        with pytest.raises(RuntimeError, match='Division by zero'):
+            execute(f'def main() {{ x = [{NUMBERS}]; y = x.parallelForeach($v => {{ w = v - 5; v = 10 / w; }}); }}', engine)
+        assert parallel_runs == [None]
+
+    def test_single_worker_runs_sequentially(self, parallel_runs):
+        assert execute(f'def main() {{ x = [{NUMBERS}]; return x.parallelForeach($v => {{ w = v; v = w * 2; }}).count(); }}', workers=1) == 50
+        assert parallel_runs == [None]
+
+    def test_pool_is_reused_and_closed(self, parallel_runs, monkeypatch):
+        pools = []
+        pool_class = parallel.WorkerPool
+        monkeypatch.setattr(parallel, 'WorkerPool', lambda *args: pools.append(pool_class(*args)) or pools[-1])
+        visitor = create_visitor('tree', workers=2)
+        string = f'def f(x) {{ return x.parallelForeach($v => {{ w = v; v = w * 2; }}).count(); }} ' \
+                 f'def main() {{ x = [{NUMBERS}]; a = f(x) + f(x); return a + x.parallelWhere($v => {{ if (v > 0) {{ v = true; }} else {{ v = false; }} }}).count(); }}'
+        program = Parser(Lexer(Source(io.StringIO(string)))).parse_program()
+        assert Interpreter(program).execute(visitor) == 100 + 32
+        assert len(parallel_runs) == 3 and None not in parallel_runs
+        assert len(pools) == 2 and len(pools[1].stages) == 2
+        assert visitor.worker_pool is None
+
+    @pytest.mark.parametrize("body", ['print(v);', 'v = v * 2; print(v);', 'x = v.value;', 'v = f(v);'])
+    def test_impure_lambda_is_not_run_in_parallel(self, body, parallel_runs):
+        program = Parser(Lexer(Source(io.StringIO(f'def f(a) {{ print(a); }} def main() {{ x = [1]; y = x.foreach($v => {{ {body} }}); }}')))).parse_program()
+        visitor = create_visitor('tree', workers=2)
+        program.accept(visitor)
+        statements = program.functions['main'].statements.statements[1].value.arguments.statements
+        assert parallel.run_parallel(visitor, list(range(50)), (sequence.FOREACH, 'v', statements)) is None
+        assert visitor.worker_pool is None
+
+    def test_stage_key_is_lambda_body(self):
+        program = Parser(Lexer(Source(io.StringIO('def main() { x = [1]; y = x.foreach($v => { v = v; }); }')))).parse_program()
+        statements = program.functions['main'].statements.statements[1].value.arguments.statements
+        other = Statements(statements.position, list(statements.statements))
+        visitor = create_visitor('tree', workers=2)
+        pool = parallel.get_pool(visitor, (sequence.FOREACH, 'v', statements))
+        try:
+            assert pool.get_index((sequence.FOREACH, 'v', statements)) == 0
+            assert pool.get_index((sequence.FOREACH, 'v', other)) is None
+            assert pool.get_index((sequence.WHERE, 'v', statements)) is None
+        finally:
+            parallel.close_pool(visitor)
+
+    def test_workers_from_environment(self, monkeypatch):
+        monkeypatch.setenv('BN_WORKERS', '5')
+        assert create_visitor('vm').workers == 5
+        assert create_visitor('tree', workers=2).workers == 2
@@ -0,0 +1,137 @@
+import io
+import pytest
+
+from interpreter.lexer.lexer import Lexer
+from interpreter.source.source import Source
+from interpreter.parser.parser import Parser
+from interpreter.interpreter.engines import ENGINES, create_visitor
+from interpreter.interpreter.executeVisitor import ExecuteVisitor
+from interpreter.interpreter.interpreter import Interpreter
+from interpreter.interpreter.purity import MISS, MemoCache, PurityAnalyzer
+
+
+def parse(string):
+    return Parser(Lexer(Source(io.StringIO(string)))).parse_program()
+
+
+def pure_names(string):
+    program = parse(string)
+    visitor = ExecuteVisitor()
+    program.accept(visitor)
+    return sorted(function.name for function in PurityAnalyzer(visitor.functions).analyze(program))
+
+
+FIB = 'def fib(n) { if (n < 2) { return n; } return fib(n - 1) + fib(n - 2); } def main() { return fib(20); }'
+
+
+class TestPurityAnalyzer:
+    def test_pure_functions(self):
+        assert pure_names('def sq(x) { y = x * x; return y; } def f(n) { if (n == 0) { return 0; } return f(n - 1) + sq(n); } '
+                          'def g(a) { lst = [a, 2]; return get(lst.foreach($v => { v = v + sq(2); }), 0); } '
+                          'def main() { return f(3) + g(1); }') == ['f', 'g', 'main', 'sq']
+
+    @pytest.mark.parametrize("body", [
+        'print(a);',
+        'x = scan("?");',
+        'x = [1]; append(x, a);',
+        'x = [1, 2]; sort(x);',
+        'x = a.value;',
+        'a.value = 1;',
+        'x = h(a);',
+        'x = [1]; y = x.where($v => { print(v); });',
+        'x = g(a);'])
+    def test_impure_functions(self, body):
+        assert pure_names('from student import Student; def g(b) { print(b); } '
+                          f'def f(a) {{ {body} }} def main() {{ return 1; }}') == ['main']
+
+    @pytest.mark.parametrize("body, expected", [
+        ('x > 1', True),
+        ('!x', True),
+        ('x.value', False),
+        ('print(x)', False),
+        ('{ return x; }', False)])
+    def test_lambda_body(self, body, expected):
+        program = parse(f'def main() {{ a = [1]; y = a.where($x => {body}); }}')
+        visitor = ExecuteVisitor()
+        program.accept(visitor)
+        assignment = program.functions['main'].statements.statements[1]
+        statements = assignment.value.arguments.statements
+        assert PurityAnalyzer(visitor.functions).is_pure_lambda(statements) == expected
+
+    def test_impurity_propagates_through_recursion(self):
+        assert pure_names('def f(n) { return g(n); } def g(n) { if (n) { print(n); } return f(n - 1); } '
+                          'def main() { return 1; }') == ['main']
+
+
+class TestMemoCache:
+    def test_least_recently_used_entry_evicted(self):
+        memo = MemoCache('f', 2)
+        keys = [memo.get_key([value]) for value in (1, 2, 3)]
+        memo.put(keys[0], 'a')
+        memo.put(keys[1], 'b')
+        assert memo.get(keys[0]) == 'a'
+        memo.put(keys[2], 'c')
+        assert memo.get(keys[1]) is MISS
+        assert memo.get_stats() == {'hits': 1, 'misses': 1, 'evictions': 1, 'size': 2, 'max_size': 2}
+
+    def test_argument_types_are_part_of_key(self):
+        memo = MemoCache('f', 8)
+        assert len({memo.get_key([1]), memo.get_key([1.0]), memo.get_key([True])}) == 3
+        assert memo.get_key([[1]]) is None
+
+    def test_float_sign_is_part_of_key(self):
+        memo = MemoCache('f', 8)
+        assert memo.get_key([0.0]) != memo.get_key([-0.0])
+        assert memo.get_key([float('nan')]) == memo.get_key([float('nan')])
+
+    def test_mutable_results_not_stored(self):
+        memo = MemoCache('f', 8)
+        memo.put(memo.get_key([1]), [1, 2])
+        assert memo.get_stats()['size'] == 0
+
+
+class TestMemoization:
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_recursive_calls_memoized(self, engine):
+        visitor = create_visitor(engine, memo_size=256)
+        assert Interpreter(parse(FIB)).execute(visitor) == 6765
+        stats = visitor.get_memo_stats()['fib']
+        assert stats['misses'] == 21
+        assert stats['hits'] == 18
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("memo_size", [0, None])
+    def test_memo_disabled(self, engine, memo_size, monkeypatch):
+        monkeypatch.delenv('BN_MEMO_SIZE', raising=False)
+        visitor = create_visitor(engine) if memo_size is None else create_visitor(engine, memo_size=memo_size)
+        assert Interpreter(parse(FIB)).execute(visitor) == 6765
+        assert visitor.get_memo_stats() == {}
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_negative_zero_argument(self, engine):
+        program = parse('def f(x) { return x + ""; } def main() { return f(0.0) + "|" + f(-0.0); }')
+        assert Interpreter(program).execute(create_visitor(engine, memo_size=256)) == '0.0|-0.0'
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_memoized_tail_calls(self, engine):
+        visitor = create_visitor(engine, memo_size=4)
+        program = parse('def f(n) { if (n == 0) { return "done"; } return f(n - 1); } def g(n) { return f(n); } '
+                        'def main() { a = g(10); b = f(3); c = g(10); return a + b + c; }')
+        assert Interpreter(program).execute(visitor) == "donedonedone"
+        assert visitor.get_memo_stats()['g']['hits'] == 1
+        assert visitor.recursion_depth == 0
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_impure_function_runs_every_time(self, engine, capsys):
+        program = parse('def f(n) { print(n); return n; } def main() { return f(1) + f(1); }')
+        assert Interpreter(program).execute(create_visitor(engine, memo_size=256)) == 2
+        assert capsys.readouterr().out == "1\n1\n"
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_arrays_returned_as_new_objects(self, engine):
+        program = parse('def f(n) { return [n]; } def main() { x = f(1); append(x, 2); y = f(1); return y; }')
+        assert Interpreter(program).execute(create_visitor(engine, memo_size=256)) == [1]
+
+    def test_memo_size_from_environment(self, monkeypatch):
+        monkeypatch.setenv('BN_MEMO_SIZE', '16')
+        assert create_visitor('vm').memo_size == 16
@@ -0,0 +1,95 @@
+import io
+import random
+import pytest
+
+from interpreter.lexer.lexer import Lexer
+from interpreter.source.source import Source
+from interpreter.parser.parser import Parser
+from interpreter.parser.ast_cache import CODE_CACHE_SUFFIX, get_cache_path
+from interpreter.interpreter.interpreter import Interpreter
+from interpreter.interpreter.pythonExecutor import PythonExecutor
+from . import test_interpreter
+from .random_programs import ProgramGenerator, run_program
+
+
+def parse(string):
+    return Parser(Lexer(Source(io.StringIO(string)))).parse_program()
+
+
+# caly zestaw testow interpretera uruchamiany z PythonExecutor w miejscu ExecuteVisitor
+class TestPythonInterpreter(test_interpreter.TestInterpreter):
+    @pytest.fixture(autouse=True)
+    def python_engine(self, monkeypatch):
+        monkeypatch.setattr(test_interpreter, 'ExecuteVisitor', PythonExecutor)
+
+
+class TestPythonExecutor:
+    def test_same_results_as_tree_walker(self):
+        generator = ProgramGenerator(random.Random(14))
+        for _ in range(1000):
+            string = generator.program()
+            assert run_program(string, 'python') == run_program(string, 'tree'), string
+
+    @pytest.mark.parametrize("string", [
+        'def f(a) { return; } def main() { return f(5); }',
+        'def f(a) { x = 1; } def main() { return f(5) + 1; }',
+        'def main() { i = 0; while (i < 5) { i = i + 1; x = 0; } return i; }',
+        'def main() { i = 0; while (i < 5) { i = i + 1; if (i == 3) { break; } } return i; }',
+        'def main() { lst = [1, 2]; lst.where($v => { return; }); x = 1; return 2; }',
+        'def f() { return 7; } def main() { lst = [1, 2]; x = lst.where($v => { return; }) + f(); return 2; }',
+        'def main() { lst = [1, 2, 3]; return lst.where($v => { v = v > 1; }); }',
+        'def main() { lst = [1, 2, 3]; return lst.where($v => v > 1); }',
+        'def main() { lst = [1, 2, 3]; return lst.foreach($v => v + 1); }',
+        'def main() { lst = [1, 2, 3]; x = lst.where($v => v / 0); return 1; }',
+        'def main() { x = 1; x = [1, 2]; }',
+        'def main() { if (0) { x = 1; } }',
+        'def main() { break; }',
+        'def main() { x = 1 / 0; }',
+        'def main() { return -"a"; }',
+        'def main() { return y + f(); } def f() { print(1); }',
+        'def f(n) { return f(n + 1); } def main() { return f(0); }',
+        'def main() { return f(1, ); } def f(a) { return a; }'])
+    def test_same_semantics(self, string):
+        assert run_program(string, 'python') == run_program(string, 'tree')
+
+    def test_functions_and_lambdas_are_transpiled(self):
+        visitor = PythonExecutor()
+        program = parse('def f(a) { return a * 2; } def main() { lst = [1, 2]; return lst.foreach($v => { v = f(v); }); }')
+        assert Interpreter(program).execute(visitor) == [2, 4]
+        assert program.functions['f'] in visitor.generated
+        assert program.functions['main'] in visitor.generated
+        assert len(visitor.generated) == 3
+
+    def test_expression_lambda_is_transpiled(self):
+        visitor = PythonExecutor()
+        program = parse('def main() { lst = [1, 2, 3]; y = lst.where($v => v > 1); return y.take(5); }')
+        assert Interpreter(program).execute(visitor) == [2, 3]
+        assert len(visitor.generated) == 2
+
+    def test_deep_nesting_falls_back_to_closures(self):
+        depth = 25
+        body = 'while (i < 1) { ' * depth + 'i = i + 1; ' + '} ' * depth
+        program = parse(f'def main() {{ i = 0; {body} return i; }}')
+        visitor = PythonExecutor()
+        assert Interpreter(program).execute(visitor) == 1
+        assert program.functions['main'] not in visitor.generated
+
+    def test_error_note_points_at_bn_line(self):
+        program = parse('def f(a) {\n    return a + 1;\n}\ndef main() {\n    return f("a") - 1;\n}')
+        with pytest.raises(TypeError) as error:
+            Interpreter(program).execute(PythonExecutor())
+        assert str(error.value) == "Unsupported operand types for -: 'str' and 'int' at position: SourcePosition(line=5, column=22)"
+        assert error.value.__notes__ == ['BN position: line 5, column 5']
+
+    def test_code_cache(self, tmp_path):
+        cache_path = get_cache_path(tmp_path / 'program.bn', CODE_CACHE_SUFFIX)
+        string = 'def main() { i = 0; while (i < 10) { i = i + 1; } return i; }'
+        first = PythonExecutor(cache_path=cache_path)
+        assert Interpreter(parse(string)).execute(first) == 10
+        assert not first.loaded_from_cache
+        second = PythonExecutor(cache_path=cache_path)
+        assert Interpreter(parse(string)).execute(second) == 10
+        assert second.loaded_from_cache
+        third = PythonExecutor(cache_path=cache_path)
+        assert Interpreter(parse(string.replace('10', '20'))).execute(third) == 20
+        assert not third.loaded_from_cache
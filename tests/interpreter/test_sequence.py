@@ -0,0 +1,119 @@
+import io
+import pytest
+
+from interpreter.lexer.lexer import Lexer
+from interpreter.source.source import Source
+from interpreter.parser.parser import Parser
+from interpreter.interpreter import sequence, vectorize
+from interpreter.interpreter.engines import ENGINES, create_visitor
+from interpreter.interpreter.interpreter import Interpreter
+from interpreter.interpreter.sequence import Sequence
+
+NUMBERS = ', '.join(str(value) for value in range(100))
+
+
+def execute(string, engine='tree'):
+    program = Parser(Lexer(Source(io.StringIO(string)))).parse_program()
+    return Interpreter(program).execute(create_visitor(engine))
+
+
+@pytest.fixture
+def lambda_runs(monkeypatch):
+    runs = []
+    run_lambda = sequence.run_lambda
+    monkeypatch.setattr(sequence, 'run_lambda', lambda *args: runs.append(args[4]) or run_lambda(*args))
+    return runs
+
+
+class TestSequence:
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("string, expected", [
+        ('x = [1, 2, 3, 4]; return x.where($v => { v = v > 1; }).foreach($v => { v = v * 2; });', [4, 6, 8]),
+        ('x = [1, 2, 3, 4]; return x.foreach($v => { v = v * 10; }).take(2);', [10, 20]),
+        ('x = [5, 6, 7]; return x.where($v => { v = v > 5; }).first();', 6),
+        ('x = [5, 6, 7]; return x.any($v => { v = v == 6; });', True),
+        ('x = [5, 6, 7]; return x.where($v => { v = v > 9; }).any($v => { v = v > 0; });', False),
+        ('x = [1, 2]; y = x.where($v => { v = v > 1; }); append(y, 9); return get(y, 1);', 9),
+        ('x = [1, 2]; y = x.where($v => { v = v > 1; }); y = [7]; return y;', [7]),
+        ('x = [3, 1, 2]; y = x.foreach($v => { v = v + 1; }); sort(y); return y;', [2, 3, 4]),
+        ('x = [1, 2]; return x.take(5).where($v => { v = v > 1; }) + x.where($v => { v = v > 0; });', [2, 1, 2]),
+        ('x = [1, 2]; return x.where($v => { v = v > 1; }) == x.where($v => { v = v == 2; });', True),
+        ('x = [1, 2, 3]; return x.where($v => { v = v > 1; }) + [7];', [2, 3, 7]),
+        ('x = [1, 2, 3]; return [0] + x.foreach($v => { v = v * 2; });', [0, 2, 4, 6]),
+        ('x = [1, 2, 3]; return x.where($v => { v = v > 1; }) < [2, 4];', True),
+        ('x = [1, 2, 3]; return [3] >= x.foreach($v => { v = v + 1; });', True),
+        ('x = [1, 2]; y = x.take(0); if (y) { return 1; } return 2;', 2),
+        ('x = [1, 2, 3]; y = x.where($v => { v = v > 1; }); x = [7, 8, 9]; return y;', [2, 3]),
+        ('x = [1, 2, 3]; y = x.where($v => { v = v > 1; }); append(x, 5); remove(x, 0); return y;', [2, 3]),
+        ('x = [3, 1, 2]; y = x.foreach($v => { v = v * 2; }); sort(x); return y;', [6, 2, 4]),
+        ('x = [1, 2, 3]; y = x.where($v => { v = v > 1; }); z = y.take(1); append(y, 9); return [z.count(), y.count()];', [1, 3]),
+        ('x = [1, 2, 3]; y = x.where($v => { v = v > 1; }); z = y.take(5); sort(y); append(y, 0); return z;', [2, 3]),
+        ('x = [3, 2, 1]; y = x.where($v => { v = v > 1; }); n = y.count(); z = y.take(5); sort(y); append(y, 0); return [z, y];', [[3, 2], [2, 3, 0]]),
+        (f'x = [{NUMBERS}]; y = x.where($v => {{ v = v > 96; }}); append(x, 100); x = [1]; return y;', [97, 98, 99])])
+    def test_results(self, engine, string, expected):
+        assert execute(f'def main() {{ {string} }}', engine) == expected
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_expression_lambdas(self, engine, lambda_runs):
+        assert execute('def main() { x = [1, 2, 3]; y = x.where($v => v > 1).foreach($v => v * 2); return y.take(1); }',
+                       engine) == [2]
+        assert lambda_runs == [1, 2, 2]
+
+    def test_stages_fused_until_list_needed(self):
+        program = Parser(Lexer(Source(io.StringIO(
+            'def main() { x = [1, 2, 3]; return x.where($v => { v = v > 1; }).foreach($v => { v = v * 2; }).take(1); }'
+        )))).parse_program()
+        visitor = create_visitor('tree')
+        program.accept(visitor)
+        visitor.functions['main'].statements.statements[0].accept(visitor)
+        visitor.functions['main'].statements.statements[1].statement.accept(visitor)
+        result = visitor.last_result
+        assert type(result) is Sequence and result.items is None
+        assert [stage[0] for stage in result.stages] == [sequence.WHERE, sequence.FOREACH, sequence.TAKE]
+        assert result.value == [4]
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_first_stops_upstream(self, engine, lambda_runs):
+        assert execute(f'def main() {{ x = [{NUMBERS}]; return x.where($v => {{ v = v > 2; }}).first(); }}', engine) == 3
+        assert lambda_runs == [0, 1, 2, 3]
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_take_stops_upstream(self, engine, lambda_runs, monkeypatch):
+        monkeypatch.setattr(vectorize, 'MIN_VECTOR_LENGTH', 10 ** 9)
+        string = f'def main() {{ x = [{NUMBERS}]; y = x.where($v => {{ v = v > 10; }}).take(2); return y.foreach($v => {{ v = v + 100; }}); }}'
+        assert execute(string, engine) == [111, 112]
+        assert lambda_runs == list(range(12)) + [11, 12, 12]
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_lambdas_with_side_effects_run_immediately(self, engine, capsys):
+        assert execute('def main() { x = [5, 6]; y = x.foreach($v => { print(v); }); print(0); return 1; }', engine) == 1
+        assert capsys.readouterr().out == "5\n6\n0\n"
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_any_stops_at_first_match(self, engine, capsys):
+        assert execute('def main() { x = [5, 6, 7]; return x.any($v => { print(v); v = v == 6; }); }', engine) is True
+        assert capsys.readouterr().out == "5\n6\n"
+
+    def test_printed_as_list(self, capsys):
+        execute('def main() { x = [1, 2, 3]; print(x.foreach($v => { v = v * 3; })); }')
+        assert capsys.readouterr().out == "[3, 6, 9]\n"
+
+    def test_invalid_take_count(self):
+        with pytest.raises(RuntimeError, match='non-negative integer count'):
+            execute('def main() { x = [1]; y = x.take(-1); }')
+
+    def test_first_of_empty_list(self):
+        with pytest.raises(IndexError):
+            execute('def main() { x = [1]; return x.where($v => { v = v > 1; }).first(); }')
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_unsupported_operator_reports_list(self, engine):
+        with pytest.raises(TypeError, match="'list' and 'int'"):
+            execute('def main() { x = [1, 2, 3]; return x.where($v => { v = v > 1; }) * 2; }', engine)
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_error_reported_when_result_used(self, engine):
+        string = 'def main() { x = [1, 0, 2]; y = x.foreach($v => { v = 1 / v; }); %s }'
+        assert execute(string % 'return 5;', engine) == 5
+        with pytest.raises(RuntimeError, match='Division by zero'):
+            execute(string % 'return get(y, 0);', engine)
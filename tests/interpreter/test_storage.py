@@ -0,0 +1,120 @@
+import io
+import math
+import pytest
+from array import array
+
+from interpreter.lexer.lexer import Lexer
+from interpreter.source.source import Source
+from interpreter.parser.parser import Parser
+from interpreter.interpreter import storage
+from interpreter.interpreter.engines import ENGINES, create_visitor
+from interpreter.interpreter.interpreter import Array, Interpreter
+
+
+def execute(string, engine='tree'):
+    program = Parser(Lexer(Source(io.StringIO(string)))).parse_program()
+    return Interpreter(program).execute(create_visitor(engine))
+
+
+# wynik main z listami zamiast obiektow Array
+def plain(value):
+    if isinstance(value, Array):
+        value = value.to_list()
+    return [plain(item) for item in value] if isinstance(value, list) else value
+
+
+class TestStorage:
+    @pytest.mark.parametrize("values, typecode", [
+        (list(range(40)), 'q'),
+        ([index / 2 for index in range(40)], 'd'),
+        ([index % 3 == 0 for index in range(40)], 'b')])
+    def test_homogeneous_list_is_typed(self, values, typecode):
+        lst = Array(values, owned=True)
+        assert type(lst.storage) is array and lst.storage.typecode == typecode
+        assert lst.to_list() == values and [lst.get(index) for index in range(40)] == values
+        assert list(map(type, lst.to_list())) == list(map(type, values))
+
+    @pytest.mark.parametrize("values", [
+        list(range(10)),
+        list(range(39)) + [1.5],
+        list(range(39)) + [True],
+        list(range(39)) + [2 ** 63]])
+    def test_other_lists_stay_generic(self, values):
+        assert type(Array(values, owned=True).storage) is list
+
+    def test_list_not_owned_stays_generic(self):
+        values = list(range(40))
+        lst = Array(values)
+        lst.append(40)
+        assert lst.storage is values and values[-1] == 40
+
+    def test_append_switches_to_generic(self):
+        lst = Array([], owned=True)
+        lst.append(True)
+        lst.append(False)
+        assert lst.storage == array('b', [1, 0]) and lst.get(0) is True
+        lst.append(1)
+        assert type(lst.storage) is list and lst.to_list() == [True, False, 1]
+        lst = Array([], owned=True)
+        lst.append(2 ** 63 - 1)
+        lst.append(2 ** 63)
+        assert type(lst.storage) is list and lst.value == [2 ** 63 - 1, 2 ** 63]
+
+    def test_value_switches_to_generic(self):
+        lst = Array(list(range(40)), owned=True)
+        lst.value.append("a")
+        assert lst.to_list() == list(range(40)) + ["a"]
+
+    @pytest.mark.parametrize("values", [
+        [(index * 7919) % 101 - 50 for index in range(64)],
+        [0.0, -0.0, 1.5, -0.0, 0.0, -2.5] * 8,
+        [1.0, math.nan, -1.0, 3.0] * 10,
+        [index % 3 == 0 for index in range(40)]])
+    def test_sort_same_as_list(self, values):
+        lst = Array(list(values), owned=True)
+        assert type(lst.storage) is array
+        lst.sort()
+        expected = list(values)
+        expected.sort()
+        assert list(map(repr, lst.to_list())) == list(map(repr, expected))
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("string", [
+        'x = []; i = 0; while (i < 50) { append(x, 50 - i); i = i + 1; } sort(x); remove(x, 3); return [get(x, 3), x];',
+        'x = []; i = 0; while (i < 50) { append(x, i / 4); i = i + 1; } append(x, "a"); return x;',
+        'x = []; i = 0; while (i < 50) { append(x, i > 20); i = i + 1; } return [get(x, 30), sum(x), min(x), first(x)];',
+        'x = []; i = 0; while (i < 50) { append(x, i * 3); i = i + 1; } y = x.where($v => { v = v > 100; }); return [y, x.foreach($v => { v = v * 2; })];',
+        'x = []; i = 0; while (i < 50) { append(x, i); i = i + 1; } y = x.foreach($v => { print(v); }); return x.aggregate($p => { p = get(p, 0) + get(p, 1); });'])
+    def test_same_results_as_generic_storage(self, engine, string, monkeypatch, capsys):
+        program = f'def main() {{ {string} }}'
+        typed = plain(execute(program, engine))
+        typed_output = capsys.readouterr().out
+        monkeypatch.setattr(storage, 'TYPECODES', {})
+        monkeypatch.setattr('interpreter.interpreter.interpreter.TYPECODES', {})
+        generic = plain(execute(program, engine))
+        assert repr(typed) == repr(generic)
+        assert typed_output == capsys.readouterr().out
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("string, expected", [
+        ('m = [ONES, [1]]; row = m.get(0); row.append(99); r = m.get(0); return get(r, 32);', 99),
+        ('m = [ONES, [1]]; row = m.get(0); append(row, 2.5); sort(row); r = m.get(0); return get(r, 32);', 2.5),
+        ('m = [ONES]; f(m.get(0)); r = m.get(0); return get(r, 32);', 5),
+        ('m = [[], [1]]; row = m.get(0); append(row, 5); r = m.get(0); return get(r, 0);', 5)])
+    def test_nested_lists_are_not_copied(self, engine, string, expected):
+        ones = '[' + ', '.join(['1'] * 32) + ']'
+        assert execute(f'def f(a) {{ append(a, 5); }} def main() {{ {string.replace("ONES", ones)} }}', engine) == expected
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_only_assigned_literals_are_typed(self, engine, monkeypatch):
+        typed = []
+        to_typed = storage.to_typed
+        monkeypatch.setattr('interpreter.interpreter.interpreter.to_typed', lambda values: typed.append(values) or to_typed(values))
+        numbers = f'[{", ".join(map(str, range(40)))}]'
+        assert execute(f'def main() {{ x = {numbers}; m = [{numbers}]; r = m.get(0); return f(x); }} def f(a) {{ return a; }}',
+                       engine) == list(range(40))
+        assert typed == [list(range(40))]
+
+    def test_printed_like_before(self, capsys):
+        execute('def main() { x = []; append(x, 1); print(x); }')
+        assert capsys.readouterr().out.startswith('<interpreter.interpreter.interpreter.Array object at')
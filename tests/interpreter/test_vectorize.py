@@ -0,0 +1,122 @@
+import io
+import pytest
+
+from interpreter.lexer.lexer import Lexer
+from interpreter.source.source import Source
+from interpreter.parser.parser import Parser
+from interpreter.interpreter import vectorize
+from interpreter.interpreter.engines import ENGINES, create_visitor
+from interpreter.interpreter.interpreter import Interpreter
+
+INTS = list(range(-20, 40))
+FLOATS = [value / 4 for value in range(-30, 30)]
+BOOLS = [value % 3 == 0 for value in range(40)]
+MIXED = INTS[:20] + FLOATS[:20]
+BIG = [2 ** 62 - value for value in range(40)]
+INTS_BOOLS = [value if value % 2 else value % 4 == 0 for value in range(40)]
+
+
+def literal(item):
+    if isinstance(item, bool):
+        return 'true' if item else 'false'
+    if isinstance(item, str):
+        return f'"{item}"'
+    return repr(item)
+
+
+# cialo bez srednika na koncu jest wyrazeniem ($v => v > 1)
+def run(items, method, body, engine='tree'):
+    body = f'{{ {body} }}' if body.endswith(';') else body
+    string = f'def main() {{ x = [{", ".join(map(literal, items))}]; return x.{method}($v => {body}); }}'
+    program = Parser(Lexer(Source(io.StringIO(string)))).parse_program()
+    applied = []
+    evaluate = vectorize.evaluate
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(vectorize, 'evaluate', lambda *args: applied.append(result := evaluate(*args)) or result)
+        try:
+            result = Interpreter(program).execute(create_visitor(engine))
+        except Exception as error:
+            result = (type(error), str(error))
+    return result, any(value is not None for value in applied)
+
+
+def interpreted(items, method, body, monkeypatch):
+    with monkeypatch.context() as patch:
+        patch.setattr(vectorize, 'MIN_VECTOR_LENGTH', 10 ** 9)
+        return run(items, method, body)[0]
+
+
+def same(left, right):
+    return left == right and [type(item) for item in left] == [type(item) for item in right]
+
+
+class TestVectorize:
+    @pytest.mark.parametrize("body", [
+        'v = v > 10;',
+        'v = v * 2 - 3 >= 7;',
+        'v = v / 4 + 0.5;',
+        'v = -v;',
+        'v = !(v == 2);',
+        'v = v > 0 and v < 20 or v == -5;',
+        'v = v - v;',
+        'v = v * 1;',
+        'v = 10 / v;',
+        'v = v * 0.5 < 3;'])
+    @pytest.mark.parametrize("items", [INTS, FLOATS, BOOLS, MIXED, BIG], ids=['ints', 'floats', 'bools', 'mixed', 'big'])
+    @pytest.mark.parametrize("method", ['where', 'foreach'])
+    def test_same_results_as_interpreter(self, items, method, body, monkeypatch):
+        result, _ = run(items, method, body)
+        expected = interpreted(items, method, body, monkeypatch)
+        if isinstance(expected, list):
+            assert same(result, expected)
+        else:
+            assert result == expected
+
+    @pytest.mark.parametrize("length", [vectorize.MIN_VECTOR_LENGTH - 1, vectorize.MIN_VECTOR_LENGTH,
+                                        vectorize.MIN_VECTOR_LENGTH + 1])
+    @pytest.mark.parametrize("body", ['v = v;', 'v = !v;', 'v = v == true;', 'v = v + 1;', 'v = v and true;'])
+    @pytest.mark.parametrize("items", [BOOLS, INTS_BOOLS], ids=['bools', 'ints_bools'])
+    @pytest.mark.parametrize("method", ['where', 'foreach'])
+    def test_bool_items_keep_type(self, items, method, body, length, monkeypatch):
+        result, _ = run(items[:length], method, body)
+        expected = interpreted(items[:length], method, body, monkeypatch)
+        if isinstance(expected, list):
+            assert same(result, expected)
+        else:
+            assert result == expected
+
+    def test_bool_foreach_vectorized(self):
+        assert run(BOOLS, 'foreach', 'v = v;') == (BOOLS, True)
+        assert run(INTS_BOOLS, 'foreach', 'v = v;') == (INTS_BOOLS, False)
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_numeric_lambdas_vectorized(self, engine):
+        assert run(INTS, 'where', 'v = v > 10;', engine) == (list(range(11, 40)), True)
+        assert run(FLOATS, 'foreach', 'v = v * 2;', engine) == ([value * 2 for value in FLOATS], True)
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("length", [vectorize.MIN_VECTOR_LENGTH - 1, vectorize.MIN_VECTOR_LENGTH + 1])
+    def test_expression_lambdas(self, engine, length):
+        items = INTS[-length:]
+        vectorized = length >= vectorize.MIN_VECTOR_LENGTH
+        assert run(items, 'where', 'v > 10', engine) == ([item for item in items if item > 10], vectorized)
+        assert run(items, 'where', 'v * 0.5', engine) == ([item for item in items if item], vectorized)
+        # foreach zwraca zmienna lambdy, ktorej wyrazenie nie zmienia
+        assert run(items, 'foreach', 'v * 2', engine) == (items, vectorized)
+
+    @pytest.mark.parametrize("items, method, body", [
+        (INTS, 'where', 'print(v);'),
+        (INTS, 'where', 'w = v > 1;'),
+        (INTS, 'foreach', 'print(v > 1);'),
+        (INTS, 'where', 'v = v > 1; v = v;'),
+        (INTS, 'where', 'return v > 1;'),
+        (INTS, 'where', 'v = v + "a";'),
+        (['a'] * 40, 'where', 'v = v == "a";'),
+        (INTS[:10], 'where', 'v = v > 1;'),
+        (MIXED, 'foreach', 'v = v + 1;'),
+        (BIG, 'foreach', 'v = v * 4;'),
+        (INTS, 'foreach', 'v = v / (v - 3);')])
+    def test_falls_back_to_interpreter(self, items, method, body, monkeypatch):
+        result, vectorized = run(items, method, body)
+        assert result == interpreted(items, method, body, monkeypatch)
+        assert not vectorized
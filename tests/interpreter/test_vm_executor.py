@@ -0,0 +1,109 @@
+import io
+import random
+import pytest
+
+from interpreter.lexer.lexer import Lexer
+from interpreter.source.source import Source
+from interpreter.parser.parser import Parser
+from interpreter.interpreter.interpreter import Interpreter
+from interpreter.interpreter.bytecode import BytecodeCompiler, disassemble
+from interpreter.interpreter.interpreter_error import RecursionLimitExceeded
+from interpreter.interpreter.vmExecutor import VMExecutor
+from . import test_interpreter
+from .random_programs import ProgramGenerator, run_program
+
+
+def parse(string):
+    return Parser(Lexer(Source(io.StringIO(string)))).parse_program()
+
+
+# caly zestaw testow interpretera uruchamiany z VMExecutor w miejscu ExecuteVisitor
+class TestVMInterpreter(test_interpreter.TestInterpreter):
+    @pytest.fixture(autouse=True)
+    def vm_engine(self, monkeypatch):
+        monkeypatch.setattr(test_interpreter, 'ExecuteVisitor', VMExecutor)
+
+
+class TestVMExecutor:
+    def test_same_results_as_tree_walker(self):
+        generator = ProgramGenerator(random.Random(15))
+        for _ in range(1000):
+            string = generator.program()
+            assert run_program(string, 'vm') == run_program(string, 'tree'), string
+
+    @pytest.mark.parametrize("string", [
+        'def f(a) { return; } def main() { return f(5); }',
+        'def f(a) { x = 1; } def main() { return f(5) + 1; }',
+        'def main() { i = 0; while (i < 5) { i = i + 1; x = 0; } return i; }',
+        'def main() { i = 0; while (i < 5) { i = i + 1; if (i == 3) { break; } } return i; }',
+        'def main() { lst = [1, 2]; lst.where($v => { return; }); x = 1; return 2; }',
+        'def f() { return 7; } def main() { lst = [1, 2]; x = lst.where($v => { return; }) + f(); return 2; }',
+        'def main() { lst = [1, 2, 3]; return lst.where($v => { v = v > 1; }); }',
+        'def main() { lst = [1, 2]; return lst.where($v => { break; }); }',
+        'def main() { lst = [1, 2, 3]; return lst.where($v => v > 1); }',
+        'def main() { lst = [1, 2, 3]; return lst.foreach($v => v + 1); }',
+        'def main() { lst = [1, 2, 3]; x = lst.where($v => v / 0); return 1; }',
+        'def main() { x = 1; x = [1, 2]; }',
+        'def main() { if (0) { x = 1; } }',
+        'def main() { break; }',
+        'def main() { x = 1 / 0; }',
+        'def main() { return -"a"; }',
+        'def main() { x = -("a" + 1); }',
+        'def main() { return y + f(); } def f() { print(1); }',
+        'def f(n) { return f(n + 1); } def main() { return f(0); }',
+        'def f(n) { x = -g(n); } def g(n) { y = 1 / n; } def main() { return f(0); }',
+        'def main() { return f(1, ); } def f(a) { return a; }',
+        'def main() { return f(1, 2); } def f(a) { return a; }'])
+    def test_same_semantics(self, string):
+        assert run_program(string, 'vm') == run_program(string, 'tree')
+
+    def test_recursion_does_not_use_python_stack(self):
+        program = parse('def f(n) { if (n == 0) { return 0; } return f(n - 1) + 1; } def main() { return f(20000); }')
+        assert Interpreter(program).execute(VMExecutor(recursion_limit=30000)) == 20000
+
+    def test_recursion_limit(self):
+        visitor = VMExecutor(recursion_limit=50)
+        program = parse('def f(n) { return f(n + 1); } def main() { return f(0); }')
+        with pytest.raises(RecursionLimitExceeded):
+            Interpreter(program).execute(visitor)
+        assert visitor.recursion_depth == 0
+
+    def test_tail_call_reuses_frame(self, monkeypatch):
+        stacks, sizes = [], []
+        dispatch, create_frame = VMExecutor.dispatch, VMExecutor.create_frame
+        monkeypatch.setattr(VMExecutor, 'dispatch', lambda self, frames: stacks.append(frames) or dispatch(self, frames))
+        monkeypatch.setattr(VMExecutor, 'create_frame',
+                            lambda self, *args: sizes.append(len(stacks[-1]) if stacks else 0) or create_frame(self, *args))
+        program = parse('def f(n, acc) { if (n == 0) { return acc; } return f(n - 1, acc + n); } '
+                        'def main() { x = f(100000, 0); return x + 1; }')
+        visitor = VMExecutor(recursion_limit=200000)
+        assert Interpreter(program).execute(visitor) == 5000050001
+        assert visitor.recursion_depth == 0
+        assert max(sizes) == 2
+
+    def test_tail_call_in_lambda_is_regular_call(self):
+        program = parse('def f(a) { return a; } def main() { lst = [1, 2]; return lst.foreach($v => { return f(v); }); }')
+        lambda_body = program.functions['main'].statements.statements[1].statement.arguments.statements
+        code = BytecodeCompiler().compile_lambda_body(lambda_body)
+        assert 'TAIL_CALL' not in [name for name, _ in disassemble(code)]
+
+    def test_expression_lambda_body(self):
+        program = parse('def main() { lst = [1, 2]; return lst.foreach($v => v + 1); }')
+        lambda_body = program.functions['main'].statements.statements[1].statement.arguments.statements
+        visitor = VMExecutor()
+        assert Interpreter(program).execute(visitor) == [1, 2]
+        assert disassemble(visitor.codes[lambda_body]) == [
+            ('LOAD_NAME', 0), ('BINARY_CONST', 1), ('SET_RESULT', 0), ('RETURN', 2)]
+
+    def test_disassemble(self):
+        program = parse('def f(a) { b = a + 1; return b * a; } def main() { return f(1); }')
+        code = BytecodeCompiler(check_return_flag=False).compile_function(program.functions['f'])
+        assert code.instructions.typecode == 'i'
+        assert disassemble(code) == [
+            ('BINARY_FAST_CONST', 0), ('ASSIGN_LOCAL', 1), ('LOAD_FAST', 1), ('LOAD_FAST', 0),
+            ('BINARY', 1), ('SET_RESULT', 0), ('RETURN', 0), ('RETURN', 0)]
+        assert code.constants[0][0] == 0 and code.constants[0][2] == 1
+        main = BytecodeCompiler(check_return_flag=False).compile_function(program.functions['main'])
+        assert disassemble(main) == [
+            ('ENTER_CALL', 1), ('LOAD_CONST', 0), ('BUILD_LIST', 1), ('TAIL_CALL', 1),
+            ('SET_RESULT', 0), ('RETURN', 0), ('RETURN', 0)]
@@ -0,0 +1,83 @@
+import io
+import os
+import random
+import pytest
+
+from interpreter.lexer.lexer import Lexer, tokens_generator
+from interpreter.lexer.fast_lexer import FastLexer
+from interpreter.lexer.error import LexerError
+from interpreter.source.source import Source, BufferedSource
+from interpreter.tokens.token import TokenType
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+FRAGMENTS = [
+    'def', 'main', 'x1', 'żółw', 'a²', 'b٣', 'if', 'else', 'while', 'return', 'true', 'and',
+    '12', '٣4', '3.14', '7.', '1.a', '2.;', '99999999999999999999', '123456789.1234567891234567',
+    '"abc"', '"a\\nb"', '"x\\qy"', '"zła', '"\\\\"', '"multi\nline"',
+    '+', '-', '*', '/', '(', ')', '{', '}', '[', ']', ';', ',', '.', '$', '=>',
+    '=', '==', '!', '!=', '<', '<=', '>', '>=', '<>', '#komentarz', '_', '@', '€',
+    ' ', '  ', '\n', '\r\n', '\t', '\r', ' ',
+]
+
+
+def lex(lexer_class, string, **limits):
+    try:
+        tokens = list(tokens_generator(lexer_class(Source(io.StringIO(string)), **limits)))
+        return [(token.type, token.value, token.position.line, token.position.column) for token in tokens]
+    except LexerError as error:
+        return str(error)
+
+
+class TestFastLexer:
+    @pytest.mark.parametrize("name", sorted(name for name in os.listdir(DATA_DIR) if name.endswith('.bn')))
+    def test_same_tokens_for_example_programs(self, name):
+        with open(os.path.join(DATA_DIR, name)) as file:
+            string = file.read()
+        assert lex(FastLexer, string) == lex(Lexer, string)
+
+    def test_same_tokens_for_random_fragments(self):
+        generator = random.Random(2024)
+        for _ in range(2000):
+            string = ''.join(generator.choice(FRAGMENTS) for _ in range(generator.randint(1, 12)))
+            assert lex(FastLexer, string) == lex(Lexer, string), string
+
+    @pytest.mark.parametrize("window_size", [1, 2, 5])
+    def test_same_tokens_with_small_window(self, window_size):
+        generator = random.Random(2026)
+        for _ in range(500):
+            string = ''.join(generator.choice(FRAGMENTS) for _ in range(generator.randint(1, 20)))
+            assert lex(FastLexer, string, window_size=window_size) == lex(Lexer, string), string
+
+    def test_same_tokens_without_comments(self):
+        generator = random.Random(2025)
+        for _ in range(500):
+            string = ''.join(generator.choice(FRAGMENTS) for _ in range(generator.randint(1, 12)))
+            assert lex(FastLexer, string, skip_comments=True) == lex(Lexer, string, skip_comments=True), string
+
+    @pytest.mark.parametrize("string", [
+        'abcdef', 'abcde', 'abcdeż', '"abcdef"', '"abcde"', '"ab\\ncdef"', '"ab\\qcdef"',
+        '123456', '12345', '1.123456', '1.12345'])
+    def test_same_limits(self, string):
+        limits = {'max_iden': 5, 'max_string': 5, 'max_int': 99999, 'max_float': 5}
+        assert lex(FastLexer, string, **limits) == lex(Lexer, string, **limits)
+
+    def test_eof_is_repeated(self):
+        lexer = FastLexer(Source(io.StringIO('x')))
+        assert lexer.get_next_token().type == TokenType.ID
+        assert lexer.get_next_token().type == TokenType.EOF
+        assert lexer.get_next_token().type == TokenType.EOF
+
+    @pytest.mark.parametrize("window_size", [2, 1000])
+    def test_buffered_source(self, window_size):
+        string = 'def main() {\r\n x = "ab";\r\n}'
+        tokens = list(tokens_generator(FastLexer(BufferedSource(io.StringIO(string), buffer_size=3), window_size=window_size)))
+        assert tokens == list(tokens_generator(Lexer(Source(io.StringIO(string)))))
+
+    def test_reads_source_in_chunks(self):
+        string = 'x = 1;\n' * 1000
+        source = Source(io.StringIO(string))
+        lexer = FastLexer(source, window_size=100)
+        assert len(lexer._text) < 200
+        tokens = list(tokens_generator(lexer))
+        assert tokens == list(tokens_generator(Lexer(Source(io.StringIO(string)))))
@@ -17,6 +17,13 @@ class TestEverySingleToken:
         token = self._get_token('#Super jest')
         assert token.type == TokenType.COMMENT
     
+    def test_skip_comments(self):
+        lexer = Lexer(Source(io.StringIO('#Super jest\n  #drugi\nx')), skip_comments=True)
+        token = lexer.get_next_token()
+        assert token.type == TokenType.ID
+        assert token.position == SourcePosition(3, 1)
+        assert lexer.get_next_token().type == TokenType.EOF
+
     def test_integer(self):
         token = self._get_token('123')
         assert token.type == TokenType.INT_VALUE
@@ -265,6 +272,14 @@ class TestEverySingleToken:
         with pytest.raises(LexerError) as exc_info:
             self._get_token('_')
 
+    def test_error_message_position(self):
+        src = Source(io.StringIO('x = 1;\n  y = _;'))
+        lexer = Lexer(src)
+        with pytest.raises(LexerError) as exc_info:
+            while lexer.get_next_token().type != TokenType.EOF:
+                pass
+        assert str(exc_info.value) == "Can't match any token\nin line: 2\ncolumn: 7"
+
     @staticmethod
     def _get_token(string: str) -> Token:
         src = Source(io.StringIO(string))
@@ -0,0 +1,89 @@
+import io
+import os
+import pickle
+import pytest
+
+from interpreter.lexer.lexer import Lexer, tokens_generator
+from interpreter.lexer.fast_lexer import FastLexer
+from interpreter.lexer.error import LexerError
+from interpreter.parser.parser import Parser
+from interpreter.parser.pratt_parser import PrattParser
+from interpreter.source.source import Source
+from interpreter.source.source_position import SourcePosition
+from interpreter.tokens import token_buffer
+from interpreter.tokens.token_type import TokenType
+from tests.parser.tree_dump import dump_tree
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+PROGRAM = """from student import Student;
+# komentarz
+def main() {
+    x = 1; y = 1.0; z = true; s = "x";
+    lst = [1, 2, 3];
+    b = lst.where($a => a > 1);
+    return x + y;
+}
+"""
+
+
+class TestTokenBuffer:
+    @pytest.mark.parametrize("lexer_class", [Lexer, FastLexer])
+    def test_same_tokens_as_lexer(self, lexer_class):
+        buffer = self._get_buffer(PROGRAM, lexer_class)
+        expected = list(tokens_generator(Lexer(Source(io.StringIO(PROGRAM)))))
+        assert len(buffer) == len(expected)
+        assert [buffer.get_token(index) for index in range(len(buffer))] == expected
+        assert buffer.get_type(len(buffer) - 1) == TokenType.EOF
+
+    def test_values_are_interned(self):
+        buffer = self._get_buffer('x = x + "a" + "a";')
+        assert buffer.values == [None, 'x', 'a']
+        assert buffer.value_ids[0] == buffer.value_ids[2]
+
+    def test_values_of_different_types_are_not_merged(self):
+        buffer = self._get_buffer('1 1.0 "1"')
+        assert [buffer.get_value(index) for index in range(3)] == [1, 1.0, '1']
+        assert isinstance(buffer.get_value(0), int) and isinstance(buffer.get_value(1), float)
+
+    def test_lexer_error_is_raised(self):
+        with pytest.raises(LexerError):
+            self._get_buffer('x = _;')
+
+    def test_cursor_returns_eof_after_end(self):
+        cursor = self._get_buffer('a b').cursor(0, 1)
+        assert cursor.advance() == TokenType.ID
+        assert cursor.get_value() == 'a'
+        assert cursor.advance() == TokenType.EOF
+        assert cursor.get_value() is None
+        assert cursor.get_position() == SourcePosition(1, 3)
+        assert cursor.tell() == 1
+
+    @pytest.mark.parametrize("name", ["example1.bn", "example2.bn", "example5.bn", "student.bn"])
+    def test_parser_reads_cursor(self, name):
+        with open(os.path.join(DATA_DIR, name)) as file:
+            string = file.read()
+        expected = Parser(Lexer(Source(io.StringIO(string)))).parse_program()
+        program = Parser(self._get_buffer(string).cursor()).parse_program()
+        assert dump_tree(program) == dump_tree(expected)
+
+    @pytest.mark.parametrize("parser_class", [Parser, PrattParser])
+    def test_parser_creates_no_tokens(self, parser_class, monkeypatch):
+        buffer = self._get_buffer(PROGRAM)
+        positions = []
+        position_class = token_buffer.OffsetPosition
+        monkeypatch.setattr(token_buffer, 'Token', None)
+        monkeypatch.setattr(token_buffer, 'OffsetPosition', lambda *args: positions.append(1) or position_class(*args))
+        parser_class(buffer.cursor()).parse_program()
+        assert len(positions) < len(buffer) / 2
+
+    def test_pickle(self):
+        buffer = pickle.loads(pickle.dumps(self._get_buffer(PROGRAM)))
+        assert dump_tree(Parser(buffer.cursor()).parse_program()) == \
+            dump_tree(Parser(FastLexer(Source(io.StringIO(PROGRAM)))).parse_program())
+        buffer.append(TokenType.ID, 'x', 0)
+        assert buffer.values.count('x') == 1
+
+    @staticmethod
+    def _get_buffer(string, lexer_class=FastLexer):
+        return lexer_class(Source(io.StringIO(string))).tokenize_all()
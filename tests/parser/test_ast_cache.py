@@ -0,0 +1,113 @@
+import os
+import pytest
+
+from interpreter.lexer.fast_lexer import FastLexer
+from interpreter.parser.parser import Parser
+from interpreter.parser.syntax_error import ParsingError
+from interpreter.parser import ast_cache
+from interpreter.parser.ast_cache import load_program, get_cache_path
+from interpreter.parser.optimizer import optimize_program
+from interpreter.source.mapped_source import MemoryMappedSource
+from .tree_dump import dump_tree
+
+PROGRAM = 'def main() {\r\n # komentarz\n x = [1, 2.5, "ż"]; y = x.where($a => { a = a > 1; }); return f(x);\n}'
+
+
+class CountingParser:
+    def __init__(self):
+        self.calls = 0
+        self.sources = []
+
+    def __call__(self, source):
+        self.calls += 1
+        self.sources.append(type(source))
+        return Parser(FastLexer(source)).parse_program()
+
+
+class TestAstCache:
+    def test_hit_skips_parsing(self, tmp_path):
+        path = self._write(tmp_path, PROGRAM)
+        parse = CountingParser()
+        first = load_program(path, parse)
+        assert os.path.exists(get_cache_path(path))
+        second = load_program(path, parse)
+        assert parse.calls == 1
+        assert dump_tree(second) == dump_tree(first)
+
+    @pytest.mark.parametrize("use_cache", [True, False])
+    def test_parses_mapped_file(self, tmp_path, use_cache):
+        parse = CountingParser()
+        load_program(self._write(tmp_path, PROGRAM), parse, use_cache=use_cache)
+        assert parse.sources == [MemoryMappedSource]
+
+    def test_cached_positions(self, tmp_path):
+        path = self._write(tmp_path, PROGRAM)
+        load_program(path, CountingParser())
+        program = load_program(path, CountingParser())
+        statement = program.functions['main'].statements.statements[1]
+        assert (statement.position.line, statement.position.column) == (3, 21)
+
+    def test_changed_source_is_parsed_again(self, tmp_path):
+        path = self._write(tmp_path, PROGRAM)
+        parse = CountingParser()
+        load_program(path, parse)
+        self._write(tmp_path, 'def other() { return 1; }')
+        program = load_program(path, parse)
+        assert parse.calls == 2
+        assert list(program.functions) == ['other']
+
+    def test_new_version_is_parsed_again(self, tmp_path, monkeypatch):
+        path = self._write(tmp_path, PROGRAM)
+        parse = CountingParser()
+        load_program(path, parse)
+        monkeypatch.setattr(ast_cache, '__version__', 'next')
+        load_program(path, parse)
+        assert parse.calls == 2
+
+    def test_other_options_are_parsed_again(self, tmp_path):
+        path = self._write(tmp_path, PROGRAM)
+        parse = CountingParser()
+        load_program(path, parse, options='plain')
+        load_program(path, parse, options='plain')
+        load_program(path, parse, options='optimize')
+        assert parse.calls == 2
+
+    def test_other_parse_function_is_parsed_again(self, tmp_path):
+        path = self._write(tmp_path, PROGRAM)
+        parse = CountingParser()
+        load_program(path, parse)
+
+        def optimized(source):
+            return optimize_program(parse(source))
+        load_program(path, optimized)
+        load_program(path, optimized)
+        assert parse.calls == 2
+
+    @pytest.mark.parametrize("content", [b'', b'garbage', b'\x80\x05K\x01.'])
+    def test_corrupt_entry_falls_back_to_parsing(self, tmp_path, content):
+        path = self._write(tmp_path, PROGRAM)
+        parse = CountingParser()
+        expected = dump_tree(load_program(path, parse))
+        with open(get_cache_path(path), 'wb') as file:
+            file.write(content)
+        assert dump_tree(load_program(path, parse)) == expected
+        assert parse.calls == 2
+        assert dump_tree(load_program(path, parse)) == expected
+        assert parse.calls == 2
+
+    def test_syntax_error_is_not_cached(self, tmp_path):
+        path = self._write(tmp_path, 'def main() { x = ; }')
+        with pytest.raises(ParsingError):
+            load_program(path, CountingParser())
+        assert not os.path.exists(get_cache_path(path))
+
+    def test_without_cache(self, tmp_path):
+        path = self._write(tmp_path, PROGRAM)
+        load_program(path, CountingParser(), use_cache=False)
+        assert not os.path.exists(get_cache_path(path))
+
+    @staticmethod
+    def _write(tmp_path, string):
+        path = tmp_path / "program.bn"
+        path.write_bytes(string.encode('utf-8'))
+        return str(path)
@@ -0,0 +1,111 @@
+import io
+import os
+import pytest
+
+from interpreter.lexer.lexer import Lexer
+from interpreter.lexer.fast_lexer import FastLexer
+from interpreter.source.source import Source
+from interpreter.parser.parser import Parser
+from interpreter.parser.pratt_parser import PrattParser
+from interpreter.parser.syntax_error import *
+from interpreter.parser.syntax_tree import *
+from interpreter.interpreter.executeVisitor import ExecuteVisitor
+from interpreter.interpreter.interpreter import Interpreter
+from .tree_dump import dump_tree
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+PROGRAM = '''
+def used(x) { # komentarz
+    if (x > 1) { while (x) { break; } }
+    return x * 2;
+}
+def unused() { y = ; }
+def main() { return used(21); }
+'''
+
+
+def parse_error(parser):
+    with pytest.raises(ParsingError) as exc_info:
+        parser.parse_program()
+    return type(exc_info.value), str(exc_info.value)
+
+
+class TestLazyFunctions:
+    @pytest.mark.parametrize("parser_class", [Parser, PrattParser])
+    @pytest.mark.parametrize("name", sorted(name for name in os.listdir(DATA_DIR) if name.endswith('.bn') and name != 'test_source.bn'))
+    def test_same_bodies_as_eager_parser(self, name, parser_class):
+        with open(os.path.join(DATA_DIR, name)) as file:
+            string = file.read()
+        eager = parser_class(Lexer(Source(io.StringIO(string)))).parse_program()
+        lazy = parser_class(FastLexer(Source(io.StringIO(string))), lazy_functions=True).parse_program()
+        assert list(lazy.functions) == list(eager.functions)
+        for function_name, function in lazy.functions.items():
+            assert isinstance(function, LazyFunctionDefinition)
+            assert not function.is_parsed()
+            expected = eager.functions[function_name]
+            assert (function.position, function.parameters) == (expected.position, expected.parameters)
+            assert dump_tree(function.statements) == dump_tree(expected.statements)
+            assert function.is_parsed()
+
+    def test_body_is_parsed_on_first_call(self):
+        program = self._get_parser('def used() { return 42; } def unused() { return 1; } def main() { return used(); }').parse_program()
+        assert Interpreter(program).execute(ExecuteVisitor()) == 42
+        assert program.functions['main'].is_parsed()
+        assert program.functions['used'].is_parsed()
+        assert not program.functions['unused'].is_parsed()
+
+    def test_syntax_error_in_unused_function(self):
+        parser = self._get_parser('def unused() { y = ; } def main() { return 0; }')
+        program = parser.parse_program()
+        assert Interpreter(program).execute(ExecuteVisitor()) == 0
+        with pytest.raises(InvalidVariableAssignment) as exc_info:
+            parser.validate_program(program)
+        eager = parse_error(Parser(Lexer(Source(io.StringIO('def unused() { y = ; } def main() { return 0; }')))))
+        assert (type(exc_info.value), str(exc_info.value)) == eager
+
+    def test_syntax_error_when_called(self):
+        program = self._get_parser('def main() { return broken(); } def broken() { return [1, 2; }').parse_program()
+        with pytest.raises(ParsingError):
+            Interpreter(program).execute(ExecuteVisitor())
+
+    def test_empty_body(self):
+        parser = self._get_parser('def main() {} def other() { return 1; }')
+        program = parser.parse_program()
+        with pytest.raises(EmptyBlockOfStatements):
+            parser.validate_program(program)
+
+    def test_validate_program(self):
+        parser = self._get_parser(PROGRAM)
+        program = parser.parse_program()
+        with pytest.raises(InvalidVariableAssignment):
+            parser.validate_program(program)
+        assert program.functions['used'].is_parsed()
+
+    @pytest.mark.parametrize("string", [
+        'def main() { return 0; ', 'def main() { if (x) { return 0; }', 'def main() { return 0; } }',
+        'def main() return 0; }', 'def main() { return 0; } def main() { return 1; }'])
+    def test_same_errors_as_eager_parser(self, string):
+        assert parse_error(self._get_parser(string)) == parse_error(Parser(Lexer(Source(io.StringIO(string)))))
+
+    def test_skipping_bodies_reads_each_token_once(self):
+        class CountingTypes(list):
+            reads = 0
+
+            def __getitem__(self, index):
+                CountingTypes.reads += len(range(len(self))[index]) if isinstance(index, slice) else 1
+                return super().__getitem__(index)
+
+        string = ' '.join(f'def f{index}(x) {{ if (x) {{ return x; }} return {index}; }}' for index in range(200))
+        buffer = FastLexer(Source(io.StringIO(string + ' def main() { return 0; }'))).tokenize_all()
+        parser = Parser(buffer.cursor(), lazy_functions=True)
+        buffer.types = CountingTypes(buffer.types)
+        program = parser.parse_program()
+        assert len(program.functions) == 201
+        assert CountingTypes.reads <= len(buffer)
+
+    @staticmethod
+    def _get_parser(string: str) -> Parser:
+        src = Source(io.StringIO(string))
+        lexer = Lexer(src)
+        return Parser(lexer, lazy_functions=True)
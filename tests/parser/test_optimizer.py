@@ -0,0 +1,126 @@
+import io
+import os
+import random
+import pytest
+
+from interpreter.lexer.lexer import Lexer
+from interpreter.source.source import Source
+from interpreter.parser.parser import Parser
+from interpreter.parser.optimizer import ConstantFolder, optimize_program, MAX_FOLDED_STRING
+from interpreter.parser.syntax_tree import *
+from interpreter.interpreter.executeVisitor import ExecuteVisitor
+from interpreter.interpreter.interpreter import Interpreter
+
+LITERALS = ['0', '1', '7', '2.5', '0.0', '"a"', '""', 'true', 'false', 'x', '[1, 2]']
+OPERATORS = ['+', '-', '*', '/', '==', '!=', '<', '<=', '>', '>=', 'and', 'or']
+
+
+def random_expression(generator, depth=3):
+    if depth == 0 or generator.random() < 0.3:
+        return generator.choice(LITERALS)
+    if generator.random() < 0.15:
+        return generator.choice(['!', '-']) + f'({random_expression(generator, depth - 1)})'
+    left = random_expression(generator, depth - 1)
+    right = random_expression(generator, depth - 1)
+    return f'({left} {generator.choice(OPERATORS)} {right})'
+
+
+def random_statements(generator, depth=2, in_loop=False):
+    statements = []
+    for _ in range(generator.randint(1, 4)):
+        kind = generator.random()
+        if depth == 0 or kind < 0.3:
+            statements.append(f'x = {random_expression(generator)};')
+        elif kind < 0.4:
+            statements.append(f'({random_expression(generator)})')
+        elif kind < 0.65:
+            else_branch = f' else {{ {random_statements(generator, depth - 1, in_loop)} }}' if generator.random() < 0.5 else ''
+            statements.append(f'if ({random_expression(generator, 1)}) {{ {random_statements(generator, depth - 1, in_loop)} }}{else_branch}')
+        elif kind < 0.8:
+            statements.append(f'while (i < 3) {{ i = i + 1; {random_statements(generator, depth - 1, True)} }}')
+        elif kind < 0.9 or not in_loop and generator.random() < 0.8:
+            statements.append(generator.choice(['return;', f'return {random_expression(generator, 1)};']))
+        else:
+            statements.append('break;')
+    return ' '.join(statements)
+
+
+def execute(string, optimize):
+    try:
+        program = Parser(Lexer(Source(io.StringIO(string)))).parse_program()
+        if optimize:
+            program = optimize_program(program)
+        return Interpreter(program).execute(ExecuteVisitor())
+    except Exception as error:
+        return type(error), str(error)
+
+
+class TestConstantFolder:
+    @pytest.mark.parametrize("expression, expected", [
+        ('1 + 2 * 3', 7), ('1 + 2.5', 3.5), ('"a" + 1', 'a1'), ('1 + "a"', '1a'), ('"ab" * 2', 'abab'),
+        ('true + true', 2), ('7 / 2', 3.5), ('-(2 - 5)', 3), ('!0', True), ('!"a"', False),
+        ('1 < 2', True), ('"a" == "a"', True), ('2.5 >= 3', False), ('(1 + 1) != 2', False)])
+    def test_folds_literals(self, expression, expected):
+        result = self._optimize_expression(expression)
+        assert isinstance(result, (LiteralBool, LiteralInt, LiteralFloat, LiteralString))
+        assert type(result.value) == type(expected) and result.value == expected
+
+    @pytest.mark.parametrize("expression", ['1 / 0', '"a" - 1', '"a" * 2.5', '-"a"', '"a" < 1', 'x + 1', '[1] + [2]', 'f(1 + 2)'])
+    def test_keeps_expressions_that_are_not_constant(self, expression):
+        result = self._optimize_expression(expression)
+        assert not isinstance(result, (LiteralBool, LiteralInt, LiteralFloat, LiteralString))
+
+    def test_folds_arguments_and_items(self):
+        result = self._optimize_expression('f(1 + 2, [2 * 3, x])')
+        assert result.arguments.arguments[0].value == 3
+        assert result.arguments.arguments[1].items[0].value == 6
+
+    def test_long_string_is_not_folded(self):
+        result = self._optimize_expression(f'"a" * {MAX_FOLDED_STRING + 1}')
+        assert isinstance(result, MulExpression)
+
+    def test_prunes_constant_if(self):
+        statements = self._optimize_statements('{ if (1 < 2) { x = 1; y = 2; } else { x = 3; } z = 4; }')
+        assert [type(statement) for statement in statements] == [Assignment, Assignment, Assignment]
+        assert statements[0].value.value == 1
+
+    def test_prunes_constant_else(self):
+        statements = self._optimize_statements('{ if (false) { x = 1; } else { x = 3; } }')
+        assert len(statements) == 1 and statements[0].value.value == 3
+
+    def test_untaken_if_leaves_condition(self):
+        statements = self._optimize_statements('{ if (0) { x = 1; } }')
+        assert len(statements) == 1 and isinstance(statements[0], LiteralInt)
+
+    def test_taken_if_keeps_condition_before_return(self):
+        statements = self._optimize_statements('{ if ("a") { return; } }')
+        assert isinstance(statements[0], LiteralString) and isinstance(statements[1], ReturnStatement)
+
+    def test_drops_statements_after_return_and_break(self):
+        folder = ConstantFolder()
+        statements = self._optimize_statements('{ while (x) { break; x = 1; } return x; y = 2; z = 3; }', folder)
+        assert len(statements) == 2
+        assert len(statements[0].statements.statements) == 1
+        assert folder.removed_statements == 3
+
+    @pytest.mark.parametrize("name", ['example1.bn', 'example5.bn', 'student.bn'])
+    def test_same_results_for_example_programs(self, name):
+        with open(os.path.join(os.path.dirname(__file__), '..', 'data', name)) as file:
+            string = file.read()
+        assert execute(string, True) == execute(string, False)
+
+    def test_same_results_for_random_programs(self):
+        generator = random.Random(11)
+        for _ in range(1000):
+            string = f'def main() {{ x = 1; i = 0; {random_statements(generator)} }}'
+            assert execute(string, True) == execute(string, False), string
+
+    @staticmethod
+    def _optimize_expression(string: str):
+        parser = Parser(Lexer(Source(io.StringIO(string))))
+        return ConstantFolder().optimize(parser.parse_or_expression())
+
+    @staticmethod
+    def _optimize_statements(string: str, folder=None):
+        parser = Parser(Lexer(Source(io.StringIO(string))))
+        return (folder or ConstantFolder()).optimize(parser.parse_statements()).statements
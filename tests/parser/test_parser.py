@@ -28,6 +28,10 @@ class TestParser:
             assert parser.current_token.type == type
             parser.consume_token()
     
+    def test_consume_token_with_many_comments(self):
+        parser = self._get_parser('#komentarz\n' * 5000 + 'x = 10;')
+        assert parser.current_token.type == TokenType.ID
+
     def test_try_consume(self):
         parser = self._get_parser('x = 10;')
         token = parser.try_consume(TokenType.ID)
@@ -115,6 +119,12 @@ class TestParser:
         assert len(result.parameters) == 2
         assert isinstance(result.statements.statements[0], ReturnStatement)
     
+    def test_syntax_error_position(self):
+        parser = TestParser._get_parser('def main() {\n    x = ;\n}')
+        with pytest.raises(InvalidVariableAssignment) as exc_info:
+            parser.parse_program()
+        assert str(exc_info.value).startswith("SyntaxError at position: line: 2, col: 9.")
+
     @staticmethod
     def _get_parser(string: str) -> Parser:
         src = Source(io.StringIO(string))
@@ -0,0 +1,80 @@
+import io
+import os
+import random
+import pytest
+
+from interpreter.lexer.lexer import Lexer
+from interpreter.source.source import Source
+from interpreter.parser.parser import Parser
+from interpreter.parser.pratt_parser import PrattParser
+from interpreter.parser.syntax_error import ParsingError
+from .tree_dump import dump_tree
+from . import test_and_expression, test_arth_expression, test_factor, test_function, test_logic_expression
+from . import test_or_expression, test_parser, test_program, test_statements, test_term
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+FRAGMENTS = [
+    'x', 'y', 'f()', 'g(1, x)', 'a.b', 'a.f(2)', '1', '2.5', '"s"', 'true', 'false', '[1, x]', '[]',
+    '+', '-', '*', '/', '==', '!=', '<', '<=', '>', '>=', 'and', 'or', '!', '(', ')', ',',
+]
+
+
+def _get_pratt_parser(string: str) -> Parser:
+    return PrattParser(Lexer(Source(io.StringIO(string))))
+
+
+# cale zestawy testow parsera uruchamiane ponownie z PrattParser (moduly, zeby pytest nie zbieral klas bazowych drugi raz)
+class TestPrattParser(test_parser.TestParser):
+    _get_parser = staticmethod(_get_pratt_parser)
+
+class TestPrattParseProgram(test_program.TestParseProgram):
+    _get_parser = staticmethod(_get_pratt_parser)
+
+class TestPrattParseParameters(test_function.TestParseParameters):
+    _get_parser = staticmethod(_get_pratt_parser)
+
+class TestPrattParseStatements(test_statements.TestParseStatements):
+    _get_parser = staticmethod(_get_pratt_parser)
+
+class TestPrattParseOrExpression(test_or_expression.TestParseOrExpression):
+    _get_parser = staticmethod(_get_pratt_parser)
+
+class TestPrattParseAndExpression(test_and_expression.TestParseandExpression):
+    _get_parser = staticmethod(_get_pratt_parser)
+
+class TestPrattParseLogicExpression(test_logic_expression.TestParseLogicExpression):
+    _get_parser = staticmethod(_get_pratt_parser)
+
+class TestPrattParseArthExpression(test_arth_expression.TestParseArthExpression):
+    _get_parser = staticmethod(_get_pratt_parser)
+
+class TestPrattParseTerm(test_term.TestParseTerm):
+    _get_parser = staticmethod(_get_pratt_parser)
+
+class TestPrattParseFactor(test_factor.TestParseFactor):
+    _get_parser = staticmethod(_get_pratt_parser)
+
+
+def parse(parser_class, string, method='parse_program'):
+    try:
+        parser = parser_class(Lexer(Source(io.StringIO(string))))
+        return dump_tree(getattr(parser, method)()), parser.current_token.type
+    except ParsingError as error:
+        return type(error).__name__, str(error)
+
+
+class TestSameTrees:
+    @pytest.mark.parametrize("name", sorted(name for name in os.listdir(DATA_DIR) if name.endswith('.bn')))
+    def test_example_programs(self, name):
+        with open(os.path.join(DATA_DIR, name)) as file:
+            string = file.read()
+        assert parse(PrattParser, string) == parse(Parser, string)
+
+    @pytest.mark.parametrize("method", ['parse_or_expression', 'parse_and_expression', 'parse_logic_expression',
+                                        'parse_arth_expression', 'parse_term', 'parse_factor'])
+    def test_random_expressions(self, method):
+        generator = random.Random(method)
+        for _ in range(1000):
+            string = ' '.join(generator.choice(FRAGMENTS) for _ in range(generator.randint(1, 10)))
+            assert parse(PrattParser, string, method) == parse(Parser, string, method), string
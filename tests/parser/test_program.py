@@ -68,6 +68,20 @@ class TestParseProgram:
         with pytest.raises(ParsingError):
             parser.parse_program()
 
+    def test_nodes_have_no_instance_dict(self):
+        parser = self._get_parser('def main() { a = [1, 2.5, "x"]; b = a.where($x => { x = x > 1; }); if (!a) { return a; } else { b = f(a, true); } }')
+        result = parser.parse_program()
+        nodes = [result]
+        while nodes:
+            node = nodes.pop()
+            if isinstance(node, Node):
+                assert not hasattr(node, '__dict__')
+                nodes.extend(getattr(node, name) for base in type(node).__mro__ for name in base.__dict__.get('__slots__', ()))
+            elif isinstance(node, (list, tuple)):
+                nodes.extend(node)
+            elif isinstance(node, dict):
+                nodes.extend(node.values())
+
     @staticmethod
     def _get_parser(string: str) -> Parser:
         src = Source(io.StringIO(string))
@@ -0,0 +1,23 @@
+from interpreter.parser.syntax_tree import Node
+
+
+def _attributes(node):
+    names = []
+    for cls in reversed(type(node).__mro__):
+        slots = cls.__dict__.get('__slots__', ())
+        names.extend([slots] if isinstance(slots, str) else slots)
+    names.extend(getattr(node, '__dict__', {}))
+    return [name for name in dict.fromkeys(names) if hasattr(node, name)]
+
+
+# zamienia drzewo na zagniezdzone krotki, zeby drzewa z roznych parserow mozna bylo porownac przez ==
+def dump_tree(node):
+    if isinstance(node, Node):
+        position = (node.position.line, node.position.column) if node.position is not None else None
+        return (type(node).__name__, position) + tuple(
+            (name, dump_tree(getattr(node, name))) for name in _attributes(node) if name != 'position')
+    if isinstance(node, dict):
+        return tuple((key, dump_tree(value)) for key, value in node.items())
+    if isinstance(node, (list, tuple)):
+        return tuple(dump_tree(item) for item in node)
+    return node
@@ -0,0 +1,60 @@
+import io
+import pytest
+
+from interpreter.source.source import Source
+from interpreter.source.mapped_source import MemoryMappedSource
+from interpreter.lexer.lexer import Lexer, tokens_generator
+from interpreter.lexer.fast_lexer import FastLexer
+from interpreter.lexer.error import LexerError
+from .test_source import TestSource
+
+class TestMemoryMappedSource:
+    def test_matches_text_source(self, tmp_path):
+        string = "ab\r\nźć\rd\n\r\n€x"
+        path = self._write(tmp_path, string)
+        with MemoryMappedSource(path) as source:
+            chars = TestSource.get_chars_and_positions_from_source(source)
+        assert chars == TestSource.get_chars_and_positions_from_source(Source(io.StringIO(string)))
+
+    def test_empty_file(self, tmp_path):
+        with MemoryMappedSource(self._write(tmp_path, "")) as source:
+            assert source.get_char() == 'EOF'
+
+    def test_get_text(self, tmp_path):
+        with MemoryMappedSource(self._write(tmp_path, "żaba")) as source:
+            start = source.get_mark()
+            source.next_char()
+            assert source.get_text(start, source.get_mark()) == "ż"
+
+    def test_same_tokens_as_text_source(self, tmp_path):
+        string = 'def main() {\r\n # komentarz ż\n x = "abc\\n\\q"; y = "źdźbło"; zmienna1 = 12.5 + 3;\n}'
+        path = self._write(tmp_path, string)
+        expected = list(tokens_generator(Lexer(Source(io.StringIO(string)))))
+        with MemoryMappedSource(path) as source:
+            tokens = list(tokens_generator(Lexer(source)))
+        assert tokens == expected
+        assert [token.value for token in tokens] == [token.value for token in expected]
+
+    @pytest.mark.parametrize("window_size", [1, 3, 1000])
+    def test_fast_lexer_reads_chunks(self, tmp_path, window_size):
+        string = 'def main() {\r\n # komentarz ż\n x = "źdźbło";\r\n y = 12.5;\n}\n\n'
+        expected = list(tokens_generator(Lexer(Source(io.StringIO(string)))))
+        with MemoryMappedSource(self._write(tmp_path, string)) as source:
+            tokens = list(tokens_generator(FastLexer(source, window_size=window_size)))
+        assert tokens == expected
+        assert [token.value for token in tokens] == [token.value for token in expected]
+
+    @pytest.mark.parametrize("string", ['"abcdef"', '"ab\\ncdef"', '"abc', 'abcdefgh'])
+    def test_same_limits_as_text_source(self, tmp_path, string):
+        with pytest.raises(LexerError) as expected:
+            list(tokens_generator(Lexer(Source(io.StringIO(string)), max_string=4, max_iden=4)))
+        with MemoryMappedSource(self._write(tmp_path, string)) as source:
+            with pytest.raises(LexerError) as error:
+                list(tokens_generator(Lexer(source, max_string=4, max_iden=4)))
+        assert str(error.value) == str(expected.value)
+
+    @staticmethod
+    def _write(tmp_path, string):
+        path = tmp_path / 'program.bn'
+        path.write_bytes(string.encode('utf-8'))
+        return str(path)
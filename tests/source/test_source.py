@@ -1,7 +1,8 @@
 import io
 from typing import Tuple, List
-from interpreter.source.source import Source
-from interpreter.source.source_position import SourcePosition
+import pytest
+from interpreter.source.source import Source, BufferedSource
+from interpreter.source.source_position import SourcePosition, LineIndex, OffsetPosition
 
 class TestSource:
     def test_get_chars_from_string_unix(self):
@@ -57,4 +58,77 @@ class TestSource:
 
             source.next_char()
         
-        return chars, postions
\ No newline at end of file
+        return chars, postions
+
+class NonSeekableStream(io.StringIO):
+    def seekable(self):
+        return False
+
+    def tell(self):
+        raise io.UnsupportedOperation("tell")
+
+    def seek(self, *args):
+        raise io.UnsupportedOperation("seek")
+
+
+class TestBufferedSource:
+    def test_matches_source_for_every_buffer_size(self):
+        string = "a\r\nbc\r\nc\rd\n\r\n"
+        expected = TestSource.get_chars_and_positions_from_source(Source(io.StringIO(string)))
+        for buffer_size in range(1, len(string) + 2):
+            source = BufferedSource(io.StringIO(string), buffer_size)
+            assert TestSource.get_chars_and_positions_from_source(source) == expected
+
+    def test_crlf_on_buffer_boundary(self):
+        source = BufferedSource(io.StringIO("a\r\nb"), buffer_size=2)
+        char_list, position_list = TestSource.get_chars_and_positions_from_source(source)
+        assert char_list == ['a', '\n', 'b', 'EOF']
+        assert position_list == [
+            SourcePosition(1, 1),
+            SourcePosition(1, 2),
+            SourcePosition(2, 1),
+            SourcePosition(2, 2)
+        ]
+
+    def test_non_seekable_stream(self):
+        source = BufferedSource(NonSeekableStream("x\r\ny\rz"), buffer_size=3)
+        char_list, _ = TestSource.get_chars_and_positions_from_source(source)
+        assert char_list == ['x', '\n', 'y', '\r', 'z', 'EOF']
+
+    def test_empty_stream(self):
+        source = BufferedSource(NonSeekableStream(""))
+        assert source.get_char() == 'EOF'
+        assert source.get_position() == SourcePosition(1, 1)
+
+    def test_invalid_buffer_size(self):
+        with pytest.raises(ValueError):
+            BufferedSource(io.StringIO("a"), buffer_size=0)
+
+
+class TestLineIndex:
+    def test_positions_from_offsets(self):
+        line_index = LineIndex()
+        line_index.add_line(3)
+        line_index.add_line(5)
+        assert line_index.get_position(0) == SourcePosition(1, 1)
+        assert line_index.get_position(2) == SourcePosition(1, 3)
+        assert line_index.get_position(3) == SourcePosition(2, 1)
+        assert line_index.get_position(7) == SourcePosition(3, 3)
+
+    def test_offset_position_is_resolved_lazily(self):
+        source = Source(io.StringIO("ab\ncd"))
+        position = source.get_position()
+        assert isinstance(position, OffsetPosition)
+        assert position.offset == 0
+        for _ in range(4):
+            source.next_char()
+        assert source.get_offset() == 4
+        assert position == SourcePosition(1, 1)
+        assert source.get_position() == SourcePosition(2, 2)
+
+    def test_offset_position_repr_matches_source_position(self):
+        source = Source(io.StringIO("a\nb"))
+        source.next_char()
+        source.next_char()
+        assert repr(source.get_position()) == repr(SourcePosition(2, 1))
+        assert f"{source.get_position()}" == f"{SourcePosition(2, 1)}"